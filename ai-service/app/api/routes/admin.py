@@ -0,0 +1,181 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.api.routes.analysis import ai_analyzer, analyzer_pool, live_scoring, proposal_index, shadow_runner
+from app.api.routes.jobs import job_queue
+from app.core.config import settings
+from app.core.logging import get_logger, log_buffer, log_stats
+from app.services.loop_watchdog import LoopWatchdog
+from app.services.memory import MemoryGrowthMonitor, MemoryReport, TracemallocTracker
+from app.services.profiler import SamplingProfiler
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+# Started with the app when LOOP_WATCHDOG_ENABLED is set
+loop_watchdog = LoopWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL,
+    threshold=settings.LOOP_LAG_THRESHOLD,
+    max_offenders=settings.LOOP_WATCHDOG_MAX_OFFENDERS
+)
+
+# Opt-in; started with the app when PROFILER_ENABLED is set, or on demand
+profiler = SamplingProfiler(
+    interval=settings.PROFILER_INTERVAL,
+    max_stacks=settings.PROFILER_MAX_STACKS,
+    max_depth=settings.PROFILER_MAX_DEPTH
+)
+
+# Components are sized in registration order; shared objects count once
+memory_report = MemoryReport(max_objects=settings.MEMORY_REPORT_MAX_OBJECTS)
+for name, roots in ai_analyzer.memory_components().items():
+    memory_report.register(name, roots)
+memory_report.register("job_queue", job_queue.memory_roots)
+if proposal_index is not None:
+    memory_report.register("search_index", proposal_index.memory_roots)
+if shadow_runner is not None:
+    memory_report.register("shadow_candidate", lambda: shadow_runner.candidate)
+if analyzer_pool is not None:
+    # Only the per-instance NLP state; everything else is shared with ai_analyzer and counted above
+    memory_report.register("analyzer_pool", lambda: [(analyzer.sia, analyzer.models) for analyzer in analyzer_pool.instances()])
+memory_report.register("live_sessions", lambda: live_scoring.sessions)
+memory_report.register("log_buffer", log_buffer)
+
+tracemalloc_tracker = TracemallocTracker(
+    frames=settings.TRACEMALLOC_FRAMES,
+    max_snapshots=settings.TRACEMALLOC_MAX_SNAPSHOTS
+)
+
+# Started with the app when MEMORY_MONITOR_ENABLED is set
+memory_monitor = MemoryGrowthMonitor(
+    interval=settings.MEMORY_MONITOR_INTERVAL,
+    threshold_mb=settings.MEMORY_GROWTH_THRESHOLD_MB,
+    tracker=tracemalloc_tracker
+)
+
+@router.get("/logging")
+async def logging_stats():
+    """
+    Log buffer occupancy and how many events were dropped or sampled out.
+    """
+    return log_stats()
+
+@router.get("/loop")
+async def event_loop_lag():
+    """
+    Event-loop lag histogram and the stacks of the most recent blocking calls.
+    """
+    return loop_watchdog.stats()
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_folded(reset: bool = False):
+    """
+    Sampled stacks in folded format (one "frame;frame;frame count" line per
+    stack), ready for flamegraph.pl or speedscope.
+    """
+    folded = profiler.folded()
+    if reset:
+        profiler.reset()
+    return folded
+
+@router.get("/profile/stats")
+async def profile_stats():
+    """
+    Sampling profiler state and overhead.
+    """
+    return profiler.stats()
+
+@router.post("/profile/start")
+async def profile_start(interval_ms: float = None):
+    """
+    Start the sampling profiler, optionally at a new interval.
+    """
+    if interval_ms is not None and not 1 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="interval_ms must be between 1 and 1000")
+    profiler.start(interval_ms / 1000 if interval_ms is not None else None)
+    return profiler.stats()
+
+@router.post("/profile/stop")
+async def profile_stop():
+    """
+    Stop the sampling profiler; collected stacks are kept until reset.
+    """
+    profiler.stop()
+    return profiler.stats()
+
+@router.get("/shadow")
+async def shadow_stats():
+    """
+    Score deltas and latency of the shadow candidate against the primary
+    analyzer on sampled live requests.
+    """
+    if shadow_runner is None:
+        raise HTTPException(status_code=404, detail="Shadow mode is off; set SHADOW_ANALYZER to enable it")
+    return shadow_runner.stats()
+
+@router.post("/shadow/reset")
+async def shadow_reset(sample_rate: float = None):
+    """
+    Clear the shadow aggregates, optionally changing the sample rate.
+    """
+    if shadow_runner is None:
+        raise HTTPException(status_code=404, detail="Shadow mode is off; set SHADOW_ANALYZER to enable it")
+    if sample_rate is not None:
+        if not 0 <= sample_rate <= 1:
+            raise HTTPException(status_code=400, detail="sample_rate must be between 0 and 1")
+        shadow_runner.sample_rate = sample_rate
+    shadow_runner.reset()
+    return shadow_runner.stats()
+
+@router.get("/memory")
+def memory_usage():
+    """
+    Worker RSS and the retained size of each major component (NLP models,
+    lexicons, caches, job records). Walks the object graph, so it takes a
+    while on large heaps; runs in the threadpool rather than on the loop.
+    """
+    report = memory_report.report()
+    report["monitor"] = memory_monitor.stats()
+    report["tracemalloc"] = tracemalloc_tracker.stats()
+    return report
+
+@router.post("/memory/tracemalloc/start")
+async def tracemalloc_start():
+    """
+    Start tracing allocations so snapshots can be taken and diffed.
+    """
+    tracemalloc_tracker.start()
+    return tracemalloc_tracker.stats()
+
+@router.post("/memory/tracemalloc/stop")
+async def tracemalloc_stop():
+    """
+    Stop tracing allocations and discard stored snapshots.
+    """
+    tracemalloc_tracker.stop()
+    return tracemalloc_tracker.stats()
+
+@router.post("/memory/snapshots/{name}")
+def take_memory_snapshot(name: str):
+    """
+    Store a tracemalloc snapshot under a name for later diffs.
+    """
+    try:
+        return tracemalloc_tracker.take(name)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/memory/diff")
+def memory_diff(base: str, target: str = None, key_type: str = "lineno", limit: int = 25):
+    """
+    Allocation sites that grew most between two named snapshots, or between
+    a snapshot and now when no target is given.
+    """
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="key_type must be lineno, filename or traceback")
+    try:
+        return tracemalloc_tracker.diff(base, target, key_type, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {e}")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
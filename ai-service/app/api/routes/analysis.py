@@ -1,14 +1,32 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Header, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from typing import AsyncIterator, List, Optional, Tuple
+import asyncio
+import json
 import time
+from functools import partial
 
 from app.models.schemas import (
     AnalysisRequest, 
     AnalysisResponse, 
     BatchAnalysisRequest, 
-    BatchAnalysisResponse
+    BatchAnalysisResponse,
+    DocumentAnalysisResponse,
+    ProposalCategory,
+    RankResponse,
+    SearchResponse
 )
-from app.services.ai_analyzer import AIAnalyzer
+from app.models.records import RESPONSE_FIELDS
+from app.services.ai_analyzer import FAILED_STAGES, AIAnalyzer
+from app.services.analyzer_pool import AnalyzerPool
+from app.services.ingestion import DocumentError, DocumentIngestor, DocumentPipeline, document_format
+from app.services.live_scoring import LiveScoring, SessionBusyError, SessionLimitError
+from app.services.ranking import ProposalRanker
+from app.services.search_index import SCORE_FIELDS, IndexStore, ProposalIndex
+from app.services.shadow import ShadowRunner, load_candidate
+from app.core.config import settings
+from app.core.http_cache import cache_headers, etag, matches, precondition_failed
+from app.core.wire import MSGPACK, VARY, MsgpackResponse, columnar, negotiate
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,8 +35,121 @@ router = APIRouter()
 # Initialize AI analyzer
 ai_analyzer = AIAnalyzer()
 
+# Threads each analyzing with their own instance; without a pool analyses run inline on ai_analyzer
+analyzer_pool = None
+if settings.ANALYZER_POOL_SIZE > 0:
+    analyzer_pool = AnalyzerPool(ai_analyzer, settings.ANALYZER_POOL_SIZE, settings.ANALYZER_POOL_HEALTH_INTERVAL)
+
+document_ingestor = DocumentIngestor(ai_analyzer, settings.INGEST_WORKERS, settings.INGEST_MAX_IN_FLIGHT)
+
+live_scoring = LiveScoring(
+    ai_analyzer,
+    max_sessions=settings.LIVE_MAX_SESSIONS,
+    idle_timeout=settings.LIVE_IDLE_TIMEOUT,
+    debounce=settings.LIVE_DEBOUNCE_MS / 1000,
+    max_delay=settings.LIVE_MAX_DELAY_MS / 1000,
+    max_chars=settings.LIVE_MAX_CHARS,
+    memo_size=settings.LIVE_SESSION_MEMO_SIZE,
+    language_chars=settings.LIVE_LANGUAGE_CHARS
+)
+
+proposal_index = None
+if settings.SEARCH_INDEX_ENABLED:
+    proposal_index = ProposalIndex(
+        IndexStore(settings.SEARCH_INDEX_PATH) if settings.SEARCH_INDEX_PATH else None,
+        max_proposals=settings.SEARCH_INDEX_MAX_PROPOSALS
+    )
+
+# Candidate analyzer compared against live traffic; never allowed to affect the primary path
+shadow_runner = None
+if settings.SHADOW_ANALYZER:
+    try:
+        shadow_runner = ShadowRunner(
+            load_candidate(settings.SHADOW_ANALYZER),
+            sample_rate=settings.SHADOW_SAMPLE_RATE,
+            max_pending=settings.SHADOW_MAX_PENDING,
+            max_examples=settings.SHADOW_MAX_EXAMPLES
+        )
+        logger.info(f"Shadow scoring {settings.SHADOW_SAMPLE_RATE:.1%} of requests with {settings.SHADOW_ANALYZER}")
+    except Exception as e:
+        logger.error(f"Shadow analyzer {settings.SHADOW_ANALYZER} could not be loaded; shadow mode is off: {str(e)}")
+
+def index_analysis(request: AnalysisRequest, result) -> None:
+    """Add a complete analysis to the search index; degraded results are left out."""
+    if proposal_index is not None and not result.skipped_stages:
+        proposal_index.add(request, result)
+
+def index_projected(request: AnalysisRequest, record) -> None:
+    """Index a proposal whose response was projected to a few fields.
+    
+    Only with SEARCH_INDEX_PROJECTED. Runs as a background task, after the
+    response is sent: the stages the projection left out are computed here,
+    reusing the memoized sub-scores of the ones it ran. That is most of the
+    work the projection saved, so by default projected requests are not
+    indexed.
+    """
+    if proposal_index is None or record.skipped_stages or not settings.SEARCH_INDEX_PROJECTED:
+        return
+    index_analysis(request, ai_analyzer.analyze_record(request))
+
+def _after_projected(background_tasks: BackgroundTasks, request: AnalysisRequest, record) -> None:
+    """Index and shadow-sample an analysis projected to a few fields, after the response is sent."""
+    background_tasks.add_task(index_projected, request, record)
+    if shadow_runner is not None:
+        # The full primary record is only computed for the sampled few, on the shadow thread
+        background_tasks.add_task(shadow_runner.submit, request, record, partial(ai_analyzer.analyze_record, request))
+
+async def _analyze(method: str, *args, offload: bool = False):
+    """Call an analyzer method on the pool, or on the shared analyzer when there is none.
+    
+    Without a pool the call runs inline, or with ``offload`` in a thread,
+    for callers such as background jobs that must not hold the event loop.
+    """
+    if analyzer_pool is None:
+        if offload:
+            return await asyncio.to_thread(getattr(ai_analyzer, method), *args)
+        return getattr(ai_analyzer, method)(*args)
+    return await analyzer_pool.run(method, *args)
+
+def _deadline(deadline_ms: Optional[float]) -> Optional[float]:
+    """Turn a relative budget from the X-Deadline-Ms header into a monotonic deadline."""
+    if deadline_ms is None:
+        return None
+    if deadline_ms <= 0:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be positive")
+    return time.monotonic() + deadline_ms / 1000
+
+def _fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse the comma-separated fields query parameter; None means every field."""
+    if fields is None:
+        return None
+    selected = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in RESPONSE_FIELDS]
+    if not selected or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}; choose from {', '.join(RESPONSE_FIELDS)}"
+        )
+    return selected
+
+FIELDS_QUERY = Query(None, description="Comma-separated response fields to compute and return; all when omitted")
+
+def _analysis_etag(proposals: List[AnalysisRequest], selected: Optional[Tuple[str, ...]], media_type: str) -> str:
+    """Validator of an analysis result: the proposals, fields and media type under the current analyzer version."""
+    return etag(
+        ai_analyzer.version,
+        ",".join(selected) if selected is not None else "*",
+        media_type,
+        # The deadline only limits how a result is computed, and degraded results get no ETag
+        *(proposal.model_dump_json(exclude={"deadline_ms"}) for proposal in proposals)
+    )
+
 @router.post("/", response_model=AnalysisResponse)
-async def analyze_proposal(request: AnalysisRequest):
+async def analyze_proposal(request: AnalysisRequest, response: Response, background_tasks: BackgroundTasks,
+                           x_deadline_ms: Optional[float] = Header(None),
+                           if_none_match: Optional[str] = Header(None),
+                           accept: Optional[str] = Header(None),
+                           fields: Optional[str] = FIELDS_QUERY):
     """
     Analyze a single proposal and return AI-powered scoring and insights.
     
@@ -30,15 +161,54 @@ async def analyze_proposal(request: AnalysisRequest):
     - Clarity and detail scoring
     - Budget appropriateness analysis
     - AI-generated summary and recommendations
+    
+    An optional latency budget can be given as the X-Deadline-Ms header or
+    the deadline_ms field. When it runs short the expensive stages are
+    skipped, the score comes from the keyword stages alone, and the
+    skipped stages are listed in skipped_stages.
+    
+    With fields (e.g. ?fields=score,sentiment,summary) only the stages
+    those fields depend on run, and the response holds just those fields.
+    
+    Complete results carry an ETag derived from the proposal, the fields
+    and the analyzer version. Sending it back as If-None-Match returns 412
+    Precondition Failed without re-running the analysis: the copy the
+    client holds is still current. If-None-Match: * has no effect, since
+    no analysis is stored.
+    
+    With Accept: application/msgpack the result is sent as MessagePack.
     """
+    deadline = _deadline(x_deadline_ms)
+    selected = _fields(fields)
+    media_type = negotiate(accept)
+    tag = _analysis_etag([request], selected, media_type)
+    if matches(if_none_match, tag, any_matches=False):
+        return precondition_failed(tag)
     try:
-        logger.info(f"Analyzing proposal: {request.title[:50]}...")
+        logger.info("Analyzing proposal: %s...", request.title[:50], hot=True)
+        
+        if selected is not None:
+            record = await _analyze("analyze_record", request, deadline, selected)
+            _after_projected(background_tasks, request, record)
+            logger.info("Analysis completed in %ss with score %s", record.processing_time, record.score, hot=True)
+            headers = VARY if record.skipped_stages else {**cache_headers(tag), **VARY}
+            if media_type == MSGPACK:
+                return MsgpackResponse(record.to_dict(selected), headers=headers)
+            return JSONResponse(record.to_dict(selected), headers=headers)
         
         # Perform analysis
-        result = ai_analyzer.analyze_proposal(request)
+        result = await _analyze("analyze_proposal", request, deadline)
+        index_analysis(request, result)
+        if shadow_runner is not None:
+            # Background tasks run after the response has been sent
+            background_tasks.add_task(shadow_runner.submit, request, result)
+        headers = VARY if result.skipped_stages else {**cache_headers(tag), **VARY}
         
-        logger.info(f"Analysis completed in {result.processing_time}s with score {result.score}")
+        logger.info("Analysis completed in %ss with score %s", result.processing_time, result.score, hot=True)
         
+        if media_type == MSGPACK:
+            return MsgpackResponse(result.model_dump(mode="json"), headers=headers)
+        response.headers.update(headers)
         return result
         
     except Exception as e:
@@ -49,32 +219,70 @@ async def analyze_proposal(request: AnalysisRequest):
         )
 
 @router.post("/batch", response_model=BatchAnalysisResponse)
-async def analyze_proposals_batch(request: BatchAnalysisRequest):
+async def analyze_proposals_batch(request: BatchAnalysisRequest, response: Response, background_tasks: BackgroundTasks,
+                                  x_deadline_ms: Optional[float] = Header(None),
+                                  if_none_match: Optional[str] = Header(None),
+                                  accept: Optional[str] = Header(None),
+                                  fields: Optional[str] = FIELDS_QUERY):
     """
     Analyze multiple proposals in batch for efficiency.
     
     Maximum 10 proposals per batch to ensure reasonable processing time.
+    An X-Deadline-Ms header bounds the whole batch; fields selects the
+    computed and returned fields of every result. As for single
+    proposals, a batch whose results are all complete gets an ETag, and
+    a matching If-None-Match returns 412.
+    
+    With Accept: application/msgpack the response is MessagePack and
+    the results are sent column by column, with each distinct string sent
+    once (see app.core.wire).
     """
+    deadline = _deadline(x_deadline_ms)
+    selected = _fields(fields)
+    media_type = negotiate(accept)
+    if len(request.proposals) > 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Maximum 10 proposals allowed per batch"
+        )
+    tag = _analysis_etag(request.proposals, selected, media_type)
+    if matches(if_none_match, tag, any_matches=False):
+        return precondition_failed(tag)
     try:
-        if len(request.proposals) > 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Maximum 10 proposals allowed per batch"
-            )
-        
-        logger.info(f"Analyzing batch of {len(request.proposals)} proposals")
+        logger.info("Analyzing batch of %d proposals", len(request.proposals), hot=True)
         start_time = time.time()
         
+        # On the pool the proposals are analyzed in parallel; inline, one after another
+        outcomes = await asyncio.gather(*(
+            _analyze("analyze_record", proposal, deadline, selected) if selected is not None
+            else _analyze("analyze_proposal", proposal, deadline)
+            for proposal in request.proposals
+        ), return_exceptions=True)
+        
         results = []
-        for i, proposal in enumerate(request.proposals):
+        complete = True
+        for i, (proposal, outcome) in enumerate(zip(request.proposals, outcomes)):
             try:
-                result = ai_analyzer.analyze_proposal(proposal)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                if selected is not None:
+                    record = outcome
+                    complete = complete and not record.skipped_stages
+                    result = record.to_dict(selected)
+                    _after_projected(background_tasks, proposal, record)
+                else:
+                    result = outcome
+                    complete = complete and not result.skipped_stages
+                    index_analysis(proposal, result)
+                    if shadow_runner is not None:
+                        background_tasks.add_task(shadow_runner.submit, proposal, result)
                 results.append(result)
-                logger.info(f"Batch item {i+1}/{len(request.proposals)} completed")
+                logger.debug("Batch item %d/%d completed", i + 1, len(request.proposals), hot=True)
             except Exception as e:
                 logger.error(f"Error analyzing proposal {i+1}: {str(e)}")
+                complete = False
                 # Add error result
-                results.append(AnalysisResponse(
+                error_result = AnalysisResponse(
                     score=0.0,
                     sentiment="neutral",
                     impact_score=0.0,
@@ -86,12 +294,31 @@ async def analyze_proposals_batch(request: BatchAnalysisRequest):
                     risk_factors=["Analysis error"],
                     strengths=[],
                     confidence=0.0,
-                    processing_time=0.0
-                ))
+                    processing_time=0.0,
+                    skipped_stages=list(FAILED_STAGES)
+                )
+                results.append(error_result if selected is None else error_result.model_dump(mode="json", include=set(selected)))
         
         total_time = time.time() - start_time
         
-        logger.info(f"Batch analysis completed in {total_time:.2f}s")
+        logger.info("Batch analysis completed in %.2fs", total_time, hot=True)
+        headers = {**cache_headers(tag), **VARY} if complete else VARY
+        
+        if media_type == MSGPACK:
+            return MsgpackResponse({
+                "results": columnar(results),
+                "total_processed": len(results),
+                "processing_time": total_time
+            }, headers=headers)
+        
+        if selected is not None:
+            return JSONResponse({
+                "results": results,
+                "total_processed": len(results),
+                "processing_time": total_time
+            }, headers=headers)
+        
+        response.headers.update(headers)
         
         return BatchAnalysisResponse(
             results=results,
@@ -108,6 +335,313 @@ async def analyze_proposals_batch(request: BatchAnalysisRequest):
             detail=f"Batch analysis failed: {str(e)}"
         )
 
+async def _ndjson_chunks(request: Request, chunk_size: int, max_line_bytes: int) -> AsyncIterator[List[bytes]]:
+    """Split a streamed NDJSON body into lists of at most ``chunk_size`` non-empty lines."""
+    buffer = b""
+    lines: List[bytes] = []
+    async for data in request.stream():
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(status_code=413, detail=f"Line longer than {max_line_bytes} bytes")
+        for line in complete:
+            if line.strip():
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    yield lines
+                    lines = []
+    if buffer.strip():
+        lines.append(buffer)
+    if lines:
+        yield lines
+
+@router.post("/rank", response_model=RankResponse)
+async def rank_proposals(
+    request: Request,
+    k: int = Query(20, ge=1, le=settings.RANK_MAX_K),
+    deep: bool = False,
+    candidates: Optional[int] = Query(None, ge=1, le=settings.RANK_MAX_DEEP_CANDIDATES)
+):
+    """
+    Return the top K of an arbitrarily large stream of proposals.
+    
+    The body is NDJSON (application/x-ndjson): one proposal object per
+    line, in the /analyze request format. Proposals are scored in chunks
+    with the vectorized keyword scorer (no sentiment) and only the best
+    ones are kept, so memory stays bounded however many are sent. Invalid
+    lines are counted and skipped.
+    
+    With deep=true the best `candidates` proposals (default
+    RANK_DEEP_CANDIDATES times K) are re-scored with the full analysis,
+    re-ranked by it, and returned with their analysis.
+    """
+    start_time = time.time()
+    if deep:
+        candidates = min(max(candidates or k * settings.RANK_DEEP_CANDIDATES, k), settings.RANK_MAX_DEEP_CANDIDATES)
+        if candidates < k:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Deep ranking re-scores at most {settings.RANK_MAX_DEEP_CANDIDATES} candidates; lower k"
+            )
+    ranker = ProposalRanker(ai_analyzer, k, candidates if deep else None)
+    try:
+        async for lines in _ndjson_chunks(request, settings.RANK_CHUNK_SIZE, settings.RANK_MAX_LINE_BYTES):
+            # Scoring a chunk is CPU-bound; keep the loop free for other requests
+            await asyncio.to_thread(ranker.feed, lines)
+        ranked = await asyncio.to_thread(ranker.finish, deep)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ranking proposals: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Ranking failed: {str(e)}"
+        )
+    
+    processing_time = time.time() - start_time
+    logger.info(
+        "Ranked top %d of %d proposals in %.2fs (%d rejected)",
+        k, ranker.received, processing_time, ranker.rejected, hot=True
+    )
+    return RankResponse(
+        k=k,
+        deep=deep,
+        received=ranker.received,
+        rejected=ranker.rejected,
+        errors=ranker.errors,
+        ranked=ranked,
+        processing_time=processing_time
+    )
+
+async def _document_chunks(request: Request, pipeline: DocumentPipeline) -> AsyncIterator[str]:
+    """Normalized text chunks of the upload, produced as its bytes arrive."""
+    async for data in request.stream():
+        for chunk in pipeline.feed(data):
+            yield chunk
+    # PDF pages are extracted here, one at a time, off the event loop
+    remaining = pipeline.close()
+    while (chunk := await asyncio.to_thread(next, remaining, None)) is not None:
+        yield chunk
+
+@router.post("/document", response_model=DocumentAnalysisResponse)
+async def analyze_document(
+    request: Request,
+    title: str = Query(..., min_length=10, max_length=100),
+    amount: float = Query(..., gt=0, le=1000, description="Funding amount in ETH"),
+    category: Optional[ProposalCategory] = None,
+    language: Optional[str] = Query(None, min_length=2, max_length=8),
+    format: Optional[str] = Query(None, description="pdf, html, markdown or text; taken from Content-Type when omitted")
+):
+    """
+    Analyze a long proposal document sent as the raw request body.
+    
+    PDF, HTML, Markdown and plain text are accepted. Text is extracted
+    and normalized (markup stripped, Unicode NFKC, whitespace collapsed)
+    while the upload streams in, cut into chunks of INGEST_CHUNK_CHARS,
+    and each chunk is scored on the ingestion worker pool. Chunk scores
+    are combined weighted by word count, so a long document is analyzed
+    in bounded memory. PDFs are spooled to a temporary file first since
+    their text can only be read once the whole file is there.
+    """
+    try:
+        pipeline = DocumentPipeline(
+            document_format(request.headers.get("content-type"), format),
+            settings.INGEST_CHUNK_CHARS,
+            settings.INGEST_MAX_BYTES,
+            settings.INGEST_SPOOL_MEMORY_BYTES
+        )
+        logger.info("Ingesting %s document: %s...", pipeline.format, title[:50], hot=True)
+        record, score = await document_ingestor.analyze(
+            _document_chunks(request, pipeline), title.strip(), amount, category,
+            language.strip().lower() if language else None
+        )
+    except DocumentError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except Exception as e:
+        logger.error("Error analyzing document: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Document analysis failed: {str(e)}"
+        )
+    
+    logger.info(
+        f"Document analysis completed in {record.processing_time}s: {pipeline.bytes_read} bytes, "
+        f"{score.chunks} chunks, score {record.score}"
+    )
+    return DocumentAnalysisResponse(
+        **record.to_response().model_dump(),
+        format=pipeline.format,
+        bytes=pipeline.bytes_read,
+        characters=pipeline.characters,
+        words=score.words,
+        chunks=score.chunks
+    )
+
+@router.websocket("/live")
+async def live_scores(websocket: WebSocket, session: Optional[str] = None):
+    """
+    Score a proposal while its author types.
+    
+    Messages are JSON objects in both directions. The client sends the
+    proposal once and then only its changes:
+    - {"type": "set", "title": ..., "description": ..., "amount": ...,
+      "category": ..., "language": ...} replaces any of those fields
+    - {"type": "edit", "field": "description", "start": 10, "end": 12,
+      "text": "..."} replaces characters start to end (code points) of
+      the title or description
+    
+    An edit is scored once no further edit arrived for LIVE_DEBOUNCE_MS,
+    or LIVE_MAX_DELAY_MS after the first unscored one. The server pushes
+    {"type": "scores", "revision": n, ...analysis fields} only when the
+    result differs from the last one pushed, and {"type": "incomplete",
+    "errors": [...]} while the proposal does not validate yet. A rejected
+    message gets {"type": "error", "detail": ...} and changes nothing.
+    
+    The first message from the server names the session. Reconnecting
+    with ?session=<id> resumes it with its text intact until it has seen
+    no message for LIVE_IDLE_TIMEOUT seconds; a connected session idle
+    that long is closed. A worker holds at most LIVE_MAX_SESSIONS.
+    """
+    await websocket.accept()
+    try:
+        live, resumed = live_scoring.attach(session)
+    except (SessionLimitError, SessionBusyError) as e:
+        # 1013: try again later
+        await websocket.close(code=1013, reason=str(e))
+        return
+    try:
+        await websocket.send_json({"type": "session", "session": live.id, "revision": live.revision, "resumed": resumed})
+        while True:
+            try:
+                text = await asyncio.wait_for(websocket.receive_text(), live_scoring.timeout(live))
+            except asyncio.TimeoutError:
+                if live_scoring.due(live):
+                    message = await live_scoring.score(live)
+                    if message is not None:
+                        await websocket.send_json(message)
+                elif live_scoring.idle(live):
+                    await websocket.close(code=1000, reason="Session idle")
+                    break
+                # Otherwise the timer fired a little early: wait out the rest
+                continue
+            try:
+                live_scoring.apply(live, json.loads(text))
+            except ValueError as e:
+                # EditError, or a frame that is not JSON
+                await websocket.send_json({"type": "error", "revision": live.revision, "detail": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_scoring.detach(live)
+
+@router.get("/live/stats")
+async def live_scoring_stats():
+    """
+    Live-scoring sessions held by this worker and how many revisions were scored and pushed.
+    """
+    return live_scoring.stats()
+
+def _ranges(bounds: List[str], which: int, ranges: dict) -> None:
+    """Fold field:value bounds into ``ranges`` as (min, max) pairs; ``which`` picks the side."""
+    for bound in bounds:
+        field, _, value = bound.partition(":")
+        if field not in SCORE_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown score field '{field}'; choose from {', '.join(SCORE_FIELDS)}"
+            )
+        try:
+            limit = float(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Bound for {field} must be a number, got '{value}'")
+        pair = list(ranges.get(field, (None, None)))
+        pair[which] = limit
+        ranges[field] = tuple(pair)
+
+@router.get("/search", response_model=SearchResponse)
+async def search_proposals(
+    q: Optional[str] = Query(None, description="Words that must all appear in the proposal"),
+    category: Optional[ProposalCategory] = None,
+    risk: Optional[str] = Query(None, description="Text a risk factor of the proposal must contain"),
+    minimum: List[str] = Query([], alias="min", description="field:value lower bound, e.g. feasibility_score:7"),
+    maximum: List[str] = Query([], alias="max", description="field:value upper bound, e.g. budget_appropriateness:5"),
+    limit: int = Query(20, ge=1, le=settings.SEARCH_MAX_LIMIT)
+):
+    """
+    Search proposals analyzed by this service.
+    
+    Every condition must hold: all words of q, the category, the risk
+    text, and each score bound (inclusive). For example
+    ?q=timeline&category=environment&min=feasibility_score:7 finds
+    environment proposals mentioning "timeline" with feasibility of at
+    least 7. Results are ordered by overall score.
+    
+    The index is updated as analyses complete and, when
+    SEARCH_INDEX_PATH is set, persisted to that SQLite file.
+    """
+    if proposal_index is None:
+        raise HTTPException(status_code=404, detail="Search index is disabled")
+    ranges: dict = {}
+    _ranges(minimum, 0, ranges)
+    _ranges(maximum, 1, ranges)
+    result = proposal_index.search(
+        [q] if q else (),
+        category.value if category else None,
+        risk,
+        ranges,
+        limit
+    )
+    logger.info("Search matched %d proposals in %.2fms", result["total"], result["took_ms"], hot=True)
+    return result
+
+@router.get("/search/stats")
+async def search_index_stats():
+    """
+    Size of the search index: proposals, distinct terms and postings.
+    """
+    if proposal_index is None:
+        raise HTTPException(status_code=404, detail="Search index is disabled")
+    return proposal_index.stats()
+
+@router.get("/cache")
+async def analysis_cache_stats():
+    """
+    Hit/miss counters of the per-stage sub-score memo.
+    """
+    return ai_analyzer.memo_stats()
+
+@router.get("/stages")
+async def analysis_stages():
+    """
+    Run, error and timeout counters of each analysis stage.
+    """
+    return ai_analyzer.stage_stats()
+
+@router.get("/pool")
+async def analyzer_pool_stats():
+    """
+    Pooled analyzer instances, health checks and how long calls waited for a free thread.
+    """
+    if analyzer_pool is None:
+        raise HTTPException(status_code=404, detail="Analyzer pool is disabled; set ANALYZER_POOL_SIZE")
+    return analyzer_pool.stats()
+
+@router.get("/model")
+async def learned_model_stats():
+    """
+    The learned pass-probability model: its fingerprint, size and holdout metrics.
+    """
+    if ai_analyzer.learned_model is None:
+        raise HTTPException(status_code=404, detail="No learned model is loaded; set LEARNED_MODEL_PATH")
+    return ai_analyzer.learned_model.stats()
+
+@router.get("/languages")
+async def analysis_languages():
+    """
+    Supported languages and the lexicon packs and models currently loaded.
+    """
+    return ai_analyzer.language_stats()
+
 @router.get("/health")
 async def analysis_health():
     """
@@ -123,7 +657,7 @@ async def analysis_health():
         )
         
         start_time = time.time()
-        result = ai_analyzer.analyze_proposal(test_request)
+        result = await _analyze("analyze_proposal", test_request)
         processing_time = time.time() - start_time
         
         return {
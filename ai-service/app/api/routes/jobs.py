@@ -0,0 +1,120 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+
+from app.api.routes.analysis import _analyze, index_analysis
+from app.core.config import settings
+from app.core.http_cache import cache_headers, etag, matches, not_modified
+from app.core.wire import MSGPACK, VARY, MsgpackResponse, columnar, negotiate
+from app.core.logging import get_logger
+from app.models.schemas import (
+    AnalysisRequest,
+    AnalysisResponse,
+    JobStatusResponse,
+    JobSubmitRequest,
+    JobSubmitResponse
+)
+from app.services.job_queue import JobNotFoundError, JobQueue, JobStore, QueueFullError
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+async def analyze_and_index(request: AnalysisRequest) -> AnalysisResponse:
+    # On the analyzer pool when there is one, else in a thread as before
+    result = await _analyze("analyze_proposal", request, offload=True)
+    index_analysis(request, result)
+    return result
+
+job_queue = JobQueue(
+    analyze_and_index,
+    workers=settings.JOB_WORKERS,
+    max_pending=settings.JOB_MAX_PENDING,
+    max_retained=settings.JOB_MAX_RETAINED,
+    slice_size=settings.JOB_SLICE_SIZE,
+    store=JobStore(settings.JOB_STORE_PATH) if settings.JOB_STORE_PATH else None
+)
+
+@router.post("/", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(request: JobSubmitRequest):
+    """
+    Submit a batch of proposals for background analysis.
+
+    Returns immediately with a job ID. Lower priority values run first;
+    use 0 for urgent single proposals and 9 for bulk backfills.
+    """
+    if len(request.proposals) > settings.JOB_MAX_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {settings.JOB_MAX_BATCH} proposals allowed per job"
+        )
+
+    try:
+        job = await job_queue.submit(request.proposals, priority=request.priority)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    logger.info("Queued job %s with %d proposals at priority %d", job.job_id, job.total, job.priority, hot=True)
+
+    return JobSubmitResponse(
+        job_id=job.job_id,
+        status=job.status,
+        priority=job.priority,
+        total=job.total,
+        queue_position=job_queue.queue_position(job)
+    )
+
+@router.get("/stats")
+async def job_queue_stats():
+    """
+    Queue depth, worker count and retained job counts.
+    """
+    return job_queue.stats()
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    response: Response,
+    wait: float = Query(0.0, ge=0, description="Seconds to long-poll for completion"),
+    include_results: bool = Query(True, description="Include results once the job has finished"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Get job progress and timing, and the results once finished.
+
+    Pass ``wait`` to hold the request open until the job finishes or the
+    wait elapses, whichever comes first. Send the previous ETag as
+    If-None-Match to get 304 instead of the same status again. With
+    Accept: application/msgpack the status is MessagePack and the results
+    are sent column by column (see app.core.wire).
+    """
+    try:
+        job = await job_queue.wait(job_id, min(wait, settings.JOB_MAX_WAIT))
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    # Everything the status payload is derived from
+    media_type = negotiate(accept)
+    tag = etag(job.job_id, job.status.value, job.completed, job.failed, job.started_at, job.finished_at, include_results, media_type)
+    if matches(if_none_match, tag):
+        return not_modified(tag)
+    headers = {**cache_headers(tag), **VARY}
+    status = job.to_status(include_results=include_results)
+    if media_type == MSGPACK:
+        payload = status.model_dump(mode="json", exclude={"results"})
+        payload["results"] = columnar(status.results) if status.results is not None else None
+        return MsgpackResponse(payload, headers=headers)
+    response.headers.update(headers)
+    return status
+
+@router.delete("/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job. Items already analyzed are kept.
+    """
+    try:
+        job = await job_queue.cancel(job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    return job.to_status()
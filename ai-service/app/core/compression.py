@@ -0,0 +1,136 @@
+"""zstd/gzip compression of large responses, negotiated with Accept-Encoding.
+
+Bodies below ``minimum_size`` go out unchanged: compressing a few hundred
+bytes costs more time than it saves. A streamed body is compressed as it
+streams, flushed after every chunk so the client sees each one as soon
+as it is sent.
+
+When the client accepts a coding, ETags are made weak, compressed or not
+(a 304 cannot tell whether its 200 would have been): they identify the
+content, not the exact bytes. ``http_cache.matches`` compares weakly, so
+the client's If-None-Match still revalidates.
+"""
+
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+# Server preference when a client accepts several codings
+ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """The preferred coding the client accepts (q > 0), or None."""
+    accepted = {}
+    for entry in (accept_encoding or "").split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    return next((coding for coding in ENCODINGS if accepted.get(coding, wildcard) > 0), None)
+
+
+class _Compressor:
+    """One streaming compressor with the zlib-style compress/flush interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        if encoding == "zstd":
+            self._stream = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._sync, self._finish = zstandard.COMPRESSOBJ_FLUSH_BLOCK, zstandard.COMPRESSOBJ_FLUSH_FINISH
+        else:
+            # wbits 31: gzip header and trailer
+            self._stream = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._sync, self._finish = zlib.Z_SYNC_FLUSH, zlib.Z_FINISH
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        return self._stream.compress(data) + self._stream.flush(self._finish if last else self._sync)
+
+
+def _headers(headers: Iterable[Tuple[bytes, bytes]], encoding: Optional[str],
+             length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+    """Response headers for a body sent with ``encoding`` (None: unchanged); drops Content-Length when streaming."""
+    result, vary = [], None
+    for name, value in headers:
+        lower = name.lower()
+        if lower == b"content-length" and encoding is not None:
+            continue
+        if lower == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        if lower == b"vary":
+            vary = value
+            continue
+        result.append((name, value))
+    if encoding is not None:
+        result.append((b"content-encoding", encoding.encode("latin-1")))
+    result.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+    if encoding is not None and length is not None:
+        result.append((b"content-length", str(length).encode("latin-1")))
+    return result
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP response bodies of at least ``minimum_size`` bytes."""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"accept-encoding"), None
+        )
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body, more = message.get("body", b""), message.get("more_body", False)
+            if compressor is None:
+                if any(name.lower() == b"content-encoding" for name, _ in start["headers"]):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                if not more and len(body) < self.minimum_size:
+                    await send({**start, "headers": _headers(start["headers"], None, None)})
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.zstd_level)
+                if not more:
+                    compressed = compressor.chunk(body, last=True)
+                    await send({**start, "headers": _headers(start["headers"], encoding, len(compressed))})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send({**start, "headers": _headers(start["headers"], encoding, None)})
+            await send({"type": "http.response.body", "body": compressor.chunk(body, last=not more), "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
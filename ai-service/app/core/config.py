@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -13,6 +13,17 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
+    # Production launcher (gunicorn with uvicorn workers)
+    SERVER_WORKERS: int = 0  # 0 starts one worker per available CPU core
+    SERVER_PRELOAD: bool = True  # import and warm up the analyzer before forking
+    SERVER_MAX_REQUESTS: int = 10000  # recycle a worker after this many requests; 0 disables
+    SERVER_MAX_REQUESTS_JITTER: int = 1000  # spreads recycling so workers don't restart together
+    SERVER_MEMORY_CEILING_MB: float = 0  # recycle a worker whose RSS passes this; 0 disables
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds to drain in-flight requests on shutdown
+    SERVER_TIMEOUT: int = 60  # seconds without a heartbeat before a worker is killed
+    SERVER_KEEPALIVE: int = 5  # seconds to hold idle keep-alive connections
+    SERVER_BACKLOG: int = 2048
+    
     # CORS settings
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -36,11 +47,102 @@ class Settings(BaseSettings):
     MAX_DESCRIPTION_LENGTH: int = 2000
     SCORE_THRESHOLD_HIGH: float = 8.0
     SCORE_THRESHOLD_MEDIUM: float = 5.0
+    ANALYSIS_MEMO_SIZE: int = 4096  # per-stage sub-score memo entries
+    ANALYSIS_STAGE_WORKERS: int = 4  # 0 runs every stage on the request thread
+    ANALYSIS_OFFLOADED_STAGES: List[str] = ["sentiment"]
+    ANALYSIS_STAGE_TIMEOUT: float = 2.0  # seconds, for offloaded stages
+    ANALYSIS_STAGE_TIMEOUTS: Dict[str, float] = {}  # per-stage overrides
+    
+    LEARNED_MODEL_PATH: Optional[str] = None  # artifact from scripts/train_scorer.py; enables pass_probability
+    
+    # Language settings
+    DEFAULT_LANGUAGE: str = "en"
+    LANGUAGE_MIN_CONFIDENCE: float = 0.35
+    LANGUAGE_PACK_CACHE_SIZE: int = 4
+    SPACY_MODEL_CACHE_SIZE: int = 2
     
     # Cache settings
     REDIS_URL: Optional[str] = None
     CACHE_TTL: int = 3600  # 1 hour
     
+    # Async job queue
+    JOB_WORKERS: int = 2
+    JOB_MAX_PENDING: int = 1000
+    JOB_MAX_RETAINED: int = 500
+    JOB_MAX_BATCH: int = 500
+    JOB_SLICE_SIZE: int = 5
+    JOB_MAX_WAIT: float = 30.0
+    JOB_STORE_PATH: Optional[str] = None
+    
+    # Top-K ranking over streamed proposals
+    RANK_MAX_K: int = 1000
+    RANK_CHUNK_SIZE: int = 2048  # proposals scored per vectorized batch
+    RANK_MAX_LINE_BYTES: int = 65536
+    RANK_DEEP_CANDIDATES: int = 2  # deep mode re-scores this many times K
+    RANK_MAX_DEEP_CANDIDATES: int = 200
+    
+    # Document ingestion (/analyze/document)
+    INGEST_MAX_BYTES: int = 50 * 1024 * 1024
+    INGEST_CHUNK_CHARS: int = 2000  # normalized characters scored per chunk
+    INGEST_WORKERS: int = 2
+    INGEST_MAX_IN_FLIGHT: int = 8  # chunks queued for scoring before the upload is paused
+    INGEST_SPOOL_MEMORY_BYTES: int = 1024 * 1024  # PDFs larger than this spool to disk
+    
+    # Search index over analyzed proposals (/analyze/search)
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_PATH: Optional[str] = None  # SQLite file; in memory only when unset
+    SEARCH_INDEX_MAX_PROPOSALS: int = 100000  # held in memory per worker; the least recently indexed go first
+    SEARCH_INDEX_PROJECTED: bool = False  # also index ?fields= requests, by computing their full record after the response
+    SEARCH_MAX_LIMIT: int = 200
+    
+    # Shadow scoring with a candidate analyzer
+    SHADOW_ANALYZER: Optional[str] = None  # module:attribute of an analyzer or a factory; off when unset
+    SHADOW_SAMPLE_RATE: float = 0.01
+    SHADOW_MAX_PENDING: int = 100  # samples beyond this backlog are dropped
+    SHADOW_MAX_EXAMPLES: int = 10  # largest score disagreements kept for inspection
+    
+    # Live scoring sessions over WebSocket (/analyze/live)
+    LIVE_MAX_SESSIONS: int = 100  # per worker, connected or awaiting reconnection
+    LIVE_IDLE_TIMEOUT: float = 300.0  # seconds without a client message before a session expires
+    LIVE_DEBOUNCE_MS: float = 300.0  # quiet time after an edit before it is scored
+    LIVE_MAX_DELAY_MS: float = 2000.0  # longest an edit waits for scoring while the author keeps typing
+    LIVE_MAX_CHARS: int = 20000  # title plus description held per session
+    LIVE_SESSION_MEMO_SIZE: int = 64  # private sub-score memo entries per session
+    LIVE_LANGUAGE_CHARS: int = 200  # text length from which a detected language is kept for the session
+    
+    # Response compression (zstd or gzip, from Accept-Encoding)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # smaller bodies are sent as they are
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    # Analyzer pool: threads each analyzing with their own analyzer instance
+    ANALYZER_POOL_SIZE: int = 0  # threads running /analyze and /analyze/batch analyses; 0 runs them inline
+    ANALYZER_POOL_HEALTH_INTERVAL: float = 60.0  # seconds between health checks of a pooled instance
+    
+    # HTTP caching of the static / and /keywords payloads
+    STATIC_CACHE_MAX_AGE: int = 3600
+    
+    # Event-loop lag watchdog
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL: float = 0.05  # seconds between heartbeats
+    LOOP_LAG_THRESHOLD: float = 0.1  # seconds of lag that count as a stall
+    LOOP_WATCHDOG_MAX_OFFENDERS: int = 20
+    
+    # Sampling profiler (opt-in)
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL: float = 0.01  # seconds between samples
+    PROFILER_MAX_STACKS: int = 5000
+    PROFILER_MAX_DEPTH: int = 64
+    
+    # Memory accounting and growth warnings
+    MEMORY_MONITOR_ENABLED: bool = False
+    MEMORY_MONITOR_INTERVAL: float = 60.0  # seconds between RSS checks
+    MEMORY_GROWTH_THRESHOLD_MB: float = 200.0
+    MEMORY_REPORT_MAX_OBJECTS: int = 2_000_000
+    TRACEMALLOC_FRAMES: int = 10
+    TRACEMALLOC_MAX_SNAPSHOTS: int = 4
+    
     # Rate limiting
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_WINDOW: int = 3600  # 1 hour
@@ -48,6 +150,10 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    LOG_ASYNC: bool = True  # render and write logs on a background thread
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_BLOCK_TIMEOUT: float = 0.1  # seconds a warning/error waits for buffer space
+    LOG_HOT_SAMPLE_EVERY: int = 10  # keep one in N hot-path info events
     
     class Config:
         env_file = ".env"
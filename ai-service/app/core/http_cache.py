@@ -0,0 +1,66 @@
+"""Conditional-request helpers: strong ETags, If-None-Match and pre-serialized bodies.
+
+Validators are computed from what determines a response (the request
+content plus the analyzer version, or a job's progress) rather than from
+the serialized body, so a matching If-None-Match is answered before any
+analysis runs or any JSON is produced: with 304 for GET and HEAD, and
+with 412 for other methods, as RFC 9110 requires.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+# Analysis results only change with the analyzer, but must be revalidated
+REVALIDATE = "no-cache"
+
+
+def etag(*parts: Any) -> str:
+    """Strong entity tag over ``parts``; bytes are hashed as-is, the rest as text."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()}"'
+
+
+def matches(if_none_match: Optional[str], tag: str, any_matches: bool = True) -> bool:
+    """Whether an If-None-Match header covers ``tag`` (weak comparison, per RFC 9110).
+
+    ``*`` matches whenever the resource exists. Pass ``any_matches=False``
+    where nothing is stored, such as a POST that computes its result.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return any_matches
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(","))
+
+
+def cache_headers(tag: str, cache_control: str = REVALIDATE) -> Dict[str, str]:
+    return {"ETag": tag, "Cache-Control": cache_control}
+
+
+def not_modified(tag: str, cache_control: str = REVALIDATE) -> Response:
+    return Response(status_code=304, headers=cache_headers(tag, cache_control))
+
+
+def precondition_failed(tag: str) -> Response:
+    """Answer to a request other than GET or HEAD whose If-None-Match matched."""
+    return Response(status_code=412, headers={"ETag": tag})
+
+
+class StaticJSON:
+    """A JSON payload serialized once, with its ETag, served or revalidated per request."""
+
+    def __init__(self, payload: Any, cache_control: str):
+        self.body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.etag = etag(self.body)
+        self.cache_control = cache_control
+
+    def respond(self, if_none_match: Optional[str]) -> Response:
+        if matches(if_none_match, self.etag):
+            return not_modified(self.etag, self.cache_control)
+        return Response(self.body, media_type="application/json", headers=cache_headers(self.etag, self.cache_control))
@@ -1,16 +1,92 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 import structlog
 from app.core.config import settings
 
+# Records at or below this level are dropped, not waited on, when the buffer is full
+DROPPABLE_LEVEL = logging.INFO
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["BoundedQueueHandler"] = None
+_sampler: Optional["HotPathSampler"] = None
+
+class HotPathSampler:
+    """structlog processor keeping one in ``every`` hot-path info/debug events.
+
+    Events opt in with ``hot=True``. Counting is per event template, so each
+    hot message is sampled independently; counters are approximate under
+    concurrent logging, which is fine for sampling.
+    """
+
+    def __init__(self, every: int = 1):
+        self.every = max(1, every)
+        self._counts: Dict[str, int] = {}
+        self.sampled_out = 0
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if event_dict.pop("hot", False) and method_name in ("debug", "info") and self.every > 1:
+            event = event_dict.get("event")
+            count = self._counts.get(event, 0)
+            self._counts[event] = count + 1
+            if count % self.every:
+                self.sampled_out += 1
+                raise structlog.DropEvent
+        return event_dict
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller on info-level records.
+
+    Records are enqueued unrendered; the listener thread renders and writes
+    them. When the buffer is full, info and debug records are dropped and
+    counted, while warnings and errors wait up to ``block_timeout`` for
+    space.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block_timeout: float = 0.1):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Rendering happens in the listener thread, not on the request path
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if record.levelno <= DROPPABLE_LEVEL:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
 def setup_logging() -> None:
-    """Setup structured logging for the application."""
-    
-    # Configure structlog
+    """Setup structured logging for the application.
+
+    With ``LOG_ASYNC`` (the default) log calls only run the cheap structlog
+    processors and enqueue the event; JSON rendering and the write to stdout
+    happen on a background writer thread behind a bounded buffer.
+    """
+    global _listener, _queue_handler, _sampler
+
+    renderer = (
+        structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json"
+        else structlog.dev.ConsoleRenderer()
+    )
+    _sampler = HotPathSampler(settings.LOG_HOT_SAMPLE_EVERY)
+
+    # Configure structlog; events below the level are dropped before any formatting
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
+            _sampler,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
@@ -18,27 +94,74 @@ def setup_logging() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json" 
-            else structlog.dev.ConsoleRenderer()
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
-    
-    # Configure standard logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.LOG_LEVEL.upper()),
+
+    # Records from other libraries get the same fields before rendering
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processor=renderer,
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
     )
-    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
+
+    if settings.LOG_ASYNC:
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _queue_handler = BoundedQueueHandler(log_queue, settings.LOG_QUEUE_BLOCK_TIMEOUT)
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        root.addHandler(_queue_handler)
+    else:
+        root.addHandler(stream_handler)
+
     # Set log levels for external libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
     logging.getLogger("httpx").setLevel(logging.WARNING)
 
+def shutdown_logging() -> None:
+    """Flush and stop the background log writer, if running."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        # stop() writes out everything still queued before returning
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+
+atexit.register(shutdown_logging)
+
+def log_stats() -> Dict[str, Any]:
+    """Buffer occupancy and the number of dropped and sampled-out events."""
+    handler = _queue_handler
+    return {
+        "async": handler is not None,
+        "queued": handler.queue.qsize() if handler is not None else 0,
+        "capacity": handler.queue.maxsize if handler is not None else 0,
+        "dropped": handler.dropped if handler is not None else 0,
+        "sampled_out": _sampler.sampled_out if _sampler is not None else 0,
+        "hot_sample_every": _sampler.every if _sampler is not None else 1
+    }
+
+def log_buffer() -> Optional[queue.Queue]:
+    """The queue between callers and the writer thread, if logging is async."""
+    return _queue_handler.queue if _queue_handler is not None else None
+
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a structured logger instance."""
     return structlog.get_logger(name)
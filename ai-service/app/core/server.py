@@ -0,0 +1,158 @@
+"""Production launcher: a gunicorn arbiter managing uvicorn workers.
+
+    python -m app.core.server
+
+Workers default to one per available CPU core, use uvloop and httptools
+when installed, and are forked from a master that has already imported
+and warmed up the app (SERVER_PRELOAD). The arbiter replaces workers that
+served SERVER_MAX_REQUESTS requests or grew past SERVER_MEMORY_CEILING_MB,
+and drains in-flight requests for up to SERVER_GRACEFUL_TIMEOUT seconds
+on shutdown. Without gunicorn (e.g. on Windows) it falls back to
+uvicorn's own process manager, which has no preloading or memory ceiling.
+"""
+
+import importlib.util
+import os
+import signal
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+APP = "main:app"
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    # Respect CPU affinity and container cpusets where the platform exposes them
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    """Gunicorn settings derived from ``Settings``."""
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": worker_count(),
+        "worker_class": "app.core.server.ServiceWorker",
+        "preload_app": settings.SERVER_PRELOAD,
+        "max_requests": settings.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": settings.SERVER_MAX_REQUESTS_JITTER if settings.SERVER_MAX_REQUESTS else 0,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "timeout": settings.SERVER_TIMEOUT,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "backlog": settings.SERVER_BACKLOG,
+        "loglevel": settings.LOG_LEVEL.lower(),
+        "accesslog": None,
+        "post_fork": post_fork,
+    }
+
+
+def load_app():
+    """Import the app and, when preloading, warm the analyzer in the master."""
+    from main import app
+
+    if settings.SERVER_PRELOAD:
+        from app.api.routes.analysis import ai_analyzer
+
+        ai_analyzer.warm_up()
+    return app
+
+
+def post_fork(server, worker) -> None:
+    # Threads do not survive fork; give the worker its own log writer
+    setup_logging()
+
+
+if importlib.util.find_spec("gunicorn") is not None:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+
+    class ServiceWorker(UvicornWorker):
+        """Uvicorn worker with the fastest available loop and parser and an RSS ceiling.
+
+        The ceiling is checked on each heartbeat to the arbiter; a worker
+        over it stops accepting connections, drains, and exits so the
+        arbiter starts a fresh one.
+        """
+
+        CONFIG_KWARGS = {
+            "loop": event_loop(),
+            "http": http_protocol(),
+            "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        }
+
+        recycling = False
+
+        async def callback_notify(self) -> None:
+            await super().callback_notify()
+            if settings.SERVER_MEMORY_CEILING_MB <= 0 or self.recycling:
+                return
+            from app.services.memory import MB, rss_bytes
+
+            rss_mb = rss_bytes() / MB
+            if rss_mb > settings.SERVER_MEMORY_CEILING_MB:
+                self.recycling = True
+                logger.warning(
+                    f"Worker {os.getpid()} RSS {rss_mb:.0f}MB is over the "
+                    f"{settings.SERVER_MEMORY_CEILING_MB:.0f}MB ceiling; recycling"
+                )
+                # Same path as a normal shutdown: stop accepting, drain, exit
+                os.kill(os.getpid(), signal.SIGTERM)
+
+    class ServiceApplication(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app()
+
+
+def run() -> None:
+    options = gunicorn_options()
+    logger.info(
+        f"Starting {options['workers']} workers on {options['bind']} "
+        f"(loop={event_loop()}, http={http_protocol()}, preload={settings.SERVER_PRELOAD})"
+    )
+    if importlib.util.find_spec("gunicorn") is not None:
+        ServiceApplication(options).run()
+        return
+
+    import uvicorn
+
+    logger.warning("gunicorn is not installed; using uvicorn workers without preloading or memory recycling")
+    uvicorn.run(
+        APP,
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=options["workers"],
+        loop=event_loop(),
+        http=http_protocol(),
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS or None,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+if __name__ == "__main__":
+    setup_logging()
+    run()
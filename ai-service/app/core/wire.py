@@ -0,0 +1,145 @@
+"""Content negotiation and the compact MessagePack encoding of analysis results.
+
+JSON stays the default. A client sending ``Accept: application/msgpack``
+gets MessagePack instead, and lists of results are sent column by column
+rather than as one object per result:
+
+- every key name appears once per response instead of once per result;
+- each distinct string appears once, in ``strings``, and results refer to
+  it by position. The recommendation, risk, strength and sentiment texts
+  come from small fixed sets, so a column of them is mostly 1-byte ints;
+- scores, which are rounded to 2 decimals, are sent as exact integers in
+  hundredths (``scales`` gives the divisor), 1-3 bytes each.
+
+``from_columnar`` turns such a block back into per-result dicts.
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+
+import msgpack
+from fastapi import Response
+
+from app.models.records import RESPONSE_FIELDS
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Accepted spellings of each media type we can produce
+MEDIA_TYPES = {JSON: JSON, MSGPACK: MSGPACK, "application/x-msgpack": MSGPACK}
+
+# Responses whose representation depends on the Accept header
+VARY = {"Vary": "Accept"}
+
+# Fields sent as integers; results round them to 2 (processing_time and pass_probability to 3) decimals
+SCALES = {
+    "score": 100,
+    "impact_score": 100,
+    "feasibility_score": 100,
+    "clarity_score": 100,
+    "budget_appropriateness": 100,
+    "confidence": 100,
+    "processing_time": 1000,
+    "pass_probability": 1000,
+}
+
+# Fields holding one string, and fields holding a list of strings
+STRING_FIELDS = ("sentiment", "summary", "language")
+STRING_LIST_FIELDS = ("recommendations", "risk_factors", "strengths", "skipped_stages")
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick JSON or MessagePack from an Accept header; JSON unless MessagePack is preferred."""
+    best, best_q = JSON, 0.0
+    for entry in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in entry.split(";"))
+        chosen = MEDIA_TYPES.get(media_type.lower())
+        if chosen is None:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        # Ties go to JSON, the default representation
+        if q > best_q or (q == best_q and chosen == JSON):
+            best, best_q = chosen, q
+    return best
+
+
+def columnar(results: Sequence[Any]) -> Dict[str, Any]:
+    """Encode analysis results (response models, records or dicts; None for a missing result) as columns."""
+    sample = next((row for row in results if row is not None), None)
+    # Projected results hold only the selected fields
+    names = list(sample) if isinstance(sample, dict) else list(RESPONSE_FIELDS) if sample is not None else []
+    get = dict.get if isinstance(sample, dict) else getattr
+
+    strings: Dict[str, int] = {}
+    intern = strings.setdefault
+    columns: Dict[str, list] = {}
+    for name in names:
+        values = [None if row is None else get(row, name) for row in results]
+        if name in SCALES:
+            scale = SCALES[name]
+            columns[name] = [None if value is None else round(value * scale) for value in values]
+        elif name in STRING_FIELDS:
+            # Sentiment comes as an enum, whose hash differs from its value's
+            columns[name] = [
+                None if value is None else intern(value.value if isinstance(value, Enum) else value, len(strings))
+                for value in values
+            ]
+        elif name in STRING_LIST_FIELDS:
+            columns[name] = [
+                None if value is None else [intern(item, len(strings)) for item in value]
+                for value in values
+            ]
+        else:
+            columns[name] = values
+
+    return {
+        "count": len(results),
+        "strings": list(strings),
+        "scales": {name: SCALES[name] for name in names if name in SCALES},
+        "columns": columns,
+        "nulls": [i for i, row in enumerate(results) if row is None],
+    }
+
+
+def from_columnar(block: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+    """Rebuild per-result dicts from a ``columnar`` block."""
+    strings, scales, columns = block["strings"], block["scales"], block["columns"]
+    nulls = set(block["nulls"])
+    results: List[Optional[Dict[str, Any]]] = []
+    for i in range(block["count"]):
+        if i in nulls:
+            results.append(None)
+            continue
+        row = {}
+        for name, column in columns.items():
+            value = column[i]
+            if value is None:
+                row[name] = None
+            elif name in scales:
+                row[name] = value / scales[name]
+            elif name in STRING_FIELDS:
+                row[name] = strings[value]
+            elif name in STRING_LIST_FIELDS:
+                row[name] = [strings[item] for item in value]
+            else:
+                row[name] = value
+        results.append(row)
+    return results
+
+
+def packb(payload: Any) -> bytes:
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        return packb(content)
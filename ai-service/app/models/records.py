@@ -0,0 +1,89 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.models.schemas import AnalysisResponse, SentimentType
+
+
+class AnalysisRecord:
+    """Internal analysis result.
+
+    Uses ``__slots__`` and tuples of shared message strings so building a
+    result does not allocate per-request lists or a Pydantic model. Convert
+    with ``to_response`` only at the API boundary.
+    """
+
+    __slots__ = (
+        "score",
+        "sentiment",
+        "impact_score",
+        "feasibility_score",
+        "clarity_score",
+        "budget_appropriateness",
+        "summary",
+        "recommendations",
+        "risk_factors",
+        "strengths",
+        "confidence",
+        "processing_time",
+        "language",
+        "skipped_stages",
+        "pass_probability",
+    )
+
+    def __init__(self, score: float, sentiment: SentimentType, impact_score: float,
+                 feasibility_score: float, clarity_score: float, budget_appropriateness: float,
+                 summary: str, recommendations: Tuple[str, ...], risk_factors: Tuple[str, ...],
+                 strengths: Tuple[str, ...], confidence: float, processing_time: float,
+                 language: str = "en", skipped_stages: Tuple[str, ...] = (),
+                 pass_probability: Optional[float] = None):
+        self.score = score
+        self.sentiment = sentiment
+        self.impact_score = impact_score
+        self.feasibility_score = feasibility_score
+        self.clarity_score = clarity_score
+        self.budget_appropriateness = budget_appropriateness
+        self.summary = summary
+        self.recommendations = recommendations
+        self.risk_factors = risk_factors
+        self.strengths = strengths
+        self.confidence = confidence
+        self.processing_time = processing_time
+        self.language = language
+        self.skipped_stages = skipped_stages
+        self.pass_probability = pass_probability
+
+    def to_response(self) -> AnalysisResponse:
+        """Build the public response model."""
+        return AnalysisResponse(
+            score=self.score,
+            sentiment=self.sentiment,
+            impact_score=self.impact_score,
+            feasibility_score=self.feasibility_score,
+            clarity_score=self.clarity_score,
+            budget_appropriateness=self.budget_appropriateness,
+            summary=self.summary,
+            recommendations=list(self.recommendations),
+            risk_factors=list(self.risk_factors),
+            strengths=list(self.strengths),
+            confidence=self.confidence,
+            processing_time=self.processing_time,
+            language=self.language,
+            skipped_stages=list(self.skipped_stages),
+            pass_probability=self.pass_probability
+        )
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """JSON-ready response fields, only ``fields`` when given."""
+        names = RESPONSE_FIELDS if fields is None else fields
+        result = {}
+        for name in names:
+            value = getattr(self, name)
+            if isinstance(value, tuple):
+                value = list(value)
+            elif isinstance(value, SentimentType):
+                value = value.value
+            result[name] = value
+        return result
+
+
+# Public response fields, in response order; each is also a record attribute
+RESPONSE_FIELDS = tuple(AnalysisResponse.model_fields)
@@ -21,6 +21,8 @@ class AnalysisRequest(BaseModel):
     description: str = Field(..., min_length=50, max_length=2000, description="Proposal description")
     amount: float = Field(..., gt=0, description="Funding amount in ETH")
     category: Optional[ProposalCategory] = Field(None, description="Proposal category")
+    language: Optional[str] = Field(None, min_length=2, max_length=8, description="ISO 639-1 language code; detected when omitted")
+    deadline_ms: Optional[float] = Field(None, gt=0, description="Latency budget in milliseconds; expensive stages are skipped when it runs short")
     
     @validator('title')
     def validate_title(cls, v):
@@ -34,6 +36,10 @@ class AnalysisRequest(BaseModel):
             raise ValueError('Description cannot be empty')
         return v.strip()
     
+    @validator('language')
+    def validate_language(cls, v):
+        return v.strip().lower() if v else None
+    
     @validator('amount')
     def validate_amount(cls, v):
         if v <= 0:
@@ -66,6 +72,9 @@ class AnalysisResponse(BaseModel):
     strengths: List[str]
     confidence: float = Field(..., ge=0, le=1, description="Analysis confidence level")
     processing_time: float = Field(..., description="Analysis processing time in seconds")
+    language: str = Field("en", description="Language whose lexicon pack scored the proposal")
+    skipped_stages: List[str] = Field(default_factory=list, description="Stages that did not complete and used their neutral value; [\"analysis\"] when the whole analysis failed")
+    pass_probability: Optional[float] = Field(None, ge=0, le=1, description="Learned probability that the proposal passes; null without a trained model")
 
 class HealthResponse(BaseModel):
     status: str
@@ -86,3 +95,80 @@ class BatchAnalysisResponse(BaseModel):
     results: List[AnalysisResponse]
     total_processed: int
     processing_time: float
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobSubmitRequest(BaseModel):
+    proposals: List[AnalysisRequest] = Field(..., min_items=1, description="Proposals to analyze")
+    priority: int = Field(5, ge=0, le=9, description="0 is most urgent, 9 is bulk backfill")
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    priority: int
+    total: int
+    queue_position: int
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    priority: int
+    total: int
+    completed: int
+    failed: int
+    progress: float = Field(..., ge=0, le=1)
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queue_time: Optional[float] = Field(None, description="Seconds spent waiting before the first item ran")
+    run_time: Optional[float] = Field(None, description="Seconds between start and finish")
+    results: Optional[List[Optional[AnalysisResponse]]] = None
+    error: Optional[str] = None
+
+class RankedProposal(BaseModel):
+    rank: int
+    index: int = Field(..., description="Zero-based line number of the proposal in the request body")
+    title: str
+    score: float = Field(..., description="Ranking score; the full analysis score in deep mode")
+    quick_score: float = Field(..., description="Keyword score without sentiment, used to pick the candidates")
+    analysis: Optional[AnalysisResponse] = None
+
+class RankResponse(BaseModel):
+    k: int
+    deep: bool
+    received: int
+    rejected: int
+    errors: List[Dict[str, Any]] = Field(default_factory=list, description="First rejected lines and why")
+    ranked: List[RankedProposal]
+    processing_time: float
+
+class SearchHit(BaseModel):
+    id: str = Field(..., description="Digest of the proposal title and description")
+    title: str
+    category: Optional[ProposalCategory] = None
+    language: str
+    score: float
+    impact_score: float
+    feasibility_score: float
+    clarity_score: float
+    budget_appropriateness: float
+    confidence: float
+    risk_factors: List[str]
+    indexed_at: float
+
+class SearchResponse(BaseModel):
+    total: int = Field(..., description="Matching proposals; results holds the best `limit` of them")
+    results: List[SearchHit]
+    took_ms: float
+
+class DocumentAnalysisResponse(AnalysisResponse):
+    format: str = Field(..., description="Extractor used: pdf, html, markdown or text")
+    bytes: int = Field(..., description="Size of the uploaded document")
+    characters: int = Field(..., description="Normalized text characters scored")
+    words: int
+    chunks: int = Field(..., description="Chunks scored and combined")
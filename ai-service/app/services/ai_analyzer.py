@@ -1,22 +1,233 @@
+import copy
+import hashlib
+import sys
 import time
 import re
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 import numpy as np
 from textblob import TextBlob
+import textblob.en as textblob_en
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-import spacy
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.models.records import AnalysisRecord
 from app.models.schemas import AnalysisRequest, AnalysisResponse, SentimentType
+from app.services.language import WORD_RE, detect_language
+from app.services.learned_scorer import LinearTextModel
+from app.services.lexicons import LexiconPack, LexiconRegistry, ModelCache
+from app.services.memo import LRUMemo
+from app.services.score_weights import (
+    BUDGET_WEIGHT, CLARITY_WEIGHT, FEASIBILITY_WEIGHT, IMPACT_WEIGHT, SENTIMENT_ADJUSTMENT
+)
+from app.services.stage_graph import Stage, StageGraph
+from app.services.vector_scoring import BatchScores, VectorScorer
 
 logger = get_logger(__name__)
 
+# Lexicons are module-level tuples so they are built once, not on every call
+IMPACT_CATEGORY_KEYWORDS = {
+    'education': ('education', 'learning', 'students', 'school', 'knowledge', 'skills'),
+    'healthcare': ('health', 'medical', 'wellness', 'treatment', 'care', 'patients'),
+    'environment': ('environment', 'sustainability', 'green', 'climate', 'conservation', 'renewable'),
+    'community': ('community', 'local', 'residents', 'neighborhood', 'social', 'together'),
+    'technology': ('technology', 'digital', 'innovation', 'tech', 'software', 'hardware')
+}
+IMPACT_INDICATORS = (
+    'benefit', 'help', 'support', 'improve', 'enhance', 'create', 'establish',
+    'provide', 'offer', 'enable', 'empower', 'transform', 'positive change'
+)
+IMPACT_SCALE_INDICATORS = ('community', 'local', 'regional', 'widespread', 'many', 'multiple')
+FEASIBILITY_INDICATORS = (
+    'plan', 'timeline', 'schedule', 'steps', 'process', 'methodology',
+    'resources', 'team', 'partners', 'budget', 'cost', 'funding'
+)
+FEASIBILITY_RISK_INDICATORS = (
+    'uncertain', 'risky', 'challenging', 'difficult', 'complex', 'unproven',
+    'experimental', 'pilot', 'test', 'trial'
+)
+STRUCTURE_INDICATORS = (
+    'objective', 'goal', 'purpose', 'target', 'outcome', 'result',
+    'method', 'approach', 'strategy', 'implementation', 'deliverable'
+)
+SPECIFICITY_INDICATORS = (
+    'specific', 'detailed', 'concrete', 'measurable', 'quantifiable',
+    'timeline', 'deadline', 'milestone', 'metric', 'kpi'
+)
+BUDGET_KEYWORDS = ('budget', 'cost', 'funding', 'expense', 'price', 'financial')
+BUDGET_SCALE_INDICATORS = ('large', 'small', 'comprehensive', 'basic', 'extensive', 'limited')
+CONFIDENCE_STRUCTURE_WORDS = ('objective', 'plan', 'timeline', 'budget', 'outcome')
+
+# English is built in; other languages are JSON packs in app/lexicons loaded on demand
+ENGLISH_LEXICON = LexiconPack(
+    "en", "en_core_web_sm", IMPACT_CATEGORY_KEYWORDS,
+    impact_indicators=IMPACT_INDICATORS,
+    impact_scale_indicators=IMPACT_SCALE_INDICATORS,
+    feasibility_indicators=FEASIBILITY_INDICATORS,
+    feasibility_risk_indicators=FEASIBILITY_RISK_INDICATORS,
+    structure_indicators=STRUCTURE_INDICATORS,
+    specificity_indicators=SPECIFICITY_INDICATORS,
+    budget_keywords=BUDGET_KEYWORDS,
+    budget_scale_indicators=BUDGET_SCALE_INDICATORS,
+    confidence_structure_words=CONFIDENCE_STRUCTURE_WORDS,
+    risk_experimental_words=('pilot', 'experimental'),
+    risk_unproven_words=('unproven', 'novel'),
+    strength_community_words=('community', 'benefit'),
+    strength_timeline_words=('timeline', 'schedule'),
+    strength_measurable_words=('measurable', 'outcome')
+)
+
+def _intern_all(*messages: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(message) for message in messages)
+
+def _flag_table(messages: Tuple[str, ...], fallback: Tuple[str, ...] = ()) -> Tuple[Tuple[str, ...], ...]:
+    """Precompute the message tuple for every combination of triggered flags.
+
+    Bit ``i`` of the index selects ``messages[i]``, so a result is a single
+    tuple lookup instead of a freshly built list.
+    """
+    return tuple(
+        tuple(message for bit, message in enumerate(messages) if mask >> bit & 1) or fallback
+        for mask in range(1 << len(messages))
+    )
+
+RECOMMENDATION_TABLE = _flag_table(
+    _intern_all(
+        "Consider emphasizing the social impact and community benefits more clearly",
+        "Provide more detailed implementation plans and timeline",
+        "Add more specific details and measurable outcomes",
+        "Include detailed budget breakdown and cost justification"
+    ),
+    _intern_all("This is a well-structured proposal with good potential")
+)
+RISK_TABLE = _flag_table(
+    _intern_all(
+        "High funding amount may require additional oversight",
+        "Experimental nature may carry implementation risks",
+        "Unproven approach may have uncertain outcomes",
+        "Limited detail may indicate insufficient planning"
+    )
+)
+STRENGTH_TABLE = _flag_table(
+    _intern_all(
+        "Comprehensive and well-thought-out proposal",
+        "Clear community focus and benefit",
+        "Includes implementation timeline",
+        "Defines measurable outcomes"
+    ),
+    _intern_all("Proposal shows potential for improvement")
+)
+
+# Summary fragments keyed by score band: (minimum score, text)
+SUMMARY_PREFIXES = (
+    (8.0, sys.intern("This high-quality proposal titled '")),
+    (6.0, sys.intern("This well-structured proposal titled '")),
+    (4.0, sys.intern("This moderate proposal titled '")),
+    (float("-inf"), sys.intern("This needs improvement proposal titled '"))
+)
+SUMMARY_SUFFIXES = (
+    (7.0, sys.intern("... The proposal shows strong potential for social impact.")),
+    (5.0, sys.intern("... The proposal shows moderate potential for social impact.")),
+    (float("-inf"), sys.intern("... The proposal shows limited potential for social impact."))
+)
+SUMMARY_PRESENTS = sys.intern("' presents a ")
+
+DEFAULT_SUMMARY = sys.intern("Analysis temporarily unavailable. Manual review recommended.")
+DEFAULT_RECOMMENDATIONS = _intern_all("Review proposal manually", "Consider community feedback")
+DEFAULT_RISK_FACTORS = _intern_all("Analysis service unavailable")
+DEFAULT_STRENGTHS = _intern_all("Proposal submitted for review")
+# skipped_stages of the placeholder returned when the analysis as a whole failed,
+# so it is never cached, indexed or compared as if it were a real result
+FAILED_STAGES = ("analysis",)
+
+# Values a stage falls back to when it fails or times out
+NEUTRAL_SCORE = 5.0
+NEUTRAL_CONFIDENCE = 0.5
+
+# Stage producing each response field; fields not listed come with every response
+FIELD_STAGES = {
+    "score": "overall",
+    "sentiment": "sentiment",
+    "impact_score": "impact",
+    "feasibility_score": "feasibility",
+    "clarity_score": "clarity",
+    "budget_appropriateness": "budget",
+    "summary": "summary",
+    "recommendations": "recommendations",
+    "risk_factors": "risk_factors",
+    "strengths": "strengths",
+    "confidence": "confidence",
+    "pass_probability": "pass_probability",
+}
+
+# Stages scored per chunk of a long document; the rest are derived once for the whole document
+CHUNK_STAGES = ("impact", "feasibility", "clarity", "budget", "sentiment", "confidence", "risk_factors", "strength_flags")
+# Chunks are seen once; a disabled memo keeps a large ingest from evicting live entries
+CHUNK_MEMO = LRUMemo(0)
+# Risk table bits that depend on the text rather than the amount or the length
+TEXT_RISK_BITS = 0b0110
+LIMITED_DETAIL_WORDS = 150
+
+# Modules whose code determines the scores; part of the analyzer version
+SCORING_MODULES = ("app.services.ai_analyzer", "app.services.vector_scoring", "app.services.language",
+                   "app.services.learned_scorer")
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+def _rounded3(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+class ProposalText:
+    """Text views of one proposal, derived lazily and at most once."""
+    
+    def __init__(self, title: str, description: str):
+        self.title = title
+        self.description = description
+        self.full = f"{title}. {description}"
+        # Keyed on both parts: the same full text can split into different descriptions
+        self.digest = hashlib.blake2b(
+            f"{title}\x00{description}".encode("utf-8"), digest_size=16
+        ).digest()
+    
+    @cached_property
+    def lower(self) -> str:
+        return self.full.lower()
+    
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.full.split())
+    
+    def memoized(self, memo: LRUMemo, stage: str, compute, *params):
+        """Return a stage result for this text from ``memo``, computing it on a miss."""
+        return memo.get_or_compute((self.digest, stage) + params, compute, label=stage)
+    
+    def cached(self, memo: LRUMemo, stage: str, *params):
+        """Return a stage result for this text from ``memo`` if it is there, otherwise MISSING."""
+        return memo.lookup((self.digest, stage) + params, label=stage)
+
+class AnalysisContext:
+    """Per-request inputs shared by every analysis stage."""
+    
+    __slots__ = ("request", "text", "amount", "language", "lexicon", "memo")
+    
+    def __init__(self, request: AnalysisRequest, text: ProposalText, language: str, lexicon: LexiconPack,
+                 memo: LRUMemo):
+        self.request = request
+        self.text = text
+        self.amount = request.amount
+        self.language = language
+        self.lexicon = lexicon
+        self.memo = memo
+
 class AIAnalyzer:
     """AI-powered proposal analysis service."""
     
@@ -35,15 +246,76 @@ class AIAnalyzer:
             nltk.download('vader_lexicon', quiet=True)
             nltk.download('stopwords', quiet=True)
         
-        # Load spaCy model (fallback to basic if not available)
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("spaCy model not found, using basic tokenization")
-            self.nlp = None
+        # Lexicon packs and spaCy models are loaded per language on first use
+        self.lexicons = LexiconRegistry({"en": ENGLISH_LEXICON}, maxsize=settings.LANGUAGE_PACK_CACHE_SIZE)
+        self.models = ModelCache(maxsize=settings.SPACY_MODEL_CACHE_SIZE)
+        
+        # Per-stage sub-score memo keyed by (text digest, stage, stage parameters)
+        self.memo = LRUMemo(settings.ANALYSIS_MEMO_SIZE)
+        
+        # Vectorized batch scorers, one per language
+        self.vector_scorers: Dict[str, VectorScorer] = {}
+        
+        # Analysis stages; offloaded ones run on a shared executor with timeouts
+        self.stage_graph = self._build_stage_graph()
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.ANALYSIS_STAGE_WORKERS, thread_name_prefix="analysis-stage"
+        ) if settings.ANALYSIS_STAGE_WORKERS > 0 else None
         
         # Initialize reference texts for comparison
         self._init_reference_texts()
+        
+        # Learned pass probability, trained offline with scripts/train_scorer.py; off without an artifact
+        self.learned_model = None
+        if settings.LEARNED_MODEL_PATH:
+            try:
+                self.learned_model = LinearTextModel.load(settings.LEARNED_MODEL_PATH)
+                logger.info("Loaded learned model %s from %s", self.learned_model.fingerprint, settings.LEARNED_MODEL_PATH)
+            except (OSError, ValueError) as e:
+                logger.error("Learned model %s could not be loaded; pass_probability is off: %s", settings.LEARNED_MODEL_PATH, e)
+        
+        # Changes whenever scoring code, any lexicon pack or the learned model changes
+        self.version = self._fingerprint()
+    
+    def _fingerprint(self) -> str:
+        """Version of the scores this analyzer produces, for cache validators."""
+        digest = hashlib.blake2b(settings.VERSION.encode("utf-8"), digest_size=8)
+        for module in SCORING_MODULES:
+            digest.update(Path(sys.modules[module].__file__).read_bytes())
+        digest.update(self.lexicons.fingerprint().encode("utf-8"))
+        if self.learned_model is not None:
+            digest.update(self.learned_model.fingerprint.encode("utf-8"))
+        return f"{settings.VERSION}+{digest.hexdigest()}"
+    
+    def worker(self) -> "AIAnalyzer":
+        """Analyzer for one pool thread, with NLP state of its own.
+        
+        VADER is a shallow copy, so its lexicon dict stays shared, and spaCy
+        models get a cache of their own, filled on first use. Lexicon packs,
+        the memo, stage statistics and the learned model are shared with
+        this analyzer; all are read-only or locked.
+        
+        The worker has no stage executor and runs every stage on its own
+        thread: the pool is the parallelism, and offloading sentiment to the
+        shared executor would cap the pool at ANALYSIS_STAGE_WORKERS. Stage
+        timeouts therefore do not apply; deadlines still skip optional stages.
+        """
+        worker = copy.copy(self)
+        worker.executor = None
+        worker.sia = copy.copy(self.sia)
+        worker.models = ModelCache(maxsize=settings.SPACY_MODEL_CACHE_SIZE)
+        # Stage functions are bound to the analyzer that runs them
+        worker.stage_graph = worker._build_stage_graph(stats_from=self.stage_graph)
+        return worker
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline for English, loaded on first access."""
+        return self.nlp_for("en")
+    
+    def nlp_for(self, language: str):
+        """spaCy pipeline for a language, or None when its model is unavailable."""
+        return self.models.get(self.lexicons.get(language).spacy_model)
     
     def _init_reference_texts(self):
         """Initialize reference texts for quality comparison."""
@@ -54,61 +326,297 @@ class AIAnalyzer:
             "Our project focuses on environmental conservation through tree planting, waste reduction programs, and community education about sustainable living practices."
         ]
     
-    def analyze_proposal(self, request: AnalysisRequest) -> AnalysisResponse:
+    def warm_up(self) -> None:
+        """Load lazily built state before the first request.
+        
+        Loads the English spaCy model, TextBlob's lexicon and the vector
+        scorer by analyzing a sample proposal. Every stage runs inline, so
+        no executor threads are started and the analyzer is still safe to
+        share with forked worker processes afterwards.
+        """
+        start_time = time.time()
+        request = AnalysisRequest(
+            title="Community garden warm-up",
+            description=self.reference_texts[0],
+            amount=1.0,
+            language="en"
+        )
+        text = ProposalText(request.title, request.description)
+        self.nlp
+        self.stage_graph.run(AnalysisContext(request, text, "en", self.lexicons.get("en"), self.memo), None)
+        self.score_batch([request])
+        logger.info("Analyzer warmed up in %.2fs", time.time() - start_time)
+    
+    def analyze_proposal(self, request: AnalysisRequest, deadline: Optional[float] = None) -> AnalysisResponse:
         """Analyze a proposal and return comprehensive scoring."""
+        return self.analyze_record(request, deadline).to_response()
+    
+    def analyze_record(self, request: AnalysisRequest, deadline: Optional[float] = None,
+                       fields: Optional[Iterable[str]] = None, memo: Optional[LRUMemo] = None) -> AnalysisRecord:
+        """Analyze a proposal and return the internal result record.
+        
+        ``deadline`` is an absolute ``time.monotonic()`` value; the request's
+        own ``deadline_ms`` budget applies too, whichever ends first. Stages
+        that do not fit are skipped and listed in ``skipped_stages``.
+        
+        With ``fields``, only the stages those response fields need run and
+        the other score fields of the record are None.
+        
+        ``memo`` replaces the shared sub-score memo, so callers analyzing
+        many short-lived revisions of one text do not evict everyone else's.
+        """
         start_time = time.time()
+        if request.deadline_ms is not None:
+            budget_end = time.monotonic() + request.deadline_ms / 1000
+            deadline = budget_end if deadline is None else min(deadline, budget_end)
         
         try:
-            # Combine title and description for analysis
-            full_text = f"{request.title}. {request.description}"
+            text = ProposalText(request.title, request.description)
+            memo = self.memo if memo is None else memo
+            language = self._resolve_language(text, request.language, memo=memo)
+            context = AnalysisContext(request, text, language, self.lexicons.get(language), memo)
             
-            # Perform various analyses
-            sentiment_score = self._analyze_sentiment(full_text)
-            impact_score = self._analyze_impact(full_text, request.category)
-            feasibility_score = self._analyze_feasibility(full_text, request.amount)
-            clarity_score = self._analyze_clarity(full_text)
-            budget_score = self._analyze_budget_appropriateness(request.amount, request.description)
-            
-            # Calculate overall score
-            overall_score = self._calculate_overall_score(
-                impact_score, feasibility_score, clarity_score, budget_score, sentiment_score
-            )
-            
-            # Generate summary and recommendations
-            summary = self._generate_summary(request.title, request.description, overall_score)
-            recommendations = self._generate_recommendations(
-                impact_score, feasibility_score, clarity_score, budget_score
-            )
-            risk_factors = self._identify_risk_factors(full_text, request.amount)
-            strengths = self._identify_strengths(full_text, overall_score)
-            
-            # Calculate confidence based on text quality and completeness
-            confidence = self._calculate_confidence(full_text, request.amount)
+            # Independent stages overlap; a failed stage yields its neutral value
+            targets = None if fields is None else [FIELD_STAGES[field] for field in fields if field in FIELD_STAGES]
+            run = self.stage_graph.run(context, self.executor, deadline, targets)
+            values = run.values
             
             processing_time = time.time() - start_time
             
-            return AnalysisResponse(
-                score=round(overall_score, 2),
-                sentiment=sentiment_score,
-                impact_score=round(impact_score, 2),
-                feasibility_score=round(feasibility_score, 2),
-                clarity_score=round(clarity_score, 2),
-                budget_appropriateness=round(budget_score, 2),
-                summary=summary,
-                recommendations=recommendations,
-                risk_factors=risk_factors,
-                strengths=strengths,
-                confidence=round(confidence, 2),
-                processing_time=round(processing_time, 3)
+            # Stages left out of a projected run have no value; their fields stay None
+            return AnalysisRecord(
+                _rounded(values.get("overall")),
+                values.get("sentiment"),
+                _rounded(values.get("impact")),
+                _rounded(values.get("feasibility")),
+                _rounded(values.get("clarity")),
+                _rounded(values.get("budget")),
+                values.get("summary"),
+                values.get("recommendations"),
+                values.get("risk_factors"),
+                values.get("strengths"),
+                _rounded(values.get("confidence")),
+                round(processing_time, 3),
+                language,
+                tuple(run.failed),
+                _rounded3(values.get("pass_probability"))
             )
             
         except Exception as e:
-            logger.error(f"Error analyzing proposal: {str(e)}")
+            logger.error("Error analyzing proposal: %s", e)
             # Return default analysis on error
             return self._get_default_analysis(request, time.time() - start_time)
     
-    def _analyze_sentiment(self, text: str) -> SentimentType:
+    def analyze_chunk(self, request: AnalysisRequest) -> Dict:
+        """Stage values for one chunk of a long document, to be combined with ``combine_chunks``."""
+        text = ProposalText(request.title, request.description)
+        language = self._resolve_language(text, request.language, memoize=False)
+        context = AnalysisContext(request, text, language, self.lexicons.get(language), CHUNK_MEMO)
+        values = dict(self.stage_graph.run(context, self.executor, None, CHUNK_STAGES).values)
+        risks = values.pop("risk_factors")
+        values["risk_flags"] = TEXT_RISK_BITS & sum(
+            1 << bit for bit, message in enumerate(RISK_TABLE[-1]) if message in risks
+        )
+        values["language"] = language
+        return values
+    
+    def combine_chunks(self, title: str, lead: str, amount: float, words: int, impact: float,
+                       feasibility: float, clarity: float, budget: float, sentiment: SentimentType,
+                       confidence: float, risk_flags: int, strength_flags: int, language: str,
+                       processing_time: float) -> AnalysisRecord:
+        """Build a document's analysis from its chunk scores, already averaged.
+        
+        The overall score, summary, recommendations and the amount- and
+        length-based risks are derived here once, as for a single proposal.
+        """
+        overall = self._calculate_overall_score(impact, feasibility, clarity, budget, sentiment)
+        return AnalysisRecord(
+            round(overall, 2),
+            sentiment,
+            round(impact, 2),
+            round(feasibility, 2),
+            round(clarity, 2),
+            round(budget, 2),
+            self._generate_summary(title, lead, overall),
+            self._generate_recommendations(impact, feasibility, clarity, budget),
+            RISK_TABLE[(amount > 5.0) | risk_flags | (words < LIMITED_DETAIL_WORDS) << 3],
+            STRENGTH_TABLE[(overall >= 8.0) | strength_flags],
+            round(confidence, 2),
+            round(processing_time, 3),
+            language
+        )
+    
+    def _build_stage_graph(self, stats_from: Optional[StageGraph] = None) -> StageGraph:
+        """Declare the analysis stages and what each one depends on."""
+        def stage(name, compute, requires=(), fallback=None, optional=False, lookup=None):
+            offload = name in settings.ANALYSIS_OFFLOADED_STAGES
+            timeout = settings.ANALYSIS_STAGE_TIMEOUTS.get(name, settings.ANALYSIS_STAGE_TIMEOUT) if offload else None
+            return Stage(name, compute, requires, fallback, offload, timeout, optional, lookup)
+        
+        # Sentiment is the only expensive stage; under a tight deadline the
+        # keyword stages still produce a full score without it. A memoized
+        # sentiment is read on the calling thread, not sent to the executor
+        sub_scores = ("impact", "feasibility", "clarity", "budget")
+        return StageGraph([
+            stage("sentiment", self._sentiment_stage, fallback=SentimentType.NEUTRAL, optional=True,
+                  lookup=lambda context: context.text.cached(context.memo, "sentiment", context.language)),
+            stage("impact", self._impact_stage, fallback=NEUTRAL_SCORE),
+            stage("feasibility", self._feasibility_stage, fallback=NEUTRAL_SCORE),
+            stage("clarity", self._clarity_stage, fallback=NEUTRAL_SCORE),
+            stage("budget", self._budget_stage, fallback=NEUTRAL_SCORE),
+            stage("risk_factors", self._risk_factors_stage, fallback=RISK_TABLE[0]),
+            stage("strength_flags", self._strength_flags_stage, fallback=0),
+            stage("confidence", self._confidence_stage, fallback=NEUTRAL_CONFIDENCE),
+            stage("pass_probability", self._pass_probability_stage),
+            stage("overall", lambda context, *scores: self._calculate_overall_score(*scores),
+                  requires=sub_scores + ("sentiment",), fallback=NEUTRAL_SCORE),
+            stage("summary", lambda context, overall: self._generate_summary(context.request.title, context.request.description, overall),
+                  requires=("overall",), fallback=DEFAULT_SUMMARY),
+            stage("recommendations", lambda context, *scores: self._generate_recommendations(*scores),
+                  requires=sub_scores, fallback=DEFAULT_RECOMMENDATIONS),
+            stage("strengths", lambda context, overall, flags: STRENGTH_TABLE[(overall >= 8.0) | flags],
+                  requires=("overall", "strength_flags"), fallback=STRENGTH_TABLE[0]),
+        ], stats_from)
+    
+    # Stage functions reuse memoized results for text seen before
+    def _sentiment_stage(self, context: AnalysisContext) -> SentimentType:
+        text, lexicon = context.text, context.lexicon
+        return text.memoized(context.memo, "sentiment", lambda: self._analyze_sentiment(text.full, lexicon), context.language)
+    
+    def _impact_stage(self, context: AnalysisContext) -> float:
+        text, lexicon, category = context.text, context.lexicon, context.request.category
+        return self._combine_impact(
+            text.memoized(context.memo, "impact_category", lambda: self._impact_category_matches(text.lower, category, lexicon), context.language, category),
+            *text.memoized(context.memo, "impact_general", lambda: self._impact_general_matches(text.lower, lexicon), context.language)
+        )
+    
+    def _feasibility_stage(self, context: AnalysisContext) -> float:
+        text, lexicon, amount = context.text, context.lexicon, context.amount
+        return text.memoized(context.memo, "feasibility", lambda: self._analyze_feasibility(text.lower, amount, lexicon), context.language, amount)
+    
+    def _clarity_stage(self, context: AnalysisContext) -> float:
+        text, lexicon = context.text, context.lexicon
+        return text.memoized(context.memo, "clarity", lambda: self._analyze_clarity(text.lower, text.word_count, lexicon), context.language)
+    
+    def _budget_stage(self, context: AnalysisContext) -> float:
+        text, lexicon, amount = context.text, context.lexicon, context.amount
+        return text.memoized(context.memo, "budget", lambda: self._analyze_budget_appropriateness(amount, text.description, lexicon), context.language, amount)
+    
+    def _risk_factors_stage(self, context: AnalysisContext) -> Tuple[str, ...]:
+        text, lexicon, amount = context.text, context.lexicon, context.amount
+        return text.memoized(context.memo, "risk_factors", lambda: self._identify_risk_factors(text.lower, text.word_count, amount, lexicon), context.language, amount)
+    
+    def _strength_flags_stage(self, context: AnalysisContext) -> int:
+        text, lexicon = context.text, context.lexicon
+        return text.memoized(context.memo, "strength_flags", lambda: self._strength_text_flags(text.lower, lexicon), context.language)
+    
+    def _confidence_stage(self, context: AnalysisContext) -> float:
+        text, lexicon, amount = context.text, context.lexicon, context.amount
+        return text.memoized(context.memo, "confidence", lambda: self._calculate_confidence(text.lower, text.word_count, amount, lexicon), context.language, amount)
+    
+    def _pass_probability_stage(self, context: AnalysisContext) -> Optional[float]:
+        if self.learned_model is None:
+            return None
+        text, model = context.text, self.learned_model
+        category = getattr(context.request.category, "value", context.request.category)
+        return text.memoized(context.memo, "pass_probability", lambda: model.predict(text.full, category, context.amount), category, context.amount)
+    
+    def stage_stats(self) -> Dict:
+        """Per-stage run, error and timeout counters."""
+        return self.stage_graph.stats()
+    
+    def memory_components(self) -> Dict[str, Callable[[], object]]:
+        """Roots of the large objects this analyzer holds, for memory accounting.
+        
+        Each value is a callable so lazily loaded parts are sized as they
+        are when the report runs.
+        """
+        return {
+            "spacy_models": lambda: self.models,
+            "vader_lexicon": lambda: self.sia,
+            "textblob_lexicons": lambda: (textblob_en.sentiment, textblob_en.lexicon, textblob_en.spelling),
+            "lexicon_packs": lambda: self.lexicons,
+            "analysis_memo": lambda: self.memo,
+            "vector_scorers": lambda: self.vector_scorers,
+            "tfidf_vectorizer": lambda: (self.vectorizer, self.reference_texts),
+        }
+    
+    def score_batch(self, requests: Sequence[AnalysisRequest], sentiment: bool = True,
+                    memoize: bool = True) -> BatchScores:
+        """Score many proposals at once with the vectorized engine.
+        
+        Sub-scores, overall score and confidence equal those of
+        ``analyze_record``. Sentiment still runs per proposal through the
+        memo; with ``sentiment=False`` it is skipped and every proposal is
+        scored as neutral, leaving only the keyword-matrix cost. With
+        ``memoize=False`` the memo is bypassed, so one-off bulk scoring does
+        not evict the entries live traffic relies on.
+        """
+        texts = [ProposalText(request.title, request.description) for request in requests]
+        languages = [self._resolve_language(text, request.language, memoize) for text, request in zip(texts, requests)]
+        
+        parts = []
+        for language in sorted(set(languages)):
+            indices = [i for i, code in enumerate(languages) if code == language]
+            lexicon = self.lexicons.get(language)
+            scorer = self.vector_scorers.get(language)
+            if scorer is None or scorer.lexicon is not lexicon:
+                scorer = self.vector_scorers[language] = VectorScorer(lexicon)
+            
+            sentiments = None
+            if sentiment:
+                sentiments = [
+                    texts[i].memoized(self.memo, "sentiment", lambda: self._analyze_sentiment(texts[i].full, lexicon), language)
+                    if memoize else self._analyze_sentiment(texts[i].full, lexicon)
+                    for i in indices
+                ]
+            scores = scorer.score(
+                [requests[i].title for i in indices],
+                [requests[i].description for i in indices],
+                [requests[i].amount for i in indices],
+                [requests[i].category for i in indices],
+                sentiments
+            )
+            parts.append((indices, scores))
+        
+        if len(parts) == 1:
+            return parts[0][1]
+        
+        merged = {name: np.empty(len(requests)) for name in BatchScores.__slots__}
+        for indices, scores in parts:
+            for name, values in merged.items():
+                values[indices] = getattr(scores, name)
+        return BatchScores(**merged)
+    
+    def memo_stats(self) -> Dict:
+        """Hit/miss counters of the per-stage memo."""
+        return self.memo.stats()
+    
+    def language_stats(self) -> Dict:
+        """Resident lexicon packs and spaCy models."""
+        return {"lexicons": self.lexicons.stats(), "models": self.models.stats()}
+    
+    def _resolve_language(self, text: ProposalText, requested: Optional[str], memoize: bool = True,
+                          memo: Optional[LRUMemo] = None) -> str:
+        """Use the requested language when supported, otherwise detect it."""
+        if requested and self.lexicons.supports(requested):
+            return requested
+        if not memoize:
+            return self._detect_language(text.full)
+        return text.memoized(self.memo if memo is None else memo, "language", lambda: self._detect_language(text.full))
+    
+    def _detect_language(self, text: str) -> str:
+        language, confidence = detect_language(text, self.lexicons.languages)
+        if language is None or confidence < settings.LANGUAGE_MIN_CONFIDENCE:
+            return settings.DEFAULT_LANGUAGE
+        return language
+    
+    def _analyze_sentiment(self, text: str, lexicon: LexiconPack = ENGLISH_LEXICON) -> SentimentType:
         """Analyze sentiment of the proposal text."""
+        if lexicon.code != "en":
+            # TextBlob and VADER only know English
+            return self._lexicon_sentiment(text.lower(), lexicon)
+        
         # Use multiple sentiment analysis methods
         blob = TextBlob(text)
         polarity = blob.sentiment.polarity
@@ -126,62 +634,75 @@ class AIAnalyzer:
         else:
             return SentimentType.NEUTRAL
     
-    def _analyze_impact(self, text: str, category: str = None) -> float:
-        """Analyze social impact potential."""
-        impact_keywords = {
-            'education': ['education', 'learning', 'students', 'school', 'knowledge', 'skills'],
-            'healthcare': ['health', 'medical', 'wellness', 'treatment', 'care', 'patients'],
-            'environment': ['environment', 'sustainability', 'green', 'climate', 'conservation', 'renewable'],
-            'community': ['community', 'local', 'residents', 'neighborhood', 'social', 'together'],
-            'technology': ['technology', 'digital', 'innovation', 'tech', 'software', 'hardware']
-        }
+    def _lexicon_sentiment(self, text_lower: str, lexicon: LexiconPack) -> SentimentType:
+        """Word-list sentiment for languages without a VADER/TextBlob model."""
+        positive = negative = 0
+        for match in WORD_RE.finditer(text_lower):
+            token = match.group()
+            if token in lexicon.positive_set:
+                positive += 1
+            elif token in lexicon.negative_set:
+                negative += 1
+        
+        combined_score = (positive - negative) / (positive + negative) if positive + negative else 0.0
         
-        text_lower = text.lower()
+        if combined_score > 0.1:
+            return SentimentType.POSITIVE
+        elif combined_score < -0.1:
+            return SentimentType.NEGATIVE
+        else:
+            return SentimentType.NEUTRAL
+    
+    def _analyze_impact(self, text_lower: str, category: str = None,
+                        lexicon: LexiconPack = ENGLISH_LEXICON) -> float:
+        """Analyze social impact potential."""
+        return self._combine_impact(
+            self._impact_category_matches(text_lower, category, lexicon),
+            *self._impact_general_matches(text_lower, lexicon)
+        )
+    
+    def _impact_category_matches(self, text_lower: str, category: Optional[str],
+                                 lexicon: LexiconPack = ENGLISH_LEXICON) -> Optional[int]:
+        """Count category keywords; None when the category has no lexicon."""
+        if category and category in lexicon.impact_category_keywords:
+            return sum(1 for word in lexicon.impact_category_keywords[category] if word in text_lower)
+        return None
+    
+    def _impact_general_matches(self, text_lower: str,
+                                lexicon: LexiconPack = ENGLISH_LEXICON) -> Tuple[int, int]:
+        """Count the category-independent impact and scale indicators."""
+        impact_matches = sum(1 for word in lexicon.impact_indicators if word in text_lower)
+        scale_matches = sum(1 for word in lexicon.impact_scale_indicators if word in text_lower)
+        return impact_matches, scale_matches
+    
+    @staticmethod
+    def _combine_impact(category_matches: Optional[int], impact_matches: int, scale_matches: int) -> float:
+        """Turn impact keyword counts into the impact score."""
         base_score = 5.0
         
         # Category-specific impact scoring
-        if category and category in impact_keywords:
-            category_words = impact_keywords[category]
-            matches = sum(1 for word in category_words if word in text_lower)
-            base_score += min(matches * 0.5, 2.0)
+        if category_matches is not None:
+            base_score += min(category_matches * 0.5, 2.0)
         
         # General impact indicators
-        impact_indicators = [
-            'benefit', 'help', 'support', 'improve', 'enhance', 'create', 'establish',
-            'provide', 'offer', 'enable', 'empower', 'transform', 'positive change'
-        ]
-        
-        impact_matches = sum(1 for word in impact_indicators if word in text_lower)
         base_score += min(impact_matches * 0.3, 2.0)
         
         # Scale and reach indicators
-        scale_indicators = ['community', 'local', 'regional', 'widespread', 'many', 'multiple']
-        scale_matches = sum(1 for word in scale_indicators if word in text_lower)
         base_score += min(scale_matches * 0.2, 1.0)
         
         return min(base_score, 10.0)
     
-    def _analyze_feasibility(self, text: str, amount: float) -> float:
+    def _analyze_feasibility(self, text_lower: str, amount: float,
+                             lexicon: LexiconPack = ENGLISH_LEXICON) -> float:
         """Analyze feasibility of the proposal."""
-        text_lower = text.lower()
         base_score = 5.0
         
         # Feasibility indicators
-        feasibility_indicators = [
-            'plan', 'timeline', 'schedule', 'steps', 'process', 'methodology',
-            'resources', 'team', 'partners', 'budget', 'cost', 'funding'
-        ]
-        
-        feasibility_matches = sum(1 for word in feasibility_indicators if word in text_lower)
+        feasibility_matches = sum(1 for word in lexicon.feasibility_indicators if word in text_lower)
         base_score += min(feasibility_matches * 0.4, 2.5)
         
         # Risk indicators (reduce score)
-        risk_indicators = [
-            'uncertain', 'risky', 'challenging', 'difficult', 'complex', 'unproven',
-            'experimental', 'pilot', 'test', 'trial'
-        ]
-        
-        risk_matches = sum(1 for word in risk_indicators if word in text_lower)
+        risk_matches = sum(1 for word in lexicon.feasibility_risk_indicators if word in text_lower)
         base_score -= min(risk_matches * 0.3, 1.5)
         
         # Amount-based feasibility
@@ -192,39 +713,29 @@ class AIAnalyzer:
         
         return max(min(base_score, 10.0), 0.0)
     
-    def _analyze_clarity(self, text: str) -> float:
+    def _analyze_clarity(self, text_lower: str, word_count: int,
+                         lexicon: LexiconPack = ENGLISH_LEXICON) -> float:
         """Analyze clarity and detail of the proposal."""
         base_score = 5.0
         
         # Text length analysis
-        word_count = len(text.split())
         if word_count > 200:
             base_score += 1.0
         elif word_count < 100:
             base_score -= 1.0
         
         # Structure indicators
-        structure_indicators = [
-            'objective', 'goal', 'purpose', 'target', 'outcome', 'result',
-            'method', 'approach', 'strategy', 'implementation', 'deliverable'
-        ]
-        
-        text_lower = text.lower()
-        structure_matches = sum(1 for word in structure_indicators if word in text_lower)
+        structure_matches = sum(1 for word in lexicon.structure_indicators if word in text_lower)
         base_score += min(structure_matches * 0.3, 2.0)
         
         # Specificity indicators
-        specificity_indicators = [
-            'specific', 'detailed', 'concrete', 'measurable', 'quantifiable',
-            'timeline', 'deadline', 'milestone', 'metric', 'kpi'
-        ]
-        
-        specificity_matches = sum(1 for word in specificity_indicators if word in text_lower)
+        specificity_matches = sum(1 for word in lexicon.specificity_indicators if word in text_lower)
         base_score += min(specificity_matches * 0.4, 2.0)
         
         return min(base_score, 10.0)
     
-    def _analyze_budget_appropriateness(self, amount: float, description: str) -> float:
+    def _analyze_budget_appropriateness(self, amount: float, description: str,
+                                        lexicon: LexiconPack = ENGLISH_LEXICON) -> float:
         """Analyze if the budget is appropriate for the proposal."""
         base_score = 5.0
         
@@ -237,18 +748,12 @@ class AIAnalyzer:
             base_score -= 1.0
         
         # Budget justification in description
-        budget_keywords = ['budget', 'cost', 'funding', 'expense', 'price', 'financial']
         description_lower = description.lower()
-        budget_mentions = sum(1 for word in budget_keywords if word in description_lower)
-        
-        if budget_mentions > 0:
+        if any(word in description_lower for word in lexicon.budget_keywords):
             base_score += 1.0
         
         # Scale indicators
-        scale_indicators = ['large', 'small', 'comprehensive', 'basic', 'extensive', 'limited']
-        scale_mentions = sum(1 for word in scale_indicators if word in description_lower)
-        
-        if scale_mentions > 0:
+        if any(word in description_lower for word in lexicon.budget_scale_indicators):
             base_score += 0.5
         
         return max(min(base_score, 10.0), 0.0)
@@ -256,111 +761,63 @@ class AIAnalyzer:
     def _calculate_overall_score(self, impact: float, feasibility: float, 
                                clarity: float, budget: float, sentiment: SentimentType) -> float:
         """Calculate weighted overall score."""
-        # Weighted average with impact being most important
-        weights = {
-            'impact': 0.35,
-            'feasibility': 0.25,
-            'clarity': 0.25,
-            'budget': 0.15
-        }
-        
         base_score = (
-            impact * weights['impact'] +
-            feasibility * weights['feasibility'] +
-            clarity * weights['clarity'] +
-            budget * weights['budget']
+            impact * IMPACT_WEIGHT +
+            feasibility * FEASIBILITY_WEIGHT +
+            clarity * CLARITY_WEIGHT +
+            budget * BUDGET_WEIGHT
         )
         
         # Sentiment adjustment
-        if sentiment == SentimentType.POSITIVE:
-            base_score += 0.5
-        elif sentiment == SentimentType.NEGATIVE:
-            base_score -= 0.5
+        base_score += SENTIMENT_ADJUSTMENT.get(sentiment, 0.0)
         
         return max(min(base_score, 10.0), 0.0)
     
     def _generate_summary(self, title: str, description: str, score: float) -> str:
         """Generate a concise summary of the proposal."""
-        if score >= 8.0:
-            quality = "high-quality"
-        elif score >= 6.0:
-            quality = "well-structured"
-        elif score >= 4.0:
-            quality = "moderate"
-        else:
-            quality = "needs improvement"
-        
-        return f"This {quality} proposal titled '{title}' presents a {description[:100]}... The proposal shows {'strong' if score >= 7 else 'moderate' if score >= 5 else 'limited'} potential for social impact."
+        prefix = next(text for minimum, text in SUMMARY_PREFIXES if score >= minimum)
+        suffix = next(text for minimum, text in SUMMARY_SUFFIXES if score >= minimum)
+        return "".join((prefix, title, SUMMARY_PRESENTS, description[:100], suffix))
     
     def _generate_recommendations(self, impact: float, feasibility: float, 
-                                clarity: float, budget: float) -> List[str]:
+                                clarity: float, budget: float) -> Tuple[str, ...]:
         """Generate improvement recommendations."""
-        recommendations = []
-        
-        if impact < 6.0:
-            recommendations.append("Consider emphasizing the social impact and community benefits more clearly")
-        
-        if feasibility < 6.0:
-            recommendations.append("Provide more detailed implementation plans and timeline")
-        
-        if clarity < 6.0:
-            recommendations.append("Add more specific details and measurable outcomes")
-        
-        if budget < 6.0:
-            recommendations.append("Include detailed budget breakdown and cost justification")
-        
-        if not recommendations:
-            recommendations.append("This is a well-structured proposal with good potential")
-        
-        return recommendations
+        return RECOMMENDATION_TABLE[
+            (impact < 6.0) |
+            (feasibility < 6.0) << 1 |
+            (clarity < 6.0) << 2 |
+            (budget < 6.0) << 3
+        ]
     
-    def _identify_risk_factors(self, text: str, amount: float) -> List[str]:
+    def _identify_risk_factors(self, text_lower: str, word_count: int, amount: float,
+                               lexicon: LexiconPack = ENGLISH_LEXICON) -> Tuple[str, ...]:
         """Identify potential risk factors."""
-        risks = []
-        text_lower = text.lower()
-        
-        if amount > 5.0:
-            risks.append("High funding amount may require additional oversight")
-        
-        if 'pilot' in text_lower or 'experimental' in text_lower:
-            risks.append("Experimental nature may carry implementation risks")
-        
-        if 'unproven' in text_lower or 'novel' in text_lower:
-            risks.append("Unproven approach may have uncertain outcomes")
-        
-        if len(text.split()) < 150:
-            risks.append("Limited detail may indicate insufficient planning")
-        
-        return risks
+        return RISK_TABLE[
+            (amount > 5.0) |
+            any(word in text_lower for word in lexicon.risk_experimental_words) << 1 |
+            any(word in text_lower for word in lexicon.risk_unproven_words) << 2 |
+            (word_count < LIMITED_DETAIL_WORDS) << 3
+        ]
     
-    def _identify_strengths(self, text: str, score: float) -> List[str]:
+    def _identify_strengths(self, text_lower: str, score: float,
+                            lexicon: LexiconPack = ENGLISH_LEXICON) -> Tuple[str, ...]:
         """Identify proposal strengths."""
-        strengths = []
-        text_lower = text.lower()
-        
-        if score >= 8.0:
-            strengths.append("Comprehensive and well-thought-out proposal")
-        
-        if 'community' in text_lower and 'benefit' in text_lower:
-            strengths.append("Clear community focus and benefit")
-        
-        if 'timeline' in text_lower or 'schedule' in text_lower:
-            strengths.append("Includes implementation timeline")
-        
-        if 'measurable' in text_lower or 'outcome' in text_lower:
-            strengths.append("Defines measurable outcomes")
-        
-        if not strengths:
-            strengths.append("Proposal shows potential for improvement")
-        
-        return strengths
+        return STRENGTH_TABLE[(score >= 8.0) | self._strength_text_flags(text_lower, lexicon)]
+    
+    def _strength_text_flags(self, text_lower: str, lexicon: LexiconPack = ENGLISH_LEXICON) -> int:
+        """Strength table bits that depend only on the text."""
+        return (
+            all(word in text_lower for word in lexicon.strength_community_words) << 1 |
+            any(word in text_lower for word in lexicon.strength_timeline_words) << 2 |
+            any(word in text_lower for word in lexicon.strength_measurable_words) << 3
+        )
     
-    def _calculate_confidence(self, text: str, amount: float) -> float:
+    def _calculate_confidence(self, text_lower: str, word_count: int, amount: float,
+                              lexicon: LexiconPack = ENGLISH_LEXICON) -> float:
         """Calculate confidence in the analysis."""
         confidence = 0.5  # Base confidence
         
         # Text quality factors
-        word_count = len(text.split())
         if word_count > 200:
             confidence += 0.2
         elif word_count < 100:
@@ -373,25 +830,25 @@ class AIAnalyzer:
             confidence -= 0.1
         
         # Structure indicators
-        structure_words = ['objective', 'plan', 'timeline', 'budget', 'outcome']
-        structure_count = sum(1 for word in structure_words if word in text.lower())
+        structure_count = sum(1 for word in lexicon.confidence_structure_words if word in text_lower)
         confidence += min(structure_count * 0.05, 0.1)
         
         return max(min(confidence, 1.0), 0.0)
     
-    def _get_default_analysis(self, request: AnalysisRequest, processing_time: float) -> AnalysisResponse:
+    def _get_default_analysis(self, request: AnalysisRequest, processing_time: float) -> AnalysisRecord:
         """Return default analysis when processing fails."""
-        return AnalysisResponse(
-            score=5.0,
-            sentiment=SentimentType.NEUTRAL,
-            impact_score=5.0,
-            feasibility_score=5.0,
-            clarity_score=5.0,
-            budget_appropriateness=5.0,
-            summary="Analysis temporarily unavailable. Manual review recommended.",
-            recommendations=["Review proposal manually", "Consider community feedback"],
-            risk_factors=["Analysis service unavailable"],
-            strengths=["Proposal submitted for review"],
-            confidence=0.3,
-            processing_time=processing_time
+        return AnalysisRecord(
+            5.0,
+            SentimentType.NEUTRAL,
+            5.0,
+            5.0,
+            5.0,
+            5.0,
+            DEFAULT_SUMMARY,
+            DEFAULT_RECOMMENDATIONS,
+            DEFAULT_RISK_FACTORS,
+            DEFAULT_STRENGTHS,
+            0.3,
+            processing_time,
+            skipped_stages=FAILED_STAGES
         )
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+from app.models.schemas import AnalysisRequest
+from app.services.loop_watchdog import LagHistogram
+from app.services.memo import LRUMemo
+
+logger = get_logger(__name__)
+
+# Upper bounds of the wait-time histogram buckets, in milliseconds
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class AnalyzerPool:
+    """Fixed set of threads, each analyzing with an analyzer instance of its own.
+
+    A thread builds its instance from ``primary`` on its first call (see
+    ``AIAnalyzer.worker``): VADER and spaCy state are per instance, while
+    lexicon packs, the memo and the learned model stay shared. An instance
+    serves one call at a time, so calls never interleave on NLP state.
+
+    Before a call, an instance not checked for ``health_interval`` seconds
+    (or whose last call raised) analyzes a canary proposal with a private
+    memo. If the result differs from the primary's, the instance is
+    dropped and rebuilt. Calls wait for a free thread in submission order;
+    how long they wait is kept as a histogram.
+    """
+
+    def __init__(self, primary, size: int = 4, health_interval: float = 60.0):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+        self.primary = primary
+        self.size = size
+        self.health_interval = health_interval
+        self.canary = AnalysisRequest(
+            title="Community garden health check",
+            description=primary.reference_texts[0],
+            amount=1.0,
+            language="en"
+        )
+        self._expected: Optional[Dict[str, Any]] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Thread ident -> that thread's current instance
+        self._instances: Dict[int, Any] = {}
+        self.wait = LagHistogram(WAIT_BUCKETS_MS)
+        self.queued = 0
+        self.busy = 0
+        self.calls = 0
+        self.errors = 0
+        self.built = 0
+        self.checks = 0
+        self.replaced = 0
+        # Started on first use, so the pool can be stopped with the app and used again after a restart
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, method: str, *args) -> Any:
+        """Call ``method`` with ``args`` on the instance of a pool thread."""
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="analyzer")
+            executor = self.executor
+            self.queued += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self._call, time.monotonic(), method, args
+        )
+
+    def _call(self, submitted: float, method: str, args: tuple) -> Any:
+        waited_ms = (time.monotonic() - submitted) * 1000
+        with self._lock:
+            self.wait.record(waited_ms)
+            self.queued -= 1
+            self.busy += 1
+            self.calls += 1
+        try:
+            return getattr(self._instance(), method)(*args)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            # Checked again before its next call
+            self._local.checked_at = None
+            raise
+        finally:
+            with self._lock:
+                self.busy -= 1
+
+    def _instance(self):
+        """This thread's instance: built on first use, rebuilt when a health check fails."""
+        analyzer = getattr(self._local, "analyzer", None)
+        if analyzer is None:
+            return self._build()
+        checked_at = self._local.checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.health_interval:
+            if not self.check(analyzer):
+                logger.warning(f"Pooled analyzer on {threading.current_thread().name} failed its health check; rebuilding it")
+                with self._lock:
+                    self.replaced += 1
+                return self._build()
+            self._local.checked_at = time.monotonic()
+        return analyzer
+
+    def _build(self):
+        analyzer = self.primary.worker()
+        self._local.analyzer = analyzer
+        self._local.checked_at = time.monotonic()
+        with self._lock:
+            self._instances[threading.get_ident()] = analyzer
+            self.built += 1
+        return analyzer
+
+    def _canary_result(self, analyzer) -> Dict[str, Any]:
+        # A private memo, so the canary runs every stage instead of reading cached sub-scores
+        record = analyzer.analyze_record(self.canary, None, None, LRUMemo(16))
+        result = record.to_dict()
+        del result["processing_time"]
+        return result
+
+    def check(self, analyzer) -> bool:
+        """Whether ``analyzer`` scores the canary exactly as the primary does."""
+        with self._lock:
+            self.checks += 1
+        try:
+            result = self._canary_result(analyzer)
+            if self._expected is None:
+                expected = self._canary_result(self.primary)
+                # A primary run cut short by a stage timeout is no reference
+                if expected["skipped_stages"]:
+                    return not result["skipped_stages"]
+                self._expected = expected
+        except Exception as e:
+            logger.error(f"Health check of a pooled analyzer raised: {str(e)}")
+            return False
+        return result == self._expected
+
+    def instances(self) -> List[Any]:
+        with self._lock:
+            return list(self._instances.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "instances": len(self._instances),
+                "busy": self.busy,
+                "queued": self.queued,
+                "calls": self.calls,
+                "errors": self.errors,
+                "built": self.built,
+                "health_checks": self.checks,
+                "replaced": self.replaced,
+                "health_interval": self.health_interval,
+                "wait": self.wait.to_dict(),
+            }
+
+    def stop(self) -> None:
+        """Shut the threads down; their instances go with them."""
+        with self._lock:
+            executor, self.executor = self.executor, None
+            self._instances.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
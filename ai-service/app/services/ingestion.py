@@ -0,0 +1,395 @@
+import asyncio
+import codecs
+import re
+import tempfile
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.models.records import AnalysisRecord
+from app.models.schemas import AnalysisRequest, ProposalCategory, SentimentType
+
+logger = get_logger(__name__)
+
+FORMATS = ("pdf", "html", "markdown", "text")
+
+CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "text/html": "html",
+    "application/xhtml+xml": "html",
+    "text/markdown": "markdown",
+    "text/x-markdown": "markdown",
+    "text/plain": "text",
+}
+
+# A word longer than this is flushed even without trailing whitespace
+MAX_HELD_CHARS = 4096
+
+# Characters of the document start quoted in the summary
+LEAD_CHARS = 100
+
+SENTIMENT_VALUES = {SentimentType.POSITIVE: 1.0, SentimentType.NEUTRAL: 0.0, SentimentType.NEGATIVE: -1.0}
+
+
+class DocumentError(Exception):
+    """The upload cannot be ingested; ``status_code`` says why."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def document_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """Pick the extractor from an explicit format or the Content-Type header."""
+    if requested:
+        if requested not in FORMATS:
+            raise DocumentError(400, f"Unknown format '{requested}'; expected one of {', '.join(FORMATS)}")
+        return requested
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in CONTENT_TYPES:
+        raise DocumentError(415, f"Unsupported content type '{media_type or 'none'}'; pass ?format= or one of {', '.join(CONTENT_TYPES)}")
+    return CONTENT_TYPES[media_type]
+
+
+class HTMLTextExtractor(HTMLParser):
+    """Visible text of an HTML stream, fed in arbitrary pieces."""
+
+    SKIPPED_TAGS = frozenset(("script", "style", "head", "noscript", "template", "svg"))
+    BLOCK_TAGS = frozenset((
+        "p", "div", "br", "li", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6",
+        "section", "article", "header", "footer", "blockquote", "pre", "hr", "table", "ul", "ol",
+    ))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS:
+            self._skipping = max(self._skipping - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self._parts.append(data)
+
+    def feed(self, text: str) -> str:
+        super().feed(text)
+        return self._take()
+
+    def close(self) -> str:
+        super().close()
+        return self._take()
+
+    def _take(self) -> str:
+        text = "".join(self._parts)
+        self._parts.clear()
+        return text
+
+
+class MarkdownTextExtractor:
+    """Prose of a Markdown stream: markup, code blocks and link targets removed."""
+
+    FENCE = re.compile(r"^\s*(```|~~~)")
+    RULES = (
+        (re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S.*$"), ""),          # reference definitions
+        (re.compile(r"^\s{0,3}([-*_]\s*){3,}$"), ""),             # horizontal rules
+        (re.compile(r"^\s{0,3}#{1,6}\s+"), ""),                   # headings
+        (re.compile(r"^\s{0,3}(>\s?)+"), ""),                     # blockquotes
+        (re.compile(r"^\s*([-*+]|\d+[.)])\s+(\[[ xX]\]\s+)?"), ""),  # list markers and task boxes
+        (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),           # images keep their alt text
+        (re.compile(r"\[([^\]]+)\](\([^)]*\)|\[[^\]]*\])"), r"\1"),  # links keep their text
+        (re.compile(r"<[^>]+>"), " "),                            # inline HTML
+        (re.compile(r"(\*\*|__|\*|_|~~|`+)(?=\S)(.+?)(?<=\S)\1"), r"\2"),  # emphasis and code spans
+        (re.compile(r"\s*\|\s*"), " "),                           # table pipes
+    )
+
+    def __init__(self):
+        self._partial = ""
+        self._in_fence = False
+
+    def feed(self, text: str) -> str:
+        *lines, self._partial = (self._partial + text).split("\n")
+        return self._convert(lines)
+
+    def close(self) -> str:
+        lines, self._partial = [self._partial], ""
+        return self._convert(lines)
+
+    def _convert(self, lines: List[str]) -> str:
+        out = []
+        for line in lines:
+            if self.FENCE.match(line):
+                self._in_fence = not self._in_fence
+                continue
+            if self._in_fence:
+                continue
+            for pattern, replacement in self.RULES:
+                line = pattern.sub(replacement, line)
+            out.append(line)
+        return " ".join(out) + (" " if out else "")
+
+
+class PlainTextExtractor:
+    def feed(self, text: str) -> str:
+        return text
+
+    def close(self) -> str:
+        return ""
+
+
+class TextNormalizer:
+    """Incremental NFKC normalization and whitespace collapsing.
+
+    The text after the last whitespace of each piece is held back until
+    more input arrives, so a character sequence split across pieces is
+    normalized as a whole and runs of whitespace collapse to one space
+    across piece boundaries.
+    """
+
+    WHITESPACE = re.compile(r"\s+")
+    CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+    def __init__(self):
+        self._held = ""
+        self._started = False
+        self._space = False
+
+    def feed(self, text: str) -> str:
+        text = self._held + text
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"))
+        if cut == -1 and len(text) <= MAX_HELD_CHARS:
+            self._held = text
+            return ""
+        if cut == -1:
+            cut = len(text)
+        self._held = text[cut:]
+        return self._normalize(text[:cut])
+
+    def close(self) -> str:
+        text, self._held = self._held, ""
+        return self._normalize(text).rstrip()
+
+    def _normalize(self, text: str) -> str:
+        text = self.CONTROL.sub("", unicodedata.normalize("NFKC", text))
+        out = []
+        for index, word in enumerate(self.WHITESPACE.split(text)):
+            if index:
+                self._space = True
+            if word:
+                if self._space and self._started:
+                    out.append(" ")
+                out.append(word)
+                self._started = True
+                self._space = False
+        return "".join(out)
+
+
+class TextChunker:
+    """Cuts normalized text into chunks of at most ``max_chars``, at word boundaries."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        chunks = []
+        while len(self._buffer) > self.max_chars:
+            cut = self._buffer.rfind(" ", 0, self.max_chars + 1)
+            if cut <= 0:
+                cut = self.max_chars
+            chunks.append(self._buffer[:cut].strip())
+            self._buffer = self._buffer[cut:].lstrip()
+        return chunks
+
+    def close(self) -> List[str]:
+        chunk, self._buffer = self._buffer.strip(), ""
+        return [chunk] if chunk else []
+
+
+class DocumentPipeline:
+    """Upload bytes in, normalized text chunks out, in bounded memory.
+
+    Markup formats are decoded, stripped and chunked as the bytes arrive.
+    PDFs need random access, so they are spooled to a temporary file (in
+    memory up to ``spool_memory`` bytes) and extracted a page at a time
+    when the upload ends.
+    """
+
+    def __init__(self, document_format: str, chunk_chars: int, max_bytes: int, spool_memory: int = 1 << 20):
+        self.format = document_format
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.characters = 0
+        self._normalizer = TextNormalizer()
+        self._chunker = TextChunker(chunk_chars)
+        self._spool = None
+        if document_format == "pdf":
+            self._spool = tempfile.SpooledTemporaryFile(max_size=spool_memory)
+        else:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            self._extractor = {
+                "html": HTMLTextExtractor,
+                "markdown": MarkdownTextExtractor,
+                "text": PlainTextExtractor,
+            }[document_format]()
+
+    def feed(self, data: bytes) -> List[str]:
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:
+            raise DocumentError(413, f"Document is larger than {self.max_bytes} bytes")
+        if self._spool is not None:
+            self._spool.write(data)
+            return []
+        return self._chunks(self._extractor.feed(self._decoder.decode(data)))
+
+    def close(self) -> Iterator[str]:
+        """Remaining chunks; for PDFs this is where pages are extracted."""
+        if self._spool is not None:
+            yield from self._pdf_chunks()
+        else:
+            yield from self._chunks(self._extractor.feed(self._decoder.decode(b"", final=True)) + self._extractor.close())
+        tail = self._normalizer.close()
+        self.characters += len(tail)
+        yield from self._chunker.feed(tail)
+        yield from self._chunker.close()
+
+    def _chunks(self, text: str) -> List[str]:
+        normalized = self._normalizer.feed(text)
+        self.characters += len(normalized)
+        return self._chunker.feed(normalized)
+
+    def _pdf_chunks(self) -> Iterator[str]:
+        try:
+            from pypdf import PdfReader
+            from pypdf.errors import PdfReadError
+        except ImportError:
+            raise DocumentError(415, "PDF ingestion needs the pypdf package")
+        try:
+            self._spool.seek(0)
+            reader = PdfReader(self._spool)
+            for page in reader.pages:
+                # Pages end mid-sentence often enough that a space is the safe separator
+                yield from self._chunks((page.extract_text() or "") + "\n")
+        except PdfReadError as e:
+            raise DocumentError(400, f"Unreadable PDF: {str(e)}")
+        finally:
+            self._spool.close()
+
+
+class DocumentScore:
+    """Running word-weighted reduction of chunk scores.
+
+    Holds only sums and flags, so its size does not depend on the number
+    of chunks.
+    """
+
+    NUMERIC = ("impact", "feasibility", "clarity", "budget", "confidence")
+
+    def __init__(self):
+        self.chunks = 0
+        self.words = 0
+        self.lead = ""
+        self._sums = dict.fromkeys(self.NUMERIC, 0.0)
+        self._sentiment = 0.0
+        self._languages: Dict[str, int] = {}
+        self.risk_flags = 0
+        self.strength_flags = 0
+
+    def add(self, chunk: str, values: Dict[str, Any]) -> None:
+        if not self.chunks:
+            self.lead = chunk[:LEAD_CHARS]
+        weight = max(len(chunk.split()), 1)
+        self.chunks += 1
+        self.words += weight
+        for name in self.NUMERIC:
+            self._sums[name] += values[name] * weight
+        self._sentiment += SENTIMENT_VALUES[values["sentiment"]] * weight
+        self._languages[values["language"]] = self._languages.get(values["language"], 0) + weight
+        self.risk_flags |= values["risk_flags"]
+        self.strength_flags |= values["strength_flags"]
+
+    def record(self, analyzer, title: str, amount: float, processing_time: float) -> AnalysisRecord:
+        if not self.chunks:
+            raise DocumentError(422, "No text could be extracted from the document")
+        means = {name: total / self.words for name, total in self._sums.items()}
+        # Same cut-offs as a single proposal's polarity; here over the word-weighted mean
+        polarity = self._sentiment / self.words
+        sentiment = (
+            SentimentType.POSITIVE if polarity > 1 / 3
+            else SentimentType.NEGATIVE if polarity < -1 / 3
+            else SentimentType.NEUTRAL
+        )
+        return analyzer.combine_chunks(
+            title, self.lead, amount, self.words + len(title.split()), means["impact"], means["feasibility"],
+            means["clarity"], means["budget"], sentiment, means["confidence"], self.risk_flags,
+            self.strength_flags, max(self._languages, key=self._languages.get), processing_time
+        )
+
+
+class DocumentIngestor:
+    """Map-reduce scoring of document chunks on a bounded worker pool.
+
+    Chunks are scored on ``workers`` threads as they arrive; at most
+    ``max_in_flight`` chunks are pending at once, which also paces the
+    upload, and results are folded into a ``DocumentScore`` in order.
+    """
+
+    def __init__(self, analyzer, workers: int = 2, max_in_flight: int = 8):
+        self.analyzer = analyzer
+        self.workers = max(workers, 1)
+        self.max_in_flight = max(max_in_flight, 1)
+        # Started on first use, so the ingestor can be stopped with the app and used again after a restart
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    async def analyze(self, chunks: AsyncIterator[str], title: str, amount: float,
+                      category: Optional[ProposalCategory] = None,
+                      language: Optional[str] = None) -> Tuple[AnalysisRecord, DocumentScore]:
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ingest")
+        executor = self.executor
+        score = DocumentScore()
+        pending: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        async def reduce_oldest():
+            chunk, future = pending.popleft()
+            score.add(chunk, await future)
+
+        try:
+            async for chunk in chunks:
+                # Chunks are already validated text; skip the request model's length checks
+                request = AnalysisRequest.model_construct(
+                    title=title, description=chunk, amount=amount, category=category,
+                    language=language, deadline_ms=None
+                )
+                pending.append((chunk, loop.run_in_executor(executor, self.analyzer.analyze_chunk, request)))
+                if len(pending) >= self.max_in_flight:
+                    await reduce_oldest()
+            while pending:
+                await reduce_oldest()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+        return score.record(self.analyzer, title, amount, time.time() - start_time), score
+
+    def stop(self) -> None:
+        """Shut the chunk workers down."""
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
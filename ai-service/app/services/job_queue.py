@@ -0,0 +1,408 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.models.schemas import (
+    AnalysisRequest,
+    AnalysisResponse,
+    JobStatus,
+    JobStatusResponse
+)
+
+logger = get_logger(__name__)
+
+ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of active jobs."""
+
+
+class JobNotFoundError(Exception):
+    """Raised when a job ID is unknown or has been evicted."""
+
+
+class Job:
+    """A batch of proposals tracked through the queue."""
+
+    def __init__(self, job_id: str, proposals: List[AnalysisRequest], priority: int, seq: int,
+                 submitted_at: Optional[float] = None):
+        self.job_id = job_id
+        self.priority = priority
+        self.seq = seq
+        self.proposals: Optional[List[AnalysisRequest]] = proposals
+        self.total = len(proposals)
+        self.results: List[Optional[AnalysisResponse]] = [None] * self.total
+        self.next_index = 0
+        self.completed = 0
+        self.failed = 0
+        self.status = JobStatus.QUEUED
+        self.error: Optional[str] = None
+        self.submitted_at = submitted_at if submitted_at is not None else time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+    @property
+    def sort_key(self) -> Tuple[int, int, str]:
+        return (self.priority, self.seq, self.job_id)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    def to_status(self, include_results: bool = True) -> JobStatusResponse:
+        """Build the public status payload for this job."""
+        queue_time = None
+        if self.started_at is not None:
+            queue_time = round(self.started_at - self.submitted_at, 3)
+        run_time = None
+        if self.started_at is not None and self.finished_at is not None:
+            run_time = round(self.finished_at - self.started_at, 3)
+
+        return JobStatusResponse(
+            job_id=self.job_id,
+            status=self.status,
+            priority=self.priority,
+            total=self.total,
+            completed=self.completed,
+            failed=self.failed,
+            progress=round((self.completed + self.failed) / self.total, 4) if self.total else 1.0,
+            submitted_at=self.submitted_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            queue_time=queue_time,
+            run_time=run_time,
+            results=list(self.results) if include_results and not self.is_active else None,
+            error=self.error
+        )
+
+
+class JobStore:
+    """Optional SQLite persistence so queued and finished jobs survive restarts.
+
+    The store is built at import, which with preloading happens in the
+    server master, so the connection is opened per process on first use:
+    a forked worker never uses the one it inherited. Workers share the
+    file in WAL mode, as the search index does.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Process owning the connection; None until first use
+        self._pid: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._connect().close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    completed INTEGER NOT NULL,
+                    failed INTEGER NOT NULL,
+                    error TEXT,
+                    proposals TEXT,
+                    results TEXT
+                )
+                """
+            )
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's connection, opened on first use; call with the lock held."""
+        if self._pid != os.getpid():
+            # A connection set here before a fork belongs to the parent and is left alone
+            self._conn = self._connect()
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def snapshot(job: Job) -> Tuple[Any, ...]:
+        """Serialize a job into a row; call this on the event loop thread."""
+        proposals = None
+        if job.proposals is not None:
+            proposals = json.dumps([p.model_dump(mode="json") for p in job.proposals])
+        results = None
+        if not job.is_active:
+            results = json.dumps([r.model_dump(mode="json") if r is not None else None for r in job.results])
+        return (
+            job.job_id, job.status.value, job.priority, job.seq, job.submitted_at,
+            job.started_at, job.finished_at, job.completed, job.failed, job.error,
+            proposals, results
+        )
+
+    def write(self, row: Tuple[Any, ...]) -> None:
+        with self._lock, self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+    def delete(self, job_ids: List[str]) -> None:
+        with self._lock, self._connection() as conn:
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+
+    def load_all(self) -> List[Job]:
+        """Load every stored job; unfinished jobs restart from their first item."""
+        with self._lock:
+            rows = self._connection().execute("SELECT * FROM jobs ORDER BY seq").fetchall()
+
+        jobs = []
+        for (job_id, status, priority, seq, submitted_at, started_at, finished_at,
+             completed, failed, error, proposals, results) in rows:
+            status = JobStatus(status)
+            requests = [AnalysisRequest(**p) for p in json.loads(proposals)] if proposals else []
+            job = Job(job_id, requests, priority, seq, submitted_at=submitted_at)
+            if status in ACTIVE_STATUSES:
+                jobs.append(job)
+                continue
+
+            stored = json.loads(results) if results else []
+            job.proposals = None
+            job.total = len(stored)
+            job.results = [AnalysisResponse(**r) if r is not None else None for r in stored]
+            job.status = status
+            job.started_at = started_at
+            job.finished_at = finished_at
+            job.completed = completed
+            job.failed = failed
+            job.error = error
+            job.done.set()
+            jobs.append(job)
+        return jobs
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._pid == os.getpid():
+                self._conn.close()
+                self._pid = None
+
+
+class JobQueue:
+    """In-process priority queue that runs analysis jobs in the background.
+
+    Workers process a job ``slice_size`` items at a time and then return it
+    to the heap, so an urgent job submitted behind a large backfill starts
+    after at most one slice instead of waiting for the whole backfill.
+
+    ``analyze`` is either a coroutine function, awaited as is, or a plain
+    function, run in the loop's default executor.
+    """
+
+    def __init__(self, analyze: Callable[[AnalysisRequest], Any], workers: int = 2,
+                 max_pending: int = 1000, max_retained: int = 500, slice_size: int = 5,
+                 store: Optional[JobStore] = None):
+        self._analyze = analyze
+        self._analyze_is_async = asyncio.iscoroutinefunction(analyze)
+        self.worker_count = workers
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self.slice_size = max(1, slice_size)
+        self._store = store
+        # Store calls in flight; stop() lets them finish
+        self._store_calls: set = set()
+        self._jobs: Dict[str, Job] = {}
+        self._finished: deque = deque()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._available: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self._seq = itertools.count()
+        self._active = 0
+
+    async def start(self) -> None:
+        """Restore persisted jobs and start the worker tasks."""
+        if self._workers:
+            return
+        self._available = asyncio.Condition()
+
+        if self._store is not None:
+            jobs = await self._in_store(self._store.load_all)
+            jobs = [job for job in jobs if job.job_id not in self._jobs]
+            for job in jobs:
+                self._jobs[job.job_id] = job
+                if job.is_active:
+                    self._active += 1
+                    heapq.heappush(self._heap, job.sort_key)
+                else:
+                    self._finished.append(job.job_id)
+            if jobs:
+                self._seq = itertools.count(max(job.seq for job in jobs) + 1)
+                logger.info(f"Restored {len(jobs)} jobs from {self._store.path}")
+            await self._evict_finished()
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        """Cancel worker tasks; unfinished jobs stay in the store for the next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # A worker cancelled mid-write would otherwise leave the job's last state unwritten
+        await asyncio.gather(*self._store_calls, return_exceptions=True)
+
+    async def submit(self, proposals: List[AnalysisRequest], priority: int = 5) -> Job:
+        """Enqueue a batch and return its job record."""
+        if self._active >= self.max_pending:
+            raise QueueFullError(f"Job queue is full ({self.max_pending} active jobs)")
+
+        job = Job(uuid.uuid4().hex, list(proposals), priority, next(self._seq))
+        self._jobs[job.job_id] = job
+        self._active += 1
+        await self._persist(job)
+        await self._push(job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    def queue_position(self, job: Job) -> int:
+        """Number of queued entries that will be served before this job."""
+        key = job.sort_key
+        return sum(1 for entry in self._heap if entry < key)
+
+    async def wait(self, job_id: str, timeout: float) -> Job:
+        """Long-poll until the job finishes or ``timeout`` seconds pass."""
+        job = self.get(job_id)
+        if job.is_active and timeout > 0:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def cancel(self, job_id: str) -> Job:
+        """Cancel a job; items already analyzed are kept."""
+        job = self.get(job_id)
+        if job.is_active:
+            job.status = JobStatus.CANCELLED
+            await self._finish(job)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": len(self._workers),
+            "queued_entries": len(self._heap),
+            "active_jobs": self._active,
+            "retained_jobs": len(self._jobs),
+            "max_pending": self.max_pending,
+            "max_retained": self.max_retained,
+            "by_status": counts,
+            "persistent": self._store is not None
+        }
+
+    def memory_roots(self) -> Tuple[Any, ...]:
+        """Containers holding retained jobs, for memory accounting."""
+        return self._jobs, self._finished, self._heap
+
+    async def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, job.sort_key)
+        if self._available is None:
+            # Not started yet; workers drain the heap once start() runs
+            return
+        async with self._available:
+            self._available.notify()
+
+    async def _next_job(self) -> Optional[Job]:
+        async with self._available:
+            while not self._heap:
+                await self._available.wait()
+            _, _, job_id = heapq.heappop(self._heap)
+        return self._jobs.get(job_id)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._next_job()
+            if job is None or not job.is_active:
+                continue
+
+            if job.started_at is None:
+                job.started_at = time.time()
+                job.status = JobStatus.RUNNING
+
+            end = min(job.next_index + self.slice_size, job.total)
+            while job.next_index < end and job.is_active:
+                index = job.next_index
+                try:
+                    if self._analyze_is_async:
+                        job.results[index] = await self._analyze(job.proposals[index])
+                    else:
+                        job.results[index] = await loop.run_in_executor(None, self._analyze, job.proposals[index])
+                    job.completed += 1
+                except Exception as e:
+                    logger.error(f"Job {job.job_id} item {index + 1} failed: {str(e)}")
+                    job.failed += 1
+                    job.error = str(e)
+                job.next_index = index + 1
+
+            if not job.is_active:
+                continue
+            if job.next_index < job.total:
+                await self._push(job)
+            else:
+                job.status = JobStatus.FAILED if job.completed == 0 and job.failed else JobStatus.COMPLETED
+                await self._finish(job)
+
+    async def _finish(self, job: Job) -> None:
+        job.finished_at = time.time()
+        job.proposals = None
+        self._active -= 1
+        self._finished.append(job.job_id)
+        job.done.set()
+        logger.info("Job %s %s: %d/%d items", job.job_id, job.status.value, job.completed, job.total, hot=True)
+        await self._persist(job)
+        await self._evict_finished()
+
+    async def _evict_finished(self) -> None:
+        evicted = []
+        while len(self._finished) > self.max_retained:
+            job_id = self._finished.popleft()
+            self._jobs.pop(job_id, None)
+            evicted.append(job_id)
+        if self._store is None or not evicted:
+            return
+        try:
+            await self._in_store(self._store.delete, evicted)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to delete {len(evicted)} evicted jobs: {str(e)}")
+
+    async def _in_store(self, method: Callable[..., Any], *args) -> Any:
+        """Run a store call off the event loop; cancelling the caller does not cancel the call."""
+        call = asyncio.ensure_future(asyncio.to_thread(method, *args))
+        self._store_calls.add(call)
+        call.add_done_callback(self._store_calls.discard)
+        return await asyncio.shield(call)
+
+    async def _persist(self, job: Job) -> None:
+        if self._store is None:
+            return
+        row = JobStore.snapshot(job)
+        try:
+            await self._in_store(self._store.write, row)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to persist job {job.job_id}: {str(e)}")
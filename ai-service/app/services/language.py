@@ -0,0 +1,73 @@
+import re
+from typing import Iterable, Optional, Tuple
+
+WORD_RE = re.compile(r"\w+")
+
+# Invisible format characters (soft hyphen, zero-width and bidi marks). Dropped before
+# tokenizing, or "com\u00admunity" would split into "com" and "munity" and count as Portuguese
+FORMAT_RE = re.compile("[\u00ad\u200b-\u200f\u202a-\u202e\u2060-\u2064\ufeff]")
+
+# Only the first tokens are needed to tell languages apart
+MAX_DETECTION_TOKENS = 400
+
+# Small function-word profiles; kept here so detection never loads a lexicon pack
+STOPWORDS = {
+    "en": frozenset((
+        "the", "and", "of", "to", "in", "is", "that", "for", "with", "on", "are", "this",
+        "will", "be", "as", "by", "from", "it", "we", "our", "which", "an", "their", "have",
+        "a", "at", "or", "not", "no", "do", "can", "has"
+    )),
+    "es": frozenset((
+        "el", "la", "los", "las", "de", "que", "y", "en", "un", "una", "por", "con", "para",
+        "es", "del", "se", "al", "su", "sus", "como", "más", "este", "esta", "nuestro"
+    )),
+    "fr": frozenset((
+        "le", "la", "les", "des", "de", "du", "et", "en", "un", "une", "est", "que", "pour",
+        "dans", "sur", "avec", "par", "ce", "cette", "nous", "notre", "qui", "au", "aux"
+    )),
+    "de": frozenset((
+        "der", "die", "das", "und", "ist", "nicht", "ein", "eine", "zu", "den", "von", "mit",
+        "für", "auf", "dem", "des", "sich", "wir", "unser", "im", "werden", "auch", "wird", "zur"
+    )),
+    "pt": frozenset((
+        "o", "a", "os", "as", "de", "que", "e", "em", "um", "uma", "para", "com", "por", "é",
+        "do", "da", "dos", "das", "no", "na", "nosso", "nossa", "ao", "se"
+    )),
+}
+
+
+# Function word -> the one language it belongs to, so each token is looked up once.
+# Words in several profiles ("a", "de", "que", "se") are left out: they say nothing
+# about which of those languages a text is in, and English "a" read as Portuguese
+# turned article-heavy English proposals into Portuguese ones
+_PROFILES_BY_WORD = {}
+for _code, _words in STOPWORDS.items():
+    for _word in _words:
+        _PROFILES_BY_WORD.setdefault(_word, []).append(_code)
+LANGUAGE_BY_WORD = {word: codes[0] for word, codes in _PROFILES_BY_WORD.items() if len(codes) == 1}
+
+
+def detect_language(text: str, candidates: Optional[Iterable[str]] = None,
+                    min_hits: int = 3, min_lead: float = 0.25) -> Tuple[Optional[str], float]:
+    """Guess the language of ``text`` from function-word frequencies.
+
+    Returns the best language code and the share of function-word hits it
+    accounts for (0-1), or ``(None, 0.0)`` when fewer than ``min_hits``
+    function words matched or the best language leads the runner-up by
+    less than ``min_lead`` of all hits (a tie included).
+    """
+    languages = [code for code in (candidates or STOPWORDS) if code in STOPWORDS]
+    counts = dict.fromkeys(languages, 0)
+    for token in WORD_RE.findall(FORMAT_RE.sub("", text).lower())[:MAX_DETECTION_TOKENS]:
+        code = LANGUAGE_BY_WORD.get(token)
+        if code in counts:
+            counts[code] += 1
+
+    ranked = sorted(counts.values(), reverse=True)
+    if not ranked or ranked[0] < min_hits:
+        return None, 0.0
+    total = sum(ranked)
+    runner_up = ranked[1] if len(ranked) > 1 else 0
+    if (ranked[0] - runner_up) / total < min_lead:
+        return None, 0.0
+    return max(languages, key=counts.__getitem__), ranked[0] / total
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import math
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+WORD = re.compile(r"[^\W_]+")
+
+# Artifact layout: magic, little-endian u32 header length, JSON header, padding, float32 weights
+MAGIC = b"VLNLIN1\x00"
+ALIGNMENT = 64
+
+# Amount bands turned into pseudo-tokens, so the model can learn how size relates to outcome
+AMOUNT_BANDS = (0.01, 0.1, 1.0, 10.0, 100.0)
+
+
+class HashedNgrams:
+    """Hashed bag of word n-grams.
+
+    Each n-gram is hashed with CRC-32 into ``n_features`` buckets (a power
+    of two) and signed by one more hash bit, so collisions tend to cancel
+    rather than add up. Counts are log-scaled and the vector L2-normalized,
+    which keeps long and short proposals on the same scale. The category
+    and the amount band are added as two extra tokens.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, max_n: int = 2):
+        if n_features & (n_features - 1):
+            raise ValueError(f"n_features must be a power of two, got {n_features}")
+        self.n_features = n_features
+        self.max_n = max_n
+
+    def tokens(self, text: str, category: Optional[str] = None, amount: Optional[float] = None) -> List[str]:
+        words = WORD.findall(text.lower())
+        tokens = list(words)
+        for n in range(2, self.max_n + 1):
+            tokens.extend(map(" ".join, zip(*(words[i:] for i in range(n)))))
+        if category:
+            tokens.append(f"\x00category={category}")
+        if amount is not None:
+            tokens.append(f"\x00amount<={next((band for band in AMOUNT_BANDS if amount <= band), 'max')}")
+        return tokens
+
+    def transform(self, text: str, category: Optional[str] = None,
+                  amount: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse feature vector of one proposal as (indices, values)."""
+        tokens = self.tokens(text, category, amount)
+        # map() keeps the per-token work in C; this loop is most of the cost of a prediction
+        hashes = np.fromiter(map(zlib.crc32, map(str.encode, tokens)), dtype=np.uint32, count=len(tokens))
+        indices, inverse = np.unique(hashes & np.uint32(self.n_features - 1), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.where(hashes >> 31, 1.0, -1.0), minlength=len(indices))
+        indices = indices.astype(np.int64)
+        values = (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+        norm = float(np.sqrt(np.dot(values, values)))
+        if norm:
+            values /= norm
+        return indices, values
+
+    def transform_many(self, rows: Iterable[Tuple[str, Optional[str], Optional[float]]]) -> "SparseRows":
+        indptr, indices, values = [0], [], []
+        for text, category, amount in rows:
+            row_indices, row_values = self.transform(text, category, amount)
+            indices.append(row_indices)
+            values.append(row_values)
+            indptr.append(indptr[-1] + len(row_indices))
+        return SparseRows(
+            np.asarray(indptr, dtype=np.int64),
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+            np.concatenate(values) if values else np.empty(0, dtype=np.float32)
+        )
+
+
+class SparseRows:
+    """Rows of sparse feature vectors in CSR form, for training."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, values: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+        self.row_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def take(self, rows: np.ndarray) -> "SparseRows":
+        """The given rows, in the given order."""
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        # Position of every kept nonzero in the source arrays
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return SparseRows(indptr, self.indices[positions], self.values[positions])
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        return np.bincount(self.row_ids, weights=self.values * weights[self.indices], minlength=len(self))
+
+
+def _digest(weights: np.ndarray, bias: float) -> str:
+    return hashlib.sha256(np.ascontiguousarray(weights, dtype="<f4").tobytes() + repr(float(bias)).encode()).hexdigest()
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -35.0, 35.0)))
+
+
+def auc(labels: np.ndarray, scores: np.ndarray) -> Optional[float]:
+    """Area under the ROC curve (ties count half), or None with a single class."""
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return None
+    order = np.argsort(scores, kind="mergesort")
+    ranks = np.empty(len(scores))
+    sorted_scores = scores[order]
+    # Average rank within groups of equal scores
+    boundaries = np.flatnonzero(np.diff(sorted_scores)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(scores)]))
+    ranks[order] = np.repeat((starts + ends + 1) / 2.0, ends - starts)
+    return float((ranks[labels == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def evaluate(rows: SparseRows, labels: np.ndarray, weights: np.ndarray, bias: float) -> Dict[str, Any]:
+    probabilities = _sigmoid(rows.dot(weights) + bias)
+    clipped = np.clip(probabilities, 1e-7, 1 - 1e-7)
+    area = auc(labels, probabilities)
+    return {
+        "examples": len(labels),
+        "log_loss": round(float(-np.mean(labels * np.log(clipped) + (1 - labels) * np.log(1 - clipped))), 4),
+        "accuracy": round(float(np.mean((probabilities >= 0.5) == labels)), 4),
+        "auc": round(area, 4) if area is not None else None,
+    }
+
+
+def fit(rows: SparseRows, labels: np.ndarray, n_features: int, epochs: int = 5, learning_rate: float = 0.1,
+        l2: float = 1e-5, batch_size: int = 256, seed: int = 0) -> Tuple[np.ndarray, float]:
+    """L2-regularized logistic regression by mini-batch AdaGrad; returns (weights, bias)."""
+    rng = np.random.default_rng(seed)
+    weights = np.zeros(n_features, dtype=np.float64)
+    bias = 0.0
+    squared = np.zeros(n_features, dtype=np.float64)
+    bias_squared = 0.0
+    for _ in range(epochs):
+        shuffled_order = rng.permutation(len(rows))
+        for start in range(0, len(rows), batch_size):
+            batch_rows = shuffled_order[start:start + batch_size]
+            batch = rows.take(batch_rows)
+            errors = _sigmoid(batch.dot(weights) + bias) - labels[batch_rows]
+            touched = np.unique(batch.indices)
+            gradient = np.bincount(
+                batch.indices, weights=batch.values * errors[batch.row_ids], minlength=n_features
+            )[touched] / len(batch_rows) + l2 * weights[touched]
+            # Only features present in the batch are updated, as in sparse SGD
+            squared[touched] += gradient * gradient
+            weights[touched] -= learning_rate * gradient / (np.sqrt(squared[touched]) + 1e-8)
+            bias_gradient = float(errors.mean())
+            bias_squared += bias_gradient * bias_gradient
+            bias -= learning_rate * bias_gradient / (math.sqrt(bias_squared) + 1e-8)
+    return weights.astype(np.float32), bias
+
+
+class LinearTextModel:
+    """Logistic model over hashed n-grams that predicts whether a proposal passes.
+
+    Inference is one sparse dot product. Weights live in a flat float32
+    array, which ``load`` memory-maps: workers share the pages read from
+    the artifact and only the rows a proposal touches are read.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, features: HashedNgrams,
+                 metadata: Optional[Dict[str, Any]] = None):
+        if len(weights) != features.n_features:
+            raise ValueError(f"Expected {features.n_features} weights, got {len(weights)}")
+        self.weights = weights
+        self.bias = bias
+        self.features = features
+        self.metadata = dict(metadata or {})
+        if "sha256" not in self.metadata:
+            self.metadata["sha256"] = _digest(weights, bias)
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[int], categories: Optional[Sequence[Optional[str]]] = None,
+              amounts: Optional[Sequence[Optional[float]]] = None, n_features: int = 2 ** 18, max_n: int = 2,
+              holdout: float = 0.2, seed: int = 0, **fit_options) -> "LinearTextModel":
+        """Fit on historical proposals and their outcomes (1 passed, 0 did not).
+
+        A ``holdout`` fraction is kept out of training to measure the model;
+        the model is then refit on everything. The metrics are stored with it.
+        """
+        start_time = time.time()
+        features = HashedNgrams(n_features, max_n)
+        rows = features.transform_many(zip(
+            texts, categories or [None] * len(texts), amounts or [None] * len(texts)
+        ))
+        y = np.asarray(labels, dtype=np.float64)
+
+        metadata: Dict[str, Any] = {"examples": len(y), "positive_rate": round(float(y.mean()), 4) if len(y) else None}
+        order = np.random.default_rng(seed).permutation(len(y))
+        held = int(len(y) * holdout)
+        if held:
+            train_rows, test_rows = order[held:], order[:held]
+            weights, bias = fit(rows.take(train_rows), y[train_rows], n_features, seed=seed, **fit_options)
+            metadata["holdout"] = evaluate(rows.take(test_rows), y[test_rows], weights, bias)
+
+        weights, bias = fit(rows, y, n_features, seed=seed, **fit_options)
+        metadata["training"] = evaluate(rows, y, weights, bias)
+        metadata["trained_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        metadata["training_seconds"] = round(time.time() - start_time, 2)
+        return cls(weights, float(bias), features, metadata)
+
+    def predict(self, text: str, category: Optional[str] = None, amount: Optional[float] = None) -> float:
+        """Probability that the proposal passes."""
+        indices, values = self.features.transform(text, category, amount)
+        margin = float(np.dot(self.weights[indices], values)) + self.bias
+        return 1.0 / (1.0 + math.exp(-max(min(margin, 35.0), -35.0)))
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the trained weights, for the analyzer version."""
+        return self.metadata["sha256"][:16]
+
+    def save(self, path: str) -> None:
+        weights = np.ascontiguousarray(self.weights, dtype="<f4")
+        header = json.dumps({
+            "n_features": self.features.n_features,
+            "max_n": self.features.max_n,
+            "bias": self.bias,
+            "sha256": self.metadata["sha256"],
+            "metadata": {key: value for key, value in self.metadata.items() if key != "sha256"},
+        }).encode("utf-8")
+        offset = len(MAGIC) + 4 + len(header)
+        padding = b" " * (-offset % ALIGNMENT)
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header + padding).to_bytes(4, "little"))
+            f.write(header + padding)
+            f.write(weights.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "LinearTextModel":
+        """Open an artifact written by ``save``, memory-mapping its weights."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a linear text model")
+            length = int.from_bytes(f.read(4), "little")
+            header = json.loads(f.read(length))
+        weights = np.memmap(
+            path, dtype="<f4", mode="r", offset=len(MAGIC) + 4 + length, shape=(header["n_features"],)
+        )
+        metadata = {**header["metadata"], "sha256": header["sha256"]}
+        return cls(weights, header["bias"], HashedNgrams(header["n_features"], header["max_n"]), metadata)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "n_features": self.features.n_features,
+            "max_n": self.features.max_n,
+            "fingerprint": self.fingerprint,
+            **{key: value for key, value in self.metadata.items() if key != "sha256"},
+        }
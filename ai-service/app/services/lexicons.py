@@ -0,0 +1,173 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+LEXICON_DIR = Path(__file__).resolve().parent.parent / "lexicons"
+
+# Word-list fields every pack provides, in the order the scorers use them
+WORD_LIST_FIELDS = (
+    "impact_indicators",
+    "impact_scale_indicators",
+    "feasibility_indicators",
+    "feasibility_risk_indicators",
+    "structure_indicators",
+    "specificity_indicators",
+    "budget_keywords",
+    "budget_scale_indicators",
+    "confidence_structure_words",
+    "risk_experimental_words",
+    "risk_unproven_words",
+    "strength_community_words",
+    "strength_timeline_words",
+    "strength_measurable_words",
+    "positive_words",
+    "negative_words",
+)
+
+
+class LexiconPack:
+    """Keyword lists the rule scorers use for one language."""
+
+    __slots__ = ("code", "spacy_model", "impact_category_keywords", "positive_set", "negative_set") + WORD_LIST_FIELDS
+
+    def __init__(self, code: str, spacy_model: Optional[str],
+                 impact_category_keywords: Dict[str, Tuple[str, ...]], **word_lists: Tuple[str, ...]):
+        self.code = code
+        self.spacy_model = spacy_model
+        self.impact_category_keywords = impact_category_keywords
+        for field in WORD_LIST_FIELDS:
+            setattr(self, field, tuple(word_lists.get(field, ())))
+        self.positive_set = frozenset(self.positive_words)
+        self.negative_set = frozenset(self.negative_words)
+
+    @classmethod
+    def from_dict(cls, code: str, data: Dict[str, Any]) -> "LexiconPack":
+        categories = {
+            category: tuple(words)
+            for category, words in data.get("impact_category_keywords", {}).items()
+        }
+        word_lists = {field: tuple(data.get(field, ())) for field in WORD_LIST_FIELDS}
+        return cls(code, data.get("spacy_model"), categories, **word_lists)
+
+
+class _BoundedLoader:
+    """LRU of loaded objects where each key is loaded at most once while cached."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, key: str, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+            # Loading under the lock keeps concurrent first requests from loading twice
+            value = load()
+            self.loads += 1
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+            return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": list(self._items),
+                "maxsize": self.maxsize,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+
+class LexiconRegistry:
+    """Resolves language codes to lexicon packs.
+
+    Built-in packs (English) are always resident. Packs stored as JSON in
+    ``app/lexicons`` are read on first use and kept in a bounded LRU, so a
+    worker only holds the languages its traffic actually needs.
+    """
+
+    def __init__(self, builtin: Dict[str, LexiconPack], maxsize: int = 4, directory: Path = LEXICON_DIR):
+        self._builtin = dict(builtin)
+        self.directory = directory
+        self._packs = _BoundedLoader(maxsize)
+        stored = sorted(path.stem for path in directory.glob("*.json")) if directory.is_dir() else []
+        self.languages: Tuple[str, ...] = tuple(sorted(set(self._builtin) | set(stored)))
+
+    def supports(self, code: Optional[str]) -> bool:
+        return code in self.languages
+
+    def get(self, code: str) -> LexiconPack:
+        """Return the pack for ``code``; raises KeyError for unknown languages."""
+        pack = self._builtin.get(code)
+        if pack is not None:
+            return pack
+        if code not in self.languages:
+            raise KeyError(code)
+        return self._packs.get(code, lambda: self._load(code))
+
+    def _load(self, code: str) -> LexiconPack:
+        path = self.directory / f"{code}.json"
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        logger.info(f"Loaded lexicon pack '{code}' from {path.name}")
+        return LexiconPack.from_dict(code, data)
+
+    def fingerprint(self) -> str:
+        """Digest of every pack's contents; stored packs are hashed from disk, not loaded."""
+        digest = hashlib.blake2b(digest_size=8)
+        for code, pack in sorted(self._builtin.items()):
+            digest.update(code.encode("utf-8"))
+            digest.update(repr(sorted(pack.impact_category_keywords.items())).encode("utf-8"))
+            for field in WORD_LIST_FIELDS:
+                digest.update("\x00".join(getattr(pack, field)).encode("utf-8"))
+        for code in self.languages:
+            if code not in self._builtin:
+                digest.update((self.directory / f"{code}.json").read_bytes())
+        return digest.hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._packs.stats()
+        stats["builtin"] = sorted(self._builtin)
+        stats["available"] = list(self.languages)
+        return stats
+
+
+class ModelCache:
+    """Bounded cache of spaCy pipelines, loaded lazily by model name.
+
+    A model that fails to load is cached as ``None`` so it is not retried
+    on every request.
+    """
+
+    def __init__(self, maxsize: int = 2):
+        self._models = _BoundedLoader(maxsize)
+
+    def get(self, model_name: Optional[str]):
+        if not model_name:
+            return None
+        return self._models.get(model_name, lambda: self._load(model_name))
+
+    @staticmethod
+    def _load(model_name: str):
+        try:
+            import spacy
+            return spacy.load(model_name)
+        except (ImportError, OSError):
+            logger.warning(f"spaCy model {model_name} not found, using basic tokenization")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return self._models.stats()
@@ -0,0 +1,266 @@
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.core.logging import get_logger
+from app.models.schemas import AnalysisRequest
+from app.services.language import detect_language
+from app.services.memo import LRUMemo
+
+logger = get_logger(__name__)
+
+# Text fields a client edits with character-range replacements
+TEXT_FIELDS = ("title", "description")
+
+# Fields a client may replace outright with a "set" message
+SETTABLE_FIELDS = TEXT_FIELDS + ("amount", "category", "language")
+
+# A text shorter than the settle length fixes its detected language only with at
+# least this many function words, nearly all of them from that language
+SETTLE_MIN_HITS = 8
+SETTLE_MIN_LEAD = 0.8
+
+
+class EditError(ValueError):
+    """A client message that cannot be applied; the session is left unchanged."""
+
+
+class SessionLimitError(Exception):
+    """The worker already holds its maximum number of live sessions."""
+
+
+class SessionBusyError(Exception):
+    """The session to resume is still attached to another connection."""
+
+
+class LiveSession:
+    """Proposal being edited in one live-scoring session.
+
+    Holds the current text, which client messages update in place, the
+    timing of unscored edits for debouncing, and what was last pushed, so a
+    revision whose scores did not change produces no message. Revisions
+    are scored against a small private memo rather than the analyzer's
+    shared one, which would otherwise be churned by every keystroke.
+    """
+
+    def __init__(self, session_id: str, memo_size: int):
+        self.id = session_id
+        self.fields: Dict[str, Any] = {"title": "", "description": "", "amount": None, "category": None, "language": None}
+        self.revision = 0
+        self.memo = LRUMemo(memo_size)
+        self.attached = False
+        self.active_at = time.monotonic()
+        self.edited_at: Optional[float] = None
+        self.pending_since: Optional[float] = None
+        # Detected again on every revision until it settles, then kept so it
+        # cannot flip while the author types (see LiveScoring.score)
+        self.detected_language: Optional[str] = None
+        self.scored_key: Optional[Tuple] = None
+        self.pushed: Optional[Dict[str, Any]] = None
+
+    def apply(self, message: Any, max_chars: int) -> None:
+        """Apply one client message; raises EditError when it is malformed."""
+        if not isinstance(message, dict):
+            raise EditError("Messages must be JSON objects")
+        kind = message.get("type")
+        if kind == "set":
+            changes = {name: value for name, value in message.items() if name != "type"}
+            unknown = [name for name in changes if name not in SETTABLE_FIELDS]
+            if unknown:
+                raise EditError(f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(SETTABLE_FIELDS)}")
+            for name in TEXT_FIELDS:
+                if name in changes and not isinstance(changes[name], str):
+                    raise EditError(f"{name} must be a string")
+        elif kind == "edit":
+            field = message.get("field")
+            if field not in TEXT_FIELDS:
+                raise EditError(f"Edits apply to {' or '.join(TEXT_FIELDS)}, got {field!r}")
+            current = self.fields[field]
+            start, end, text = message.get("start"), message.get("end", message.get("start")), message.get("text", "")
+            if not (isinstance(start, int) and isinstance(end, int) and 0 <= start <= end <= len(current)):
+                raise EditError(f"Edit range must satisfy 0 <= start <= end <= {len(current)}")
+            if not isinstance(text, str):
+                raise EditError("Edit text must be a string")
+            changes = {field: current[:start] + text + current[end:]}
+        else:
+            raise EditError(f"Unknown message type {kind!r}; expected 'set' or 'edit'")
+
+        updated = {**self.fields, **changes}
+        if sum(len(updated[name]) for name in TEXT_FIELDS) > max_chars:
+            raise EditError(f"Title and description together are limited to {max_chars} characters")
+        if "language" in changes:
+            self.detected_language = None
+        self.fields = updated
+        self.revision += 1
+        now = time.monotonic()
+        self.edited_at = now
+        if self.pending_since is None:
+            self.pending_since = now
+
+    def timeout(self, now: float, debounce: float, max_delay: float, idle_timeout: float) -> float:
+        """Seconds until unscored edits are due, or until the session goes idle."""
+        if self.pending_since is not None:
+            return max(0.0, min(self.edited_at + debounce, self.pending_since + max_delay) - now)
+        return max(0.0, self.active_at + idle_timeout - now)
+
+    def request(self) -> AnalysisRequest:
+        """The proposal as it stands; raises ValidationError while it is incomplete."""
+        fields = self.fields
+        if fields["language"] is None and self.detected_language is not None:
+            fields = {**fields, "language": self.detected_language}
+        return AnalysisRequest(**fields)
+
+
+class LiveScoring:
+    """Live-scoring sessions of one worker and the scoring of their revisions.
+
+    Sessions are bounded by ``max_sessions``. One that has been idle for
+    ``idle_timeout`` seconds (no messages, connected or not) expires; a
+    client that reconnects before then resumes it by id with its text
+    intact. All methods run on the event loop, so no locking is needed;
+    the analysis itself runs in a worker thread.
+
+    Without a requested language, each revision is detected afresh until
+    the text reaches ``language_chars`` characters or its function words
+    are clearly of one language; from then on the session keeps that
+    language. The first few words alone are too few to go by.
+    """
+
+    def __init__(self, analyzer, max_sessions: int = 100, idle_timeout: float = 300.0,
+                 debounce: float = 0.3, max_delay: float = 2.0, max_chars: int = 20000, memo_size: int = 64,
+                 language_chars: int = 200):
+        self.analyzer = analyzer
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_chars = max_chars
+        self.memo_size = memo_size
+        self.language_chars = language_chars
+        # Least recently active first
+        self.sessions: "OrderedDict[str, LiveSession]" = OrderedDict()
+        self.opened = 0
+        self.resumed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.scored = 0
+        self.pushed = 0
+        self.unchanged = 0
+
+    def attach(self, session_id: Optional[str] = None) -> Tuple[LiveSession, bool]:
+        """Resume ``session_id`` if it is still held, else open a new session; returns (session, resumed)."""
+        self.expire()
+        session = self.sessions.get(session_id) if session_id else None
+        if session is not None:
+            if session.attached:
+                raise SessionBusyError(f"Session {session_id} is attached to another connection")
+            self.resumed += 1
+        else:
+            if len(self.sessions) >= self.max_sessions:
+                self.rejected += 1
+                raise SessionLimitError(f"This worker already holds {self.max_sessions} live sessions")
+            session = LiveSession(secrets.token_urlsafe(12), self.memo_size)
+            self.sessions[session.id] = session
+            self.opened += 1
+        session.attached = True
+        self.touch(session)
+        return session, session_id == session.id
+
+    def detach(self, session: LiveSession) -> None:
+        """The connection closed; the session is kept until it expires."""
+        session.attached = False
+
+    def touch(self, session: LiveSession) -> None:
+        session.active_at = time.monotonic()
+        self.sessions.move_to_end(session.id)
+
+    def expire(self) -> None:
+        """Drop detached sessions idle for longer than ``idle_timeout``.
+
+        A connected session is closed by its own connection when it goes
+        idle, and is dropped here once detached.
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        for session in list(self.sessions.values()):
+            if session.active_at > cutoff:
+                break
+            if not session.attached:
+                del self.sessions[session.id]
+                self.expired += 1
+
+    def apply(self, session: LiveSession, message: Any) -> None:
+        self.touch(session)
+        session.apply(message, self.max_chars)
+
+    def timeout(self, session: LiveSession) -> float:
+        return session.timeout(time.monotonic(), self.debounce, self.max_delay, self.idle_timeout)
+
+    def due(self, session: LiveSession) -> bool:
+        """Whether the session has unscored edits whose debounce has run out."""
+        if session.pending_since is None:
+            return False
+        return session.timeout(time.monotonic(), self.debounce, self.max_delay, self.idle_timeout) == 0
+
+    def idle(self, session: LiveSession) -> bool:
+        """Whether the session has no unscored edits and has seen no message for ``idle_timeout``."""
+        return session.pending_since is None and time.monotonic() - session.active_at >= self.idle_timeout
+
+    async def score(self, session: LiveSession) -> Optional[Dict[str, Any]]:
+        """Score the current revision; returns the message to push, or None when nothing changed."""
+        session.pending_since = session.edited_at = None
+        revision = session.revision
+        try:
+            request = session.request()
+        except ValidationError as e:
+            message = {
+                "type": "incomplete",
+                "errors": [{"field": ".".join(map(str, error["loc"])) or None, "message": error["msg"]} for error in e.errors()]
+            }
+        else:
+            # The requested language, not the detected one carried over from the last revision
+            key = (request.title, request.description, request.amount, request.category, session.fields["language"])
+            if key == session.scored_key:
+                self.unchanged += 1
+                return None
+            record = await asyncio.to_thread(self.analyzer.analyze_record, request, None, None, session.memo)
+            self.scored += 1
+            session.scored_key = key
+            if request.language is None:
+                session.detected_language = self._settled_language(request, record.language)
+            message = {"type": "scores", **record.to_dict()}
+            del message["processing_time"]
+
+        if message == session.pushed:
+            self.unchanged += 1
+            return None
+        session.pushed = message
+        self.pushed += 1
+        logger.debug("Live session %s pushed %s for revision %d", session.id, message["type"], revision, hot=True)
+        return {**message, "revision": revision}
+
+    def _settled_language(self, request: AnalysisRequest, detected: str) -> Optional[str]:
+        """``detected`` if the text is long or clear enough to keep it, else None to detect again."""
+        text = f"{request.title}. {request.description}"
+        if len(text) >= self.language_chars:
+            return detected
+        clear, _ = detect_language(text, self.analyzer.lexicons.languages, SETTLE_MIN_HITS, SETTLE_MIN_LEAD)
+        return detected if clear == detected else None
+
+    def stats(self) -> Dict[str, Any]:
+        self.expire()
+        return {
+            "sessions": len(self.sessions),
+            "connected": sum(session.attached for session in self.sessions.values()),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "resumed": self.resumed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "scored": self.scored,
+            "pushed": self.pushed,
+            "unchanged": self.unchanged,
+        }
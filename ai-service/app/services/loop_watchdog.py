@@ -0,0 +1,147 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds of the lag histogram buckets, in milliseconds
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Innermost frames kept per captured stack
+MAX_STACK_FRAMES = 30
+
+
+class LagHistogram:
+    """Bucketed counts of event-loop lag samples."""
+
+    def __init__(self, buckets_ms=LAG_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.samples = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, lag_ms: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets_ms) if lag_ms <= bound), len(self.buckets_ms))
+        self.counts[index] += 1
+        self.samples += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "samples": self.samples,
+            "mean_ms": round(self.total_ms / self.samples, 3) if self.samples else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class LoopWatchdog:
+    """Measures event-loop scheduling lag and captures what blocks the loop.
+
+    A heartbeat task sleeps ``interval`` seconds and records how late it
+    wakes up. A monitor thread watches the heartbeat; when it is more than
+    ``threshold`` seconds overdue, the loop thread is stuck in synchronous
+    code, and its stack is captured with ``sys._current_frames()`` while the
+    blocking call is still running. The most recent offenders are kept in a
+    bounded list.
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1, max_offenders: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.histogram = LagHistogram()
+        self.offenders: deque = deque(maxlen=max_offenders)
+        self.stalls = 0
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start watching the running event loop; call from inside the loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._monitor = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - before - self.interval, 0.0)
+            with self._lock:
+                self._last_beat = now
+                self.histogram.record(lag * 1000)
+                stalled = lag >= self.threshold
+                if stalled:
+                    self.stalls += 1
+                    offender = self._pending or self._offender(None)
+                    offender["lag_ms"] = round(lag * 1000, 3)
+                    self.offenders.append(offender)
+                self._pending = None
+            if stalled:
+                logger.warning("Event loop blocked for %.1fms", lag * 1000)
+
+    def _watch(self) -> None:
+        # Check a few times per threshold so the stack is caught mid-stall
+        period = max(min(self.interval, self.threshold) / 2, 0.005)
+        while not self._stopped.wait(period):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if overdue < self.threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._pending = self._offender(frame)
+
+    @staticmethod
+    def _offender(frame) -> Dict[str, Any]:
+        stack: List[str] = []
+        if frame is not None:
+            stack = [
+                f"{entry.filename}:{entry.lineno} in {entry.name}"
+                for entry in traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+            ]
+        return {"at": time.time(), "lag_ms": None, "stack": stack}
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag histogram and the most recent blocking stacks, newest first."""
+        with self._lock:
+            return {
+                "running": self.running,
+                "interval_ms": self.interval * 1000,
+                "threshold_ms": self.threshold * 1000,
+                "stalls": self.stalls,
+                "lag": self.histogram.to_dict(),
+                "offenders": list(reversed(self.offenders))
+            }
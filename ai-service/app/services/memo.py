@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Returned by LRUMemo.lookup for a key it does not hold
+MISSING = object()
+
+
+class LRUMemo:
+    """Thread-safe bounded LRU memo with hit/miss counters.
+
+    Values are computed outside the lock, so two threads missing on the same
+    key at once may both compute it; the last one to finish wins.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._by_label: Dict[str, list] = {}
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], label: Optional[str] = None) -> Any:
+        """Return the memoized value for ``key``, computing it on a miss."""
+        if self.maxsize <= 0:
+            return compute()
+
+        with self._lock:
+            counters = self._by_label.setdefault(label, [0, 0]) if label is not None else None
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                if counters is not None:
+                    counters[1] += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+                if counters is not None:
+                    counters[0] += 1
+                return value
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def lookup(self, key: Hashable, label: Optional[str] = None) -> Any:
+        """Return the memoized value for ``key``, or MISSING.
+
+        A hit counts as one; a miss does not, since the caller computes the
+        value through ``get_or_compute`` next, which counts it.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            if label is not None:
+                self._by_label.setdefault(label, [0, 0])[0] += 1
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters, overall and per label."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "stages": {
+                    label: {"hits": hits, "misses": misses}
+                    for label, (hits, misses) in self._by_label.items()
+                }
+            }
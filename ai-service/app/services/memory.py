@@ -0,0 +1,274 @@
+import asyncio
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MB = 1024 * 1024
+
+# Shared interpreter objects and back-references (bound methods, event loops)
+# that would otherwise pull unrelated state into a component
+_SKIPPED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+    types.CodeType, types.FrameType, asyncio.AbstractEventLoop, threading.Thread
+)
+
+
+def rss_bytes() -> int:
+    return psutil.Process().memory_info().rss
+
+
+def deep_sizeof(root: Any, seen: Optional[set] = None, max_objects: int = 1_000_000) -> Dict[str, Any]:
+    """Approximate retained size of everything reachable from ``root``.
+
+    Walks ``gc.get_referents`` and sums ``sys.getsizeof`` of each object.
+    Objects already in ``seen`` are not counted again, so sizing several
+    components with one ``seen`` set charges shared objects to the first
+    component that reaches them. Classes, modules, functions, bound
+    methods, event loops and threads are not followed. The walk stops after ``max_objects`` objects and reports
+    itself as truncated.
+    """
+    seen = set() if seen is None else seen
+    pending = [root]
+    total = 0
+    objects = 0
+    while pending and objects < max_objects:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        objects += 1
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+        pending.extend(gc.get_referents(obj))
+    return {"bytes": total, "mb": round(total / MB, 2), "objects": objects, "truncated": bool(pending)}
+
+
+class MemoryReport:
+    """Attributes retained memory to named application components.
+
+    Components are registered as callables returning the root object(s) to
+    size, so lazily loaded parts (spaCy models, lexicon packs) are measured
+    as they are at report time. Sizing walks the object graph and takes
+    roughly a second per few million objects; it is meant for on-demand
+    admin use, not for every request.
+    """
+
+    def __init__(self, max_objects: int = 2_000_000):
+        self.max_objects = max_objects
+        self._components: "OrderedDict[str, Callable[[], Any]]" = OrderedDict()
+
+    def register(self, name: str, roots: Callable[[], Any]) -> None:
+        self._components[name] = roots
+
+    def report(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        rss = rss_bytes()
+        seen: set = set()
+        # Roots stay referenced until the end so their ids in ``seen`` are not reused
+        held = []
+        components = {}
+        for name, roots in self._components.items():
+            try:
+                held.append(roots())
+                components[name] = deep_sizeof(held[-1], seen, self.max_objects)
+            except Exception as e:
+                components[name] = {"error": str(e)}
+        attributed = sum(component.get("bytes", 0) for component in components.values())
+        return {
+            "rss_mb": round(rss / MB, 2),
+            "attributed_mb": round(attributed / MB, 2),
+            "components": components,
+            "gc": {"counts": gc.get_count(), "objects": len(gc.get_objects())},
+            "report_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+
+class TracemallocTracker:
+    """Named tracemalloc snapshots and the allocation diff between two of them.
+
+    At most ``max_snapshots`` snapshots are kept; taking another drops the
+    oldest. Tracing slows allocation-heavy code noticeably, so it is only
+    on between ``start()`` and ``stop()``.
+    """
+
+    def __init__(self, frames: int = 10, max_snapshots: int = 4):
+        self.frames = frames
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            logger.info(f"tracemalloc started with {self.frames} frames per trace")
+
+    def stop(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+        tracemalloc.stop()
+
+    def take(self, name: str) -> Dict[str, Any]:
+        """Store a snapshot under ``name``; raises RuntimeError when not tracing."""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return {"name": name, "traced_mb": round(sum(stat.size for stat in snapshot.statistics("filename")) / MB, 2)}
+
+    def diff(self, base: str, target: Optional[str] = None, key_type: str = "lineno", limit: int = 25) -> Dict[str, Any]:
+        """Top allocation changes from snapshot ``base`` to ``target`` (default: now).
+
+        Raises KeyError for an unknown snapshot name.
+        """
+        with self._lock:
+            before = self._snapshots[base]
+            after = self._snapshots[target] if target is not None else None
+        if after is None:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not tracing")
+            after = self._filtered(tracemalloc.take_snapshot())
+        stats = after.compare_to(before, key_type)
+        return {
+            "base": base,
+            "target": target or "now",
+            "size_diff_mb": round(sum(stat.size_diff for stat in stats) / MB, 3),
+            "top": [
+                {
+                    "location": str(stat.traceback[0]) if stat.traceback else "?",
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                    "size_kb": round(stat.size / 1024, 1)
+                }
+                for stat in stats[:limit]
+            ]
+        }
+
+    def top_growth(self, base: str, limit: int = 5) -> List[str]:
+        try:
+            return [f"{entry['location']} +{entry['size_diff_kb']}KiB" for entry in self.diff(base, limit=limit)["top"]]
+        except (KeyError, RuntimeError):
+            return []
+
+    @staticmethod
+    def _filtered(snapshot: "tracemalloc.Snapshot") -> "tracemalloc.Snapshot":
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def stats(self) -> Dict[str, Any]:
+        traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        with self._lock:
+            names = list(self._snapshots)
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "frames": self.frames,
+            "traced_mb": round(traced / MB, 2),
+            "peak_mb": round(peak / MB, 2),
+            "snapshots": names,
+            "max_snapshots": self.max_snapshots
+        }
+
+
+class MemoryGrowthMonitor:
+    """Periodic RSS check that warns when the worker grows past a threshold.
+
+    The baseline is the RSS at start. Each time RSS exceeds the baseline by
+    ``threshold_mb`` a warning is logged and the baseline moves up to the
+    current RSS, so steady growth warns once per threshold step instead of
+    on every check. When tracemalloc is tracing, the warning names the top
+    growing allocation sites since the previous step.
+    """
+
+    SNAPSHOT_NAME = "growth-baseline"
+
+    def __init__(self, interval: float = 60.0, threshold_mb: float = 200.0,
+                 tracker: Optional[TracemallocTracker] = None, rss: Callable[[], int] = rss_bytes):
+        self.interval = interval
+        self.threshold_mb = threshold_mb
+        self.tracker = tracker
+        self._rss = rss
+        self.baseline_mb: Optional[float] = None
+        self.current_mb: Optional[float] = None
+        self.warnings = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start checking from inside the running event loop."""
+        if self.running:
+            return
+        self._rebase(self._rss() / MB)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.check()
+
+    def check(self) -> bool:
+        """Sample RSS once; returns True when the growth threshold was crossed."""
+        self.current_mb = self._rss() / MB
+        if self.baseline_mb is None:
+            self._rebase(self.current_mb)
+            return False
+        growth = self.current_mb - self.baseline_mb
+        if growth < self.threshold_mb:
+            return False
+        self.warnings += 1
+        sites = self.tracker.top_growth(self.SNAPSHOT_NAME) if self.tracker is not None else []
+        logger.warning(
+            f"Worker RSS grew {growth:.0f}MB to {self.current_mb:.0f}MB"
+            + (f"; top growth: {', '.join(sites)}" if sites else "")
+        )
+        self._rebase(self.current_mb)
+        return True
+
+    def _rebase(self, rss_mb: float) -> None:
+        self.baseline_mb = rss_mb
+        if self.tracker is not None and self.tracker.tracing:
+            self.tracker.take(self.SNAPSHOT_NAME)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_s": self.interval,
+            "threshold_mb": self.threshold_mb,
+            "baseline_mb": round(self.baseline_mb, 2) if self.baseline_mb is not None else None,
+            "current_mb": round(self.current_mb, 2) if self.current_mb is not None else None,
+            "warnings": self.warnings
+        }
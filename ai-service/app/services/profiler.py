@@ -0,0 +1,153 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Leaf frames of threads that are waiting rather than running
+IDLE_LEAVES = frozenset((
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+))
+
+# Service root, stripped from source paths in frame labels
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+
+# Stacks beyond the table size are counted under this key
+OVERFLOW_STACK = "[other stacks]"
+
+
+class SamplingProfiler:
+    """In-process statistical profiler producing folded stacks.
+
+    A daemon thread wakes ``interval`` seconds apart, reads every thread's
+    current frame with ``sys._current_frames()`` and counts the stack as a
+    folded line ``thread;outer;...;inner``. Memory is bounded by
+    ``max_stacks`` distinct stacks of at most ``max_depth`` frames; further
+    new stacks are counted under one overflow key. Threads parked in a wait
+    are skipped unless ``include_idle`` is set, so the counts approximate
+    where CPU time goes.
+    """
+
+    def __init__(self, interval: float = 0.01, max_stacks: int = 5000, max_depth: int = 64,
+                 include_idle: bool = False):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.include_idle = include_idle
+        self._stacks: Dict[str, int] = {}
+        self._labels: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.samples = 0
+        self.overflowed = 0
+        self.sampling_seconds = 0.0
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> None:
+        if interval is not None:
+            self.interval = interval
+        if self.running:
+            return
+        self._stopped.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {1 / self.interval:.0f} Hz")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+            self.overflowed = 0
+            self.sampling_seconds = 0.0
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            start = time.perf_counter()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            folded = [
+                self._fold(names.get(ident, str(ident)), frame)
+                for ident, frame in sys._current_frames().items() if ident != own
+            ]
+            with self._lock:
+                for stack in folded:
+                    if stack is None:
+                        continue
+                    if stack not in self._stacks and len(self._stacks) >= self.max_stacks:
+                        self.overflowed += 1
+                        stack = OVERFLOW_STACK
+                    self._stacks[stack] = self._stacks.get(stack, 0) + 1
+                self.samples += 1
+                self.sampling_seconds += time.perf_counter() - start
+
+    def _fold(self, thread_name: str, frame) -> Optional[str]:
+        code = frame.f_code
+        if not self.include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+            return None
+        labels = []
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name.replace(";", ":"))
+        return ";".join(reversed(labels))
+
+    def _label(self, code) -> str:
+        # Code objects are long-lived, so their labels are cached
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            if len(self._labels) < 50_000:
+                self._labels[code] = label
+        return label
+
+    def folded(self) -> str:
+        """Stacks in the folded format read by flamegraph.pl and speedscope."""
+        with self._lock:
+            items = sorted(self._stacks.items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "interval_ms": self.interval * 1000,
+                "started_at": self.started_at,
+                "samples": self.samples,
+                "distinct_stacks": len(self._stacks),
+                "max_stacks": self.max_stacks,
+                "overflowed": self.overflowed,
+                "sampling_ms_per_sample": round(self.sampling_seconds / self.samples * 1000, 4) if self.samples else 0.0
+            }
+
+
+def _short_path(path: str) -> str:
+    """Trim a source path to the part after the service root or site-packages."""
+    if path.startswith(SERVICE_ROOT):
+        return path[len(SERVICE_ROOT):]
+    marker = "site-packages" + os.sep
+    index = path.rfind(marker)
+    if index != -1:
+        return path[index + len(marker):]
+    return os.path.basename(path)
+
@@ -0,0 +1,113 @@
+import heapq
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from app.core.logging import get_logger
+from app.models.schemas import AnalysisRequest
+
+logger = get_logger(__name__)
+
+# Rejected lines reported back individually; the rest are only counted
+MAX_REPORTED_ERRORS = 10
+
+
+class TopK:
+    """Bounded min-heap of the ``k`` highest-scoring items seen so far.
+
+    Entries are ``(score, -index, item)``, so on equal scores the item that
+    arrived first ranks higher and ``item`` itself is never compared.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Score an item must beat to enter, or None while the heap has room."""
+        return self._heap[0][0] if len(self._heap) >= self.k else None
+
+    def push(self, score: float, index: int, item: Any) -> bool:
+        entry = (score, -index, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def ranked(self) -> List[Tuple[float, int, Any]]:
+        """``(score, index, item)`` from best to worst."""
+        return [(score, -negated, item) for score, negated, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class ProposalRanker:
+    """Streams proposals through the cheap batch scorer, keeping only a top-K heap.
+
+    ``feed`` takes raw NDJSON lines, one proposal per line, validates them
+    and scores the whole chunk with ``AIAnalyzer.score_batch`` without
+    sentiment and without touching the analysis memo. Only the
+    ``candidates`` best proposals seen so far are kept, so memory is
+    bounded by the chunk size plus the heap regardless of how many
+    proposals arrive. ``finish(deep=True)`` re-scores just those
+    candidates with the full analysis and re-ranks them by it.
+    """
+
+    def __init__(self, analyzer, k: int, candidates: Optional[int] = None):
+        self.analyzer = analyzer
+        self.k = k
+        self.heap = TopK(max(k, candidates or k))
+        self.received = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def feed(self, lines: Sequence[bytes]) -> None:
+        batch: List[Tuple[int, AnalysisRequest]] = []
+        for line in lines:
+            index = self.received
+            self.received += 1
+            try:
+                batch.append((index, AnalysisRequest(**json.loads(line))))
+            except (ValueError, TypeError, ValidationError) as e:
+                self._reject(index, e)
+        if not batch:
+            return
+
+        # Bulk input is mostly seen once; keep it out of the shared memo
+        scores = self.analyzer.score_batch([request for _, request in batch], sentiment=False, memoize=False)
+        threshold = self.heap.threshold
+        for (index, request), score in zip(batch, scores.overall.tolist()):
+            score = round(score, 2)
+            # The threshold only rises, so anything not above the chunk-start value is out
+            if threshold is None or score > threshold:
+                self.heap.push(score, index, request)
+
+    def _reject(self, index: int, error: Exception) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            message = error.errors()[0]["msg"] if isinstance(error, ValidationError) else str(error)
+            self.errors.append({"index": index, "error": message})
+
+    def finish(self, deep: bool = False) -> List[Dict[str, Any]]:
+        """The top ``k`` as dicts with rank, index, title, score and, if deep, the analysis."""
+        ranked = [
+            {"index": index, "title": request.title, "quick_score": score, "score": score, "request": request}
+            for score, index, request in self.heap.ranked()
+        ]
+        if deep:
+            for entry in ranked:
+                record = self.analyzer.analyze_record(entry["request"])
+                entry["analysis"] = record.to_response()
+                entry["score"] = record.score
+            ranked.sort(key=lambda entry: (-entry["score"], entry["index"]))
+        ranked = ranked[:self.k]
+        for rank, entry in enumerate(ranked, start=1):
+            entry["rank"] = rank
+            del entry["request"]
+        return ranked
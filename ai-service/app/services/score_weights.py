@@ -0,0 +1,11 @@
+from app.models.schemas import SentimentType
+
+# Overall score weights, impact being most important. Shared by AIAnalyzer and
+# VectorScorer, whose overall scores must agree exactly
+IMPACT_WEIGHT = 0.35
+FEASIBILITY_WEIGHT = 0.25
+CLARITY_WEIGHT = 0.25
+BUDGET_WEIGHT = 0.15
+
+# Added to the weighted sum for a clearly positive or negative tone
+SENTIMENT_ADJUSTMENT = {SentimentType.POSITIVE: 0.5, SentimentType.NEGATIVE: -0.5}
@@ -0,0 +1,376 @@
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.models.schemas import AnalysisRequest
+from app.services.ai_analyzer import ProposalText
+
+logger = get_logger(__name__)
+
+# Numeric response fields stored per proposal, in column order
+SCORE_FIELDS = (
+    "score",
+    "impact_score",
+    "feasibility_score",
+    "clarity_score",
+    "budget_appropriateness",
+    "confidence",
+)
+
+TERM = re.compile(r"[^\W\d_]{2,}")
+
+# Rows handed to SQLite per transaction by the writer thread
+WRITE_BATCH = 256
+
+
+def terms(text: str) -> Set[str]:
+    """Distinct lowercased words of ``text``, as indexed and queried."""
+    return set(TERM.findall(text.lower()))
+
+
+class IndexStore:
+    """SQLite persistence for the index, written by a background thread.
+
+    ``put`` only enqueues the row, so indexing an analysis never waits on
+    disk; the writer commits whatever has queued up in one transaction.
+
+    The connections and writer belong to one process and are opened on its
+    first use. The store is built at import, which with preloading
+    happens in the server master: each forked worker then opens its own
+    instead of using an inherited connection and a writer thread that did
+    not survive the fork. Workers share the file in WAL mode, so one
+    worker reads what the others commit (see ``ProposalIndex.refresh``)
+    while their writers take turns.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Process owning the connection, queue and writer below; None until first use
+        self._pid: Optional[int] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: "Optional[queue.SimpleQueue[Optional[Tuple[Any, ...]]]]" = None
+        self._writer: Optional[threading.Thread] = None
+        # Process owning the read connection; reads never wait behind queued writes
+        self._reader_pid: Optional[int] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._connect().close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS proposals (
+                    digest TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    category TEXT,
+                    language TEXT,
+                    terms TEXT NOT NULL,
+                    {", ".join(f"{field} REAL NOT NULL" for field in SCORE_FIELDS)},
+                    risk_factors TEXT NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+        return conn
+
+    def _open(self) -> "queue.SimpleQueue[Optional[Tuple[Any, ...]]]":
+        """This process's write queue, starting its connection and writer on first use."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Anything set here before a fork belongs to the parent and is left alone
+                self._conn = self._connect()
+                self._queue = queue.SimpleQueue()
+                self._writer = threading.Thread(target=self._write_loop, name="index-writer", daemon=True)
+                self._writer.start()
+                self._pid = os.getpid()
+            return self._queue
+
+    def load_from(self, rowid: int = 0) -> List[Tuple[Any, ...]]:
+        """Committed rows from ``rowid`` on, each prefixed with its rowid, in commit order.
+
+        Rows get increasing rowids as they are committed, by any process.
+        Replacing the newest row can reuse its rowid, so callers resume
+        from the last rowid they saw, not the one after it.
+        """
+        with self._lock:
+            if self._reader_pid != os.getpid():
+                self._reader = self._connect()
+                self._reader_pid = os.getpid()
+            return self._reader.execute(
+                "SELECT rowid, * FROM proposals WHERE rowid >= ? ORDER BY rowid", (rowid,)
+            ).fetchall()
+
+    def put(self, row: Tuple[Any, ...]) -> None:
+        self._open().put(row)
+
+    def _write_loop(self) -> None:
+        placeholders = ", ".join("?" * (7 + len(SCORE_FIELDS)))
+        statement = f"INSERT OR REPLACE INTO proposals VALUES ({placeholders})"
+        while True:
+            rows = [self._queue.get()]
+            while rows[-1] is not None and len(rows) < WRITE_BATCH:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = rows[-1] is None
+            if closing:
+                rows.pop()
+            if rows:
+                try:
+                    with self._conn:
+                        self._conn.executemany(statement, rows)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to persist {len(rows)} index entries: {str(e)}")
+            if closing:
+                return
+
+    def close(self) -> None:
+        """Write out queued rows and close this process's connections."""
+        with self._lock:
+            if self._reader_pid == os.getpid():
+                self._reader.close()
+                self._reader_pid = None
+            if self._pid != os.getpid():
+                return
+            self._pid = None
+        self._queue.put(None)
+        self._writer.join()
+        self._conn.close()
+
+
+class ProposalIndex:
+    """In-process inverted index over analyzed proposals.
+
+    Every analysis adds the proposal's words, category and risk factors as
+    posting sets and its numeric sub-scores as a row of a column matrix.
+    Queries intersect the postings smallest first and apply score ranges
+    to the whole matrix at once, so they take milliseconds without touching
+    the backend database. Proposals are keyed by the text digest used by
+    the analysis memo: analyzing the same text again replaces its entry.
+
+    At most ``max_proposals`` are held; beyond that the least recently
+    indexed proposal is dropped and its slot reused. The store keeps them.
+
+    With a store, each search first loads the rows committed since the
+    last one, so proposals indexed by other worker processes are found
+    too, once their writer has committed them.
+    """
+
+    def __init__(self, store: Optional[IndexStore] = None, capacity: int = 1024, max_proposals: int = 100000):
+        self.store = store
+        self.max_proposals = max_proposals
+        self.evicted = 0
+        self._lock = threading.Lock()
+        # Least recently indexed first
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._docs: List[Dict[str, Any]] = []
+        self._terms: Dict[str, Set[int]] = {}
+        self._categories: Dict[str, Set[int]] = {}
+        self._risks: Dict[str, Set[int]] = {}
+        self._scores = np.zeros((capacity, len(SCORE_FIELDS)), dtype=np.float32)
+        # Highest store rowid loaded so far
+        self._rowid = 0
+        if store is not None:
+            start = time.time()
+            self.refresh()
+            logger.info(f"Loaded {len(self._docs)} proposals into the search index in {time.time() - start:.2f}s")
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, request: AnalysisRequest, result: Any) -> None:
+        """Index a proposal with its full analysis (a response or record)."""
+        digest = ProposalText(request.title, request.description).digest.hex()
+        category = request.category.value if request.category else None
+        scores = tuple(float(getattr(result, field)) for field in SCORE_FIELDS)
+        risks = tuple(result.risk_factors)
+        indexed_at = time.time()
+        with self._lock:
+            known = digest in self._ids
+            words = None if known else terms(f"{request.title} {request.description}")
+            self._put(digest, request.title, category, result.language, words, scores, risks, indexed_at)
+        if self.store is not None:
+            if words is None:
+                words = terms(f"{request.title} {request.description}")
+            self.store.put((
+                digest, request.title, category, result.language, " ".join(sorted(words)),
+                *scores, json.dumps(risks), indexed_at
+            ))
+
+    def refresh(self) -> int:
+        """Load rows committed to the store since the last refresh; returns how many were new."""
+        if self.store is None:
+            return 0
+        rows = self.store.load_from(self._rowid)
+        loaded = 0
+        with self._lock:
+            for rowid, *row in rows:
+                loaded += self._load(row)
+                self._rowid = max(self._rowid, rowid)
+        return loaded
+
+    def _load(self, row: Tuple[Any, ...]) -> bool:
+        digest, title, category, language, words = row[:5]
+        scores = row[5:5 + len(SCORE_FIELDS)]
+        risks, indexed_at = row[5 + len(SCORE_FIELDS):]
+        doc_id = self._ids.get(digest)
+        if doc_id is not None and self._docs[doc_id]["indexed_at"] >= indexed_at:
+            # Already loaded, or indexed again here since and not yet committed
+            return False
+        self._put(digest, title, category, language, set(words.split()), scores, tuple(json.loads(risks)), indexed_at)
+        return True
+
+    def _put(self, digest: str, title: str, category: Optional[str], language: str,
+             words: Optional[Set[str]], scores: Sequence[float], risks: Tuple[str, ...],
+             indexed_at: float) -> None:
+        doc_id = self._ids.get(digest)
+        if doc_id is None:
+            if len(self._ids) >= self.max_proposals:
+                doc_id = self._evict_oldest()
+            else:
+                doc_id = len(self._docs)
+                self._docs.append({})
+                if doc_id == len(self._scores):
+                    self._scores = np.concatenate([self._scores, np.zeros_like(self._scores)])
+            self._ids[digest] = doc_id
+            # Same digest means same text, so the words of a known proposal never change
+            for word in words:
+                self._terms.setdefault(word, set()).add(doc_id)
+        else:
+            self._ids.move_to_end(digest)
+            old = self._docs[doc_id]
+            words = old["terms"]
+            self._discard(self._categories, old["category"], doc_id)
+            for risk in old["risk_factors"]:
+                self._discard(self._risks, risk, doc_id)
+
+        if category is not None:
+            self._categories.setdefault(category, set()).add(doc_id)
+        for risk in risks:
+            self._risks.setdefault(risk, set()).add(doc_id)
+        self._scores[doc_id] = scores
+        self._docs[doc_id] = {
+            "id": digest,
+            "title": title,
+            "category": category,
+            "language": language,
+            "risk_factors": risks,
+            "indexed_at": indexed_at,
+            # Kept to take the proposal out of the postings when it is evicted
+            "terms": tuple(words),
+        }
+
+    def _evict_oldest(self) -> int:
+        """Drop the least recently indexed proposal from every posting; returns its free slot."""
+        _, doc_id = self._ids.popitem(last=False)
+        old = self._docs[doc_id]
+        for word in old["terms"]:
+            postings = self._terms[word]
+            postings.discard(doc_id)
+            if not postings:
+                del self._terms[word]
+        self._discard(self._categories, old["category"], doc_id)
+        for risk in old["risk_factors"]:
+            self._discard(self._risks, risk, doc_id)
+        self.evicted += 1
+        return doc_id
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[int]], key: Optional[str], doc_id: int) -> None:
+        if key is not None and key in postings:
+            postings[key].discard(doc_id)
+
+    def search(self, words: Iterable[str] = (), category: Optional[str] = None,
+               risk: Optional[str] = None, ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               limit: int = 20) -> Dict[str, Any]:
+        """Proposals matching every word, the category, the risk and every score range.
+
+        ``risk`` matches risk factors containing it, case-insensitively.
+        ``ranges`` maps a score field to an inclusive ``(min, max)``; either
+        bound may be None. Hits are ordered by overall score, best first.
+        """
+        start = time.perf_counter()
+        for field in ranges or {}:
+            if field not in SCORE_FIELDS:
+                raise ValueError(f"Unknown score field '{field}'; choose from {', '.join(SCORE_FIELDS)}")
+        self.refresh()
+        with self._lock:
+            count = len(self._docs)
+            sets: List[Set[int]] = []
+            for word in {word for text in words for word in terms(text)}:
+                sets.append(self._terms.get(word, set()))
+            if category is not None:
+                sets.append(self._categories.get(category, set()))
+            if risk is not None:
+                needle = risk.lower()
+                sets.append(set().union(*(ids for message, ids in self._risks.items() if needle in message.lower())))
+
+            mask = np.ones(count, dtype=bool)
+            if sets:
+                sets.sort(key=len)
+                matched = set.intersection(*sets) if sets[0] else set()
+                mask[:] = False
+                mask[np.fromiter(matched, dtype=np.int64, count=len(matched))] = True
+            scores = self._scores[:count]
+            for field, (low, high) in (ranges or {}).items():
+                column = scores[:, SCORE_FIELDS.index(field)]
+                # Stored as float32; compare at that precision so bounds are inclusive
+                if low is not None:
+                    mask &= column >= np.float32(low)
+                if high is not None:
+                    mask &= column <= np.float32(high)
+
+            hits = np.flatnonzero(mask)
+            overall = scores[hits, 0]
+            if limit < len(hits):
+                top = np.argpartition(-overall, limit - 1)[:limit]
+                hits, overall = hits[top], overall[top]
+            order = np.lexsort((hits, -overall))
+            results = [self._hit(int(doc_id)) for doc_id in hits[order]]
+            total = int(mask.sum())
+
+        return {
+            "total": total,
+            "results": results,
+            "took_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+    def _hit(self, doc_id: int) -> Dict[str, Any]:
+        hit = dict(self._docs[doc_id])
+        del hit["terms"]
+        hit["risk_factors"] = list(hit["risk_factors"])
+        for field, value in zip(SCORE_FIELDS, self._scores[doc_id].tolist()):
+            hit[field] = round(value, 2)
+        return hit
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "proposals": len(self._docs),
+                "max_proposals": self.max_proposals,
+                "evicted": self.evicted,
+                "terms": len(self._terms),
+                "postings": sum(len(ids) for ids in self._terms.values()),
+                "categories": {category: len(ids) for category, ids in self._categories.items()},
+                "persisted": self.store.path if self.store is not None else None,
+            }
+
+    def memory_roots(self) -> Tuple[Any, ...]:
+        return (self._ids, self._docs, self._terms, self._categories, self._risks, self._scores)
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
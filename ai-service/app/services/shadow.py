@@ -0,0 +1,239 @@
+import heapq
+import importlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.models.schemas import AnalysisRequest
+from app.services.loop_watchdog import LagHistogram
+
+logger = get_logger(__name__)
+
+# Numeric response fields compared between the primary and the candidate
+COMPARED_FIELDS = (
+    "score",
+    "impact_score",
+    "feasibility_score",
+    "clarity_score",
+    "budget_appropriateness",
+    "confidence",
+)
+
+# Upper bounds of the overall score delta buckets (candidate minus primary)
+DELTA_BUCKETS = (-2.0, -1.0, -0.5, -0.25, -0.1, -0.01, 0.01, 0.1, 0.25, 0.5, 1.0, 2.0)
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Niceness of the shadow thread where the platform supports per-thread priorities
+SHADOW_NICENESS = 19
+
+
+def load_candidate(spec: str):
+    """Build the candidate analyzer from ``module:attribute``.
+
+    The attribute is an analyzer instance, an analyzer class, or a callable
+    returning one, e.g. ``candidates.lexicon_v2:build_analyzer``.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Shadow analyzer must be given as module:attribute, got '{spec}'")
+    target = getattr(importlib.import_module(module_name), attribute)
+    if isinstance(target, type) or not hasattr(target, "analyze_record"):
+        target = target()
+    return target
+
+
+class RunningStats:
+    """Count, mean, standard deviation and extremes in constant memory (Welford)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.abs_total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def record(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.abs_total += abs(value)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "mean_abs": round(self.abs_total / self.count, 4),
+            "stdev": round((self._m2 / self.count) ** 0.5, 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+        }
+
+
+class ShadowComparison:
+    """Bounded aggregates of candidate-versus-primary differences."""
+
+    def __init__(self, max_examples: int = 10):
+        self.max_examples = max_examples
+        self.compared = 0
+        self.deltas = {field: RunningStats() for field in COMPARED_FIELDS}
+        self.score_deltas = [0] * (len(DELTA_BUCKETS) + 1)
+        self.sentiment_changed = 0
+        self.risks_changed = 0
+        self.strengths_changed = 0
+        self.primary_latency = LagHistogram(LATENCY_BUCKETS_MS)
+        self.candidate_latency = LagHistogram(LATENCY_BUCKETS_MS)
+        self.slowdown = RunningStats()
+        # Min-heap of (|score delta|, sequence, example); keeps the largest disagreements
+        self._examples: List[Tuple[float, int, Dict[str, Any]]] = []
+
+    def record(self, title: str, primary: Any, candidate: Any, primary_ms: float, candidate_ms: float) -> None:
+        self.compared += 1
+        for field in COMPARED_FIELDS:
+            self.deltas[field].record(getattr(candidate, field) - getattr(primary, field))
+        score_delta = candidate.score - primary.score
+        self.score_deltas[next(
+            (i for i, bound in enumerate(DELTA_BUCKETS) if score_delta <= bound), len(DELTA_BUCKETS)
+        )] += 1
+        self.sentiment_changed += candidate.sentiment != primary.sentiment
+        self.risks_changed += set(candidate.risk_factors) != set(primary.risk_factors)
+        self.strengths_changed += set(candidate.strengths) != set(primary.strengths)
+        self.primary_latency.record(primary_ms)
+        self.candidate_latency.record(candidate_ms)
+        self.slowdown.record(candidate_ms - primary_ms)
+
+        if score_delta and self.max_examples:
+            example = (abs(score_delta), self.compared, {
+                "title": title[:100],
+                "primary_score": primary.score,
+                "candidate_score": candidate.score,
+            })
+            if len(self._examples) < self.max_examples:
+                heapq.heappush(self._examples, example)
+            elif example[:2] > self._examples[0][:2]:
+                heapq.heapreplace(self._examples, example)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound:+g}" for bound in DELTA_BUCKETS] + [f">{DELTA_BUCKETS[-1]:+g}"]
+        return {
+            "compared": self.compared,
+            "deltas": {field: stats.to_dict() for field, stats in self.deltas.items()},
+            "score_delta_buckets": dict(zip(labels, self.score_deltas)),
+            "sentiment_changed": self.sentiment_changed,
+            "risk_factors_changed": self.risks_changed,
+            "strengths_changed": self.strengths_changed,
+            "latency": {
+                "primary": self.primary_latency.to_dict(),
+                "candidate": self.candidate_latency.to_dict(),
+                "candidate_minus_primary_ms": self.slowdown.to_dict(),
+            },
+            "largest_score_deltas": [example for _, _, example in sorted(self._examples, reverse=True)],
+        }
+
+
+class ShadowRunner:
+    """Scores a sample of live requests with a candidate analyzer, off the request path.
+
+    ``submit`` is meant to run as a response background task: it samples
+    at ``sample_rate``, drops the sample when ``max_pending`` are already
+    waiting, and otherwise hands it to a single low-priority thread. The
+    candidate's stages run inline on that thread, so none of its work
+    competes at normal priority, and only aggregates are kept.
+    """
+
+    def __init__(self, candidate, sample_rate: float = 0.01, max_pending: int = 100,
+                 max_examples: int = 10, rng: Optional[Callable[[], float]] = None):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.max_examples = max_examples
+        self._rng = rng or random.random
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.seen = 0
+        self.sampled = 0
+        self.dropped = 0
+        self.failed = 0
+        self.comparison = ShadowComparison(max_examples)
+        if getattr(candidate, "executor", None) is not None:
+            candidate.executor.shutdown(wait=False)
+            candidate.executor = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow", initializer=self._lower_priority)
+
+    @staticmethod
+    def _lower_priority() -> None:
+        try:
+            # On Linux the niceness of a thread id applies to that thread alone
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), SHADOW_NICENESS)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Could not lower shadow thread priority: {str(e)}")
+
+    def submit(self, request: AnalysisRequest, primary: Any, complete: Optional[Callable[[], Any]] = None) -> bool:
+        """Queue a comparison for a complete primary result; returns whether it was sampled.
+
+        A primary projected to a few fields comes with ``complete``, which
+        returns the full primary record. It is called on the shadow thread,
+        and only for sampled requests.
+        """
+        with self._lock:
+            self.seen += 1
+            if primary.skipped_stages or self._rng() >= self.sample_rate:
+                return False
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending += 1
+            self.sampled += 1
+        self.executor.submit(self._compare, request, primary, complete)
+        return True
+
+    def _compare(self, request: AnalysisRequest, primary: Any, complete: Optional[Callable[[], Any]] = None) -> None:
+        try:
+            if complete is not None:
+                primary = complete()
+                if primary.skipped_stages:
+                    return
+            start = time.perf_counter()
+            candidate = self.candidate.analyze_record(request)
+            candidate_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.comparison.record(request.title, primary, candidate, primary.processing_time * 1000, candidate_ms)
+        except Exception as e:
+            logger.error(f"Shadow analysis failed: {str(e)}")
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidate": getattr(self.candidate, "version", type(self.candidate).__name__),
+                "sample_rate": self.sample_rate,
+                "seen": self.seen,
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "pending": self._pending,
+                **self.comparison.to_dict(),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seen = self.sampled = self.dropped = self.failed = 0
+            self.comparison = ShadowComparison(self.max_examples)
+
+    def stop(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
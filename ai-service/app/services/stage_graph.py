@@ -0,0 +1,247 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.services.memo import MISSING
+
+logger = get_logger(__name__)
+
+
+class Stage:
+    """One node of a stage graph.
+
+    ``compute`` is called as ``compute(context, *inputs)`` where ``inputs``
+    are the values of the ``requires`` stages, in order. Offloaded stages
+    run on the shared executor and are bounded by ``timeout``; the others
+    run on the calling thread while offloaded work is in flight. Without an
+    executor every stage runs inline and timeouts do not apply. A stage
+    that raises or times out yields ``fallback`` instead. ``optional``
+    stages are skipped when a run's deadline leaves too little time for
+    them.
+
+    ``lookup``, called like ``compute``, returns the stage's value when it
+    is already known (e.g. memoized) and MISSING otherwise. A known value
+    is used as is: the stage is neither offloaded nor skipped.
+    """
+
+    __slots__ = ("name", "compute", "requires", "fallback", "offload", "timeout", "optional", "lookup")
+
+    def __init__(self, name: str, compute: Callable[..., Any], requires: Tuple[str, ...] = (),
+                 fallback: Any = None, offload: bool = False, timeout: Optional[float] = None,
+                 optional: bool = False, lookup: Optional[Callable[..., Any]] = None):
+        self.name = name
+        self.compute = compute
+        self.requires = tuple(requires)
+        self.fallback = fallback
+        self.offload = offload
+        self.timeout = timeout
+        self.optional = optional
+        self.lookup = lookup
+
+
+class StageRun:
+    """Values of one graph run, plus the stages that fell back and why.
+
+    ``failed`` maps a stage name to "error", "timeout" or "skipped".
+    """
+
+    __slots__ = ("values", "failed")
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.failed: Dict[str, str] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+
+class StageGraph:
+    """Declared dependency graph of analysis stages.
+
+    Stages are validated and ordered once at construction. ``run`` starts
+    every offloaded stage as soon as its inputs are ready, so independent
+    expensive stages overlap and latency follows the slowest path through
+    the graph instead of the sum of all stages.
+
+    The graph keeps a moving average of each stage's duration; given a
+    deadline, a run skips optional stages whose expected duration does not
+    fit in the remaining budget and cuts offloaded stages off at the
+    deadline.
+    """
+
+    # Weight of the newest sample in the per-stage duration average
+    COST_SMOOTHING = 0.2
+
+    def __init__(self, stages: Iterable[Stage], stats_from: Optional["StageGraph"] = None):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+        if stats_from is not None:
+            # Same stages computed by another analyzer instance: counters and durations are pooled
+            if set(stats_from.stages) != set(self.stages):
+                raise ValueError("Stage statistics can only be shared between graphs of the same stages")
+            self._lock, self._counters, self._costs = stats_from._lock, stats_from._counters, stats_from._costs
+        else:
+            self._lock = threading.Lock()
+            self._counters = {name: {"runs": 0, "errors": 0, "timeouts": 0, "skipped": 0} for name in self.stages}
+            self._costs: Dict[str, Optional[float]] = dict.fromkeys(self.stages)
+        self._plans: Dict[FrozenSet[str], List[Stage]] = {}
+
+    def _topological_order(self) -> List[Stage]:
+        order: List[Stage] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Stage cycle: {' -> '.join(path + (name,))}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}' required by '{path[-1]}'")
+            state[name] = 1
+            for dependency in self.stages[name].requires:
+                visit(dependency, path + (name,))
+            state[name] = 2
+            order.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def plan(self, targets: Optional[Iterable[str]] = None) -> List[Stage]:
+        """Stages ``targets`` need, themselves included, in run order.
+
+        Without targets that is every stage. Plans are cached per target
+        set; raises ValueError for unknown stage names.
+        """
+        if targets is None:
+            return self.order
+        key = frozenset(targets)
+        plan = self._plans.get(key)
+        if plan is None:
+            unknown = key - self.stages.keys()
+            if unknown:
+                raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+            needed = set()
+            pending = list(key)
+            while pending:
+                name = pending.pop()
+                if name not in needed:
+                    needed.add(name)
+                    pending.extend(self.stages[name].requires)
+            plan = self._plans[key] = [stage for stage in self.order if stage.name in needed]
+        return plan
+
+    def run(self, context: Any, executor: Optional[Executor], deadline: Optional[float] = None,
+            targets: Optional[Iterable[str]] = None) -> StageRun:
+        """Run the stages for ``context`` and return their values.
+
+        ``deadline`` is an absolute ``time.monotonic()`` value. With
+        ``targets`` only those stages and their dependencies run; the
+        values of the others are absent from the result.
+        """
+        result = StageRun()
+        values = result.values
+        remaining = list(self.plan(targets))
+        in_flight: Dict[str, Tuple[Future, float, float]] = {}
+
+        while remaining or in_flight:
+            ready = [stage for stage in remaining if all(name in values for name in stage.requires)]
+            # Start offloaded stages before doing inline work so they overlap with it
+            ready.sort(key=lambda stage: not stage.offload)
+            for stage in ready:
+                remaining.remove(stage)
+                inputs = [values[name] for name in stage.requires]
+                started = time.monotonic()
+                known = stage.lookup(context, *inputs) if stage.lookup is not None else MISSING
+                if known is not MISSING:
+                    # Counted as a run, but kept out of the duration average used for deadlines
+                    values[stage.name] = known
+                    self._count(stage.name)
+                elif stage.optional and deadline is not None and not self._fits(stage.name, started, deadline):
+                    self._fall_back(stage, result, "skipped", None)
+                elif stage.offload and executor is not None:
+                    stage_deadline = started + stage.timeout if stage.timeout is not None else float("inf")
+                    if deadline is not None:
+                        stage_deadline = min(stage_deadline, deadline)
+                    in_flight[stage.name] = (executor.submit(stage.compute, context, *inputs), started, stage_deadline)
+                else:
+                    try:
+                        values[stage.name] = stage.compute(context, *inputs)
+                    except Exception as e:
+                        self._fall_back(stage, result, "error", e)
+                    else:
+                        self._complete(stage.name, started)
+
+            if ready or not in_flight:
+                continue
+
+            # Nothing else can start until an offloaded stage finishes or expires
+            earliest = min(stage_deadline for _, _, stage_deadline in in_flight.values())
+            timeout = None if earliest == float("inf") else max(earliest - time.monotonic(), 0.0)
+            wait([future for future, _, _ in in_flight.values()], timeout=timeout, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for name, (future, started, stage_deadline) in list(in_flight.items()):
+                stage = self.stages[name]
+                if future.done():
+                    del in_flight[name]
+                    try:
+                        values[name] = future.result()
+                    except Exception as e:
+                        self._fall_back(stage, result, "error", e)
+                    else:
+                        self._complete(name, started)
+                elif now >= stage_deadline:
+                    # A running thread cannot be interrupted; its late result is discarded
+                    del in_flight[name]
+                    future.cancel()
+                    self._fall_back(stage, result, "timeout", None)
+
+        return result
+
+    def _fits(self, name: str, now: float, deadline: float) -> bool:
+        cost = self._costs[name]
+        return now + (cost or 0.0) <= deadline
+
+    def _complete(self, name: str, started: float) -> None:
+        elapsed = time.monotonic() - started
+        with self._lock:
+            cost = self._costs[name]
+            self._costs[name] = elapsed if cost is None else cost + self.COST_SMOOTHING * (elapsed - cost)
+            self._counters[name]["runs"] += 1
+
+    def _fall_back(self, stage: Stage, result: StageRun, reason: str, error: Optional[Exception]) -> None:
+        result.values[stage.name] = stage.fallback
+        result.failed[stage.name] = reason
+        self._count(stage.name, {"error": "errors", "timeout": "timeouts"}.get(reason, reason))
+        if error is not None:
+            logger.warning(f"Stage '{stage.name}' failed, using fallback: {str(error)}")
+        elif reason == "timeout":
+            logger.warning(f"Stage '{stage.name}' ran out of time, using fallback")
+
+    def _count(self, name: str, failure: Optional[str] = None) -> None:
+        with self._lock:
+            counters = self._counters[name]
+            counters["runs"] += 1
+            if failure is not None:
+                counters[failure] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage counters, average duration and configuration."""
+        with self._lock:
+            return {
+                name: dict(
+                    counters,
+                    average_ms=round(self._costs[name] * 1000, 3) if self._costs[name] is not None else None,
+                    offload=self.stages[name].offload,
+                    optional=self.stages[name].optional,
+                    timeout=self.stages[name].timeout
+                )
+                for name, counters in self._counters.items()
+            }
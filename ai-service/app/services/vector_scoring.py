@@ -0,0 +1,278 @@
+import threading
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.schemas import SentimentType
+from app.services.lexicons import LexiconPack
+from app.services.score_weights import (
+    BUDGET_WEIGHT, CLARITY_WEIGHT, FEASIBILITY_WEIGHT, IMPACT_WEIGHT, SENTIMENT_ADJUSTMENT
+)
+
+# Documents are processed in chunks to bound the size of the token arrays
+CHUNK_SIZE = 8192
+
+# Joins the texts of a chunk so the chunk can be split in one call
+SEPARATOR = "\x00"
+
+# Token vocabularies larger than this are dropped and rebuilt
+MAX_VOCABULARY = 500_000
+
+
+class BatchScores:
+    """Sub-scores and overall scores for a batch, one array element per proposal."""
+
+    __slots__ = ("impact", "feasibility", "clarity", "budget", "confidence", "overall")
+
+    FIELDS = (
+        ("score", "overall"),
+        ("impact_score", "impact"),
+        ("feasibility_score", "feasibility"),
+        ("clarity_score", "clarity"),
+        ("budget_appropriateness", "budget"),
+        ("confidence", "confidence"),
+    )
+
+    def __init__(self, impact: np.ndarray, feasibility: np.ndarray, clarity: np.ndarray,
+                 budget: np.ndarray, confidence: np.ndarray, overall: np.ndarray):
+        self.impact = impact
+        self.feasibility = feasibility
+        self.clarity = clarity
+        self.budget = budget
+        self.confidence = confidence
+        self.overall = overall
+
+    def __len__(self) -> int:
+        return len(self.overall)
+
+    def rounded(self) -> Dict[str, List[float]]:
+        """Response-field lists rounded exactly like ``AIAnalyzer.analyze_record``."""
+        return {
+            field: [round(value, 2) for value in getattr(self, attr).tolist()]
+            for field, attr in self.FIELDS
+        }
+
+
+class _TokenVocabulary(dict):
+    """Maps each distinct token to a row id, computing its term bitmask on first sight.
+
+    Lookups of known tokens stay in C via ``dict.__getitem__``; only new
+    tokens fall through to ``__missing__``.
+    """
+
+    def __init__(self, terms: List[Tuple[int, str]], mask_bytes: int):
+        super().__init__()
+        self.terms = terms
+        self.mask_bytes = mask_bytes
+        self.masks: List[bytes] = []
+
+    def __missing__(self, token: str) -> int:
+        mask = 0
+        for bit, term in self.terms:
+            if term in token:
+                mask |= bit
+        token_id = self[token] = len(self.masks)
+        self.masks.append(mask.to_bytes(self.mask_bytes, "little"))
+        return token_id
+
+    def mask_table(self) -> np.ndarray:
+        return np.frombuffer(b"".join(self.masks), dtype=np.uint8).reshape(-1, self.mask_bytes)
+
+
+class VectorScorer:
+    """Scores many proposals at once with array operations.
+
+    Every rule scorer in ``AIAnalyzer`` is a base score plus capped,
+    weighted counts of lexicon terms found in the text, plus amount-band
+    adjustments, clipped to 0-10. Here the term hits of a whole batch form
+    an N x L presence matrix; multiplying it by an L x G term-to-group
+    matrix yields every keyword count, and the weights, caps, bands and
+    clipping are applied column-wise in the same order as the scalar
+    scorers, so results are bit-for-bit identical.
+
+    Term presence uses the scalar scorers' substring semantics. A term
+    without whitespace can only occur inside one whitespace-delimited
+    token, so each distinct token is checked against the lexicon once and
+    cached as a bitmask; terms containing whitespace are checked directly.
+    """
+
+    def __init__(self, lexicon: LexiconPack):
+        self.lexicon = lexicon
+        self.categories: Tuple[str, ...] = tuple(lexicon.impact_category_keywords)
+
+        groups = [
+            ("impact", lexicon.impact_indicators),
+            ("scale", lexicon.impact_scale_indicators),
+            ("feasibility", lexicon.feasibility_indicators),
+            ("feasibility_risk", lexicon.feasibility_risk_indicators),
+            ("structure", lexicon.structure_indicators),
+            ("specificity", lexicon.specificity_indicators),
+            ("confidence", lexicon.confidence_structure_words),
+            ("budget", lexicon.budget_keywords),
+            ("budget_scale", lexicon.budget_scale_indicators),
+        ]
+        groups += [(f"category:{name}", words) for name, words in lexicon.impact_category_keywords.items()]
+
+        self.terms: Tuple[str, ...] = tuple(sorted({word for _, words in groups for word in words}))
+        term_index = {term: i for i, term in enumerate(self.terms)}
+        self.group_index = {name: g for g, (name, _) in enumerate(groups)}
+        self.category_index = {category: self.group_index[f"category:{category}"] for category in self.categories}
+
+        # Term-to-group matrix; duplicate words in a list count twice, as in the scalar loops
+        self.weights = np.zeros((len(self.terms), len(groups)), dtype=np.int32)
+        for g, (_, words) in enumerate(groups):
+            for word in words:
+                self.weights[term_index[word], g] += 1
+
+        self._token_terms = [
+            (1 << i, term) for i, term in enumerate(self.terms)
+            if not any(c.isspace() for c in term)
+        ]
+        self._phrase_terms = [
+            (1 << i, term) for i, term in enumerate(self.terms)
+            if any(c.isspace() for c in term)
+        ]
+        self._mask_bytes = max(1, (len(self.terms) + 7) // 8)
+        self._lock = threading.Lock()
+        self._reset_vocabulary()
+
+    def _reset_vocabulary(self) -> None:
+        self._vocabulary = _TokenVocabulary(self._token_terms, self._mask_bytes)
+        self._mask_table = np.zeros((0, self._mask_bytes), dtype=np.uint8)
+
+    def presence(self, texts_lower: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the N x L term-presence matrix and per-text word counts."""
+        with self._lock:
+            packed, word_counts = self._token_presence(texts_lower)
+        self._phrase_presence(packed, texts_lower)
+        return self._unpack(packed), word_counts
+
+    def _token_presence(self, texts_lower: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Bit-packed presence of the whitespace-free terms, plus word counts."""
+        packed = np.zeros((len(texts_lower), self._mask_bytes), dtype=np.uint8)
+        word_counts = np.zeros(len(texts_lower), dtype=np.int64)
+
+        for start in range(0, len(texts_lower), CHUNK_SIZE):
+            chunk = texts_lower[start:start + CHUNK_SIZE]
+            if len(self._vocabulary) > MAX_VOCABULARY:
+                self._reset_vocabulary()
+
+            # One split of the joined chunk avoids allocating a token list per text
+            tokens = f" {SEPARATOR} ".join(chunk).split()
+            ids = np.fromiter(map(self._vocabulary.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+            boundaries = np.flatnonzero(ids == self._vocabulary[SEPARATOR])
+            if len(boundaries) != len(chunk) - 1:
+                # A text contains the separator token itself; fall back to splitting each text
+                lengths = np.fromiter((len(text.split()) for text in chunk), dtype=np.int64, count=len(chunk))
+                ids = np.fromiter(
+                    map(self._vocabulary.__getitem__, chain.from_iterable(text.split() for text in chunk)),
+                    dtype=np.int64, count=int(lengths.sum())
+                )
+                starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            else:
+                starts = np.concatenate(([0], boundaries + 1))
+                lengths = np.concatenate((boundaries, [len(ids)])) - starts
+
+            if len(self._vocabulary) > len(self._mask_table):
+                self._mask_table = self._vocabulary.mask_table()
+
+            nonempty = lengths > 0
+            if len(ids):
+                reduced = np.bitwise_or.reduceat(self._mask_table[ids], np.minimum(starts, len(ids) - 1), axis=0)
+                packed[start:start + len(chunk)][nonempty] = reduced[nonempty]
+            word_counts[start:start + len(chunk)] = lengths
+
+        return packed, word_counts
+
+    def _phrase_presence(self, packed: np.ndarray, texts_lower: Sequence[str]) -> None:
+        """Set the bits of terms containing whitespace, checked on the whole text."""
+        for bit, term in self._phrase_terms:
+            index = bit.bit_length() - 1
+            for i, text in enumerate(texts_lower):
+                if term in text:
+                    packed[i, index >> 3] |= 1 << (index & 7)
+
+    def _unpack(self, packed: np.ndarray) -> np.ndarray:
+        return np.unpackbits(packed, axis=1, count=len(self.terms), bitorder="little")
+
+    def score(self, titles: Sequence[str], descriptions: Sequence[str], amounts: Sequence[float],
+              categories: Sequence[Optional[str]],
+              sentiments: Optional[Sequence[SentimentType]] = None) -> BatchScores:
+        """Score a batch of proposals.
+
+        ``sentiments`` supplies the sentiment of each proposal; pass the
+        scalar analyzer's values to reproduce ``analyze_record`` exactly.
+        When omitted every proposal is treated as neutral.
+        """
+        n = len(titles)
+        # The full text is f"{title}. {description}", so its tokens are the
+        # tokens of the title part followed by those of the description
+        heads = [f"{title}.".lower() for title in titles]
+        bodies = [description.lower() for description in descriptions]
+        with self._lock:
+            head_packed, head_counts = self._token_presence(heads)
+            description_packed, body_counts = self._token_presence(bodies)
+        text_packed = head_packed | description_packed
+        word_counts = head_counts + body_counts
+        if self._phrase_terms:
+            self._phrase_presence(text_packed, [f"{head} {body}" for head, body in zip(heads, bodies)])
+            self._phrase_presence(description_packed, bodies)
+        text_presence = self._unpack(text_packed)
+        description_presence = self._unpack(description_packed)
+
+        counts = text_presence.astype(np.int32) @ self.weights
+        description_counts = description_presence.astype(np.int32) @ self.weights
+        group = self.group_index
+
+        amount = np.asarray(amounts, dtype=np.float64)
+        category_columns = np.array(
+            [self.category_index.get(category, -1) if category else -1 for category in categories],
+            dtype=np.int64
+        )
+
+        # Impact
+        has_category = category_columns >= 0
+        category_matches = counts[np.arange(n), np.where(has_category, category_columns, 0)]
+        impact = np.full(n, 5.0)
+        impact += np.where(has_category, np.minimum(category_matches * 0.5, 2.0), 0.0)
+        impact += np.minimum(counts[:, group["impact"]] * 0.3, 2.0)
+        impact += np.minimum(counts[:, group["scale"]] * 0.2, 1.0)
+        impact = np.minimum(impact, 10.0)
+
+        # Feasibility
+        feasibility = np.full(n, 5.0)
+        feasibility += np.minimum(counts[:, group["feasibility"]] * 0.4, 2.5)
+        feasibility -= np.minimum(counts[:, group["feasibility_risk"]] * 0.3, 1.5)
+        feasibility += np.where(amount > 10, -1.0, np.where(amount < 0.1, 0.5, 0.0))
+        feasibility = np.maximum(np.minimum(feasibility, 10.0), 0.0)
+
+        # Clarity
+        clarity = np.full(n, 5.0)
+        clarity += np.where(word_counts > 200, 1.0, np.where(word_counts < 100, -1.0, 0.0))
+        clarity += np.minimum(counts[:, group["structure"]] * 0.3, 2.0)
+        clarity += np.minimum(counts[:, group["specificity"]] * 0.4, 2.0)
+        clarity = np.minimum(clarity, 10.0)
+
+        # Budget appropriateness looks at the description only
+        in_range = (amount >= 0.1) & (amount <= 5.0)
+        budget = np.full(n, 5.0)
+        budget += np.where(in_range, 2.0, np.where(amount > 10.0, -2.0, np.where(amount < 0.01, -1.0, 0.0)))
+        budget += np.where(description_counts[:, group["budget"]] > 0, 1.0, 0.0)
+        budget += np.where(description_counts[:, group["budget_scale"]] > 0, 0.5, 0.0)
+        budget = np.maximum(np.minimum(budget, 10.0), 0.0)
+
+        # Confidence
+        confidence = np.full(n, 0.5)
+        confidence += np.where(word_counts > 200, 0.2, np.where(word_counts < 100, -0.2, 0.0))
+        confidence += np.where(in_range, 0.2, np.where((amount > 10.0) | (amount < 0.01), -0.1, 0.0))
+        confidence += np.minimum(counts[:, group["confidence"]] * 0.05, 0.1)
+        confidence = np.maximum(np.minimum(confidence, 1.0), 0.0)
+
+        # Overall, summed in the same order as _calculate_overall_score
+        overall = impact * IMPACT_WEIGHT + feasibility * FEASIBILITY_WEIGHT + clarity * CLARITY_WEIGHT + budget * BUDGET_WEIGHT
+        if sentiments is not None:
+            overall += np.fromiter((SENTIMENT_ADJUSTMENT.get(s, 0.0) for s in sentiments), dtype=np.float64, count=n)
+        overall = np.maximum(np.minimum(overall, 10.0), 0.0)
+
+        return BatchScores(impact, feasibility, clarity, budget, confidence, overall)
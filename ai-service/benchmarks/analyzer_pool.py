@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Throughput of full analyses on the analyzer pool as its size grows.
+
+Submits the same synthetic proposals to a pool of each size and reports
+analyses per second against one thread analyzing inline. Every run uses
+a fresh memo, so nothing is served from cache. Pooled analyzers run
+their stages inline, and the inline baseline does too (no stage
+executor), so the scaling reflects the pool alone: it only goes up as far
+as the libraries release the GIL.
+
+    python benchmarks/analyzer_pool.py --sizes 1 2 4 8 --count 400
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.vector_scoring import make_requests  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.ai_analyzer import AIAnalyzer  # noqa: E402
+from app.services.analyzer_pool import AnalyzerPool  # noqa: E402
+from app.services.memo import LRUMemo  # noqa: E402
+
+
+async def run_pool(pool, requests):
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.run("analyze_record", request) for request in requests))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--count", type=int, default=400, help="proposals analyzed per run")
+    parser.add_argument("--words", type=int, default=60, help="median description length in words")
+    args = parser.parse_args()
+
+    settings.ANALYSIS_STAGE_WORKERS = 0
+    analyzer = AIAnalyzer()
+    analyzer.warm_up()
+    requests = make_requests(args.count, args.words)
+
+    analyzer.memo = LRUMemo(settings.ANALYSIS_MEMO_SIZE)
+    start = time.perf_counter()
+    for request in requests:
+        analyzer.analyze_record(request)
+    inline = args.count / (time.perf_counter() - start)
+    print(f"{'threads':>8} {'analyses/s':>11} {'speedup':>8} {'mean wait ms':>13}")
+    print(f"{'inline':>8} {inline:>11.1f} {1.0:>7.2f}x {'-':>13}")
+
+    for size in args.sizes:
+        analyzer.memo = LRUMemo(settings.ANALYSIS_MEMO_SIZE)
+        pool = AnalyzerPool(analyzer, size, health_interval=float("inf"))
+        # Build every instance before timing
+        asyncio.run(run_pool(pool, make_requests(size * 4, args.words, seed=2)))
+        analyzer.memo.clear()
+        pool.wait = type(pool.wait)(pool.wait.buckets_ms)
+        elapsed = asyncio.run(run_pool(pool, requests))
+        rate = args.count / elapsed
+        print(f"{size:>8} {rate:>11.1f} {rate / inline:>7.2f}x {pool.stats()['wait']['mean_ms']:>13.2f}")
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
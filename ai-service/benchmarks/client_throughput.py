@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Loopback throughput benchmark for the valenor_client SDK.
+
+Starts the service on 127.0.0.1 in a background thread and compares a fresh
+connection per call against the pooled client, with and without batching
+and caching.
+
+    python benchmarks/client_throughput.py --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from valenor_client import AIServiceClient  # noqa: E402
+
+PROPOSAL = {
+    "title": "Community garden and nutrition workshops",
+    "description": (
+        "This proposal aims to create a community garden that will provide fresh produce to local "
+        "residents while offering educational workshops. The plan includes a timeline, budget and "
+        "measurable outcomes for the neighborhood."
+    ),
+    "amount": 1.5,
+    "category": "community",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> uvicorn.Server:
+    """Run main:app on a loopback port in a daemon thread."""
+    config = uvicorn.Config("main:app", host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _proposal(i: int, unique: bool) -> dict:
+    if not unique:
+        return PROPOSAL
+    return {**PROPOSAL, "title": f"{PROPOSAL['title']} #{i}"}
+
+
+async def _drive(call, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def run(base_url: str, total: int, concurrency: int) -> None:
+    results = []
+
+    async def fresh_connection(i: int):
+        async with httpx.AsyncClient(base_url=base_url) as http:
+            response = await http.post("/analyze/", json=_proposal(i, True))
+            response.raise_for_status()
+
+    results.append(("fresh connection per call", await _drive(fresh_connection, total, concurrency)))
+
+    async with AIServiceClient(base_url, batching=False, cache_size=0) as client:
+        rate = await _drive(lambda i: client.analyze(_proposal(i, True)), total, concurrency)
+        results.append(("pooled", rate))
+
+    async with AIServiceClient(base_url, batching=True, cache_size=0) as client:
+        rate = await _drive(lambda i: client.analyze(_proposal(i, True)), total, concurrency)
+        results.append(("pooled + batching", rate))
+        batching = client.stats()["batching"]
+
+    async with AIServiceClient(base_url, batching=True) as client:
+        rate = await _drive(lambda i: client.analyze(_proposal(i % 10, True)), total, concurrency)
+        results.append(("pooled + batching + cache (10 distinct)", rate))
+        cache = client.stats()["cache"]
+
+    print(f"{'scenario':<42}{'req/s':>10}")
+    print("-" * 52)
+    for name, rate in results:
+        print(f"{name:<42}{rate:>10.1f}")
+    print(f"\nbatches sent: {batching['batches_sent']} for {batching['items_sent']} items")
+    print(f"cache hit rate: {cache['hit_rate']:.2%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--url", help="Benchmark an already running service instead of starting one")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = _free_port()
+        server = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        asyncio.run(run(base_url, args.requests, args.concurrency))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
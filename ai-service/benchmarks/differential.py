@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Differential harness: optimized scoring paths against frozen reference oracles.
+
+The oracles in ``reference/`` are unmodified copies of the original
+``main.analyze_proposal`` keyword scorer and ``AIAnalyzer``. Every case
+family below is scored by the oracle and by each optimized path, outputs
+are compared field by field, and the time of both sides is recorded so
+each family reports its speedup.
+
+Paths checked:
+
+    keyword   main.analyze_proposal against the reference keyword scorer
+    analyze   AIAnalyzer.analyze_proposal (stage graph, cold memo)
+    detect    the same with language unset, so detection picks the pack
+    memo      AIAnalyzer.analyze_proposal answered from a warm memo
+    fields    AIAnalyzer.analyze_record with a field projection
+    batch     AIAnalyzer.score_batch (vectorized scorer) with sentiment
+
+Case families:
+
+    random     random vocabulary, lengths, amounts and categories
+    unicode    accents, full-width and compatibility forms, zero-width
+               and non-breaking spaces, dotted capitals, emoji
+    overlap    keywords nested in each other and in longer words
+               (health/healthcare, plan/planet, food/food bank)
+    length     word counts and character lengths on every threshold
+    amount     amounts on and either side of every band edge
+
+Proposals pin language="en": the reference analyzer only knows English.
+Every family is English prose, so the detect path scores the same
+proposals unpinned, as the API receives them, and any proposal that
+detection routes to another language's pack shows up as a mismatch.
+
+    python benchmarks/differential.py --cases 200 --seed 7
+    python benchmarks/differential.py --json differential.json
+
+Exits with status 1 when any output differs.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import AnalysisRequest  # noqa: E402
+
+# Response fields the oracle defines; processing_time is excluded
+COMPARED_FIELDS = (
+    "score",
+    "sentiment",
+    "impact_score",
+    "feasibility_score",
+    "clarity_score",
+    "budget_appropriateness",
+    "summary",
+    "recommendations",
+    "risk_factors",
+    "strengths",
+    "confidence",
+)
+
+NUMERIC_FIELDS = ("score", "impact_score", "feasibility_score", "clarity_score", "budget_appropriateness", "confidence")
+
+PROJECTED_FIELDS = ("score", "sentiment", "risk_factors", "strengths")
+
+CATEGORIES = (None, "education", "healthcare", "environment", "community", "technology", "other")
+
+VOCABULARY = (
+    "education learning students school knowledge skills health medical wellness treatment care patients "
+    "environment sustainability green climate conservation renewable community local residents "
+    "neighborhood social together technology digital innovation tech software hardware benefit help "
+    "support improve enhance create establish provide offer enable empower transform positive change "
+    "regional widespread many multiple plan timeline schedule steps process methodology resources team "
+    "partners budget cost funding uncertain risky challenging difficult complex unproven experimental "
+    "pilot test trial objective goal purpose target outcome result method approach strategy "
+    "implementation deliverable specific detailed concrete measurable quantifiable deadline milestone "
+    "metric kpi expense price financial large small comprehensive basic extensive limited novel bad "
+    "terrible awful great excellent good hate love the a of and to in with for on"
+).split()
+
+UNICODE_WORDS = (
+    "éducation", "Éducation", "naïve", "ｅｄｕｃａｔｉｏｎ", "ﬁnancial", "ﬂexible", "health​care",
+    "com­munity", "time line", "plan timeline", "İstanbul", "KELVINK", "straße",
+    "ΣΟΦΙΑ", "café", "🌱", "👩‍🏫", "‮elbarusaem", "ｂｕｄｇｅｔ", "ℌealth", "①", "Ⅻ",
+)
+
+OVERLAP_WORDS = (
+    "health", "healthcare", "care", "careful", "mental health", "plan", "planet", "planning", "explanation",
+    "food", "food bank", "seafood", "green", "greenhouse", "evergreen", "test", "testimony", "protest",
+    "pilot", "autopilot", "novel", "novelty", "unproven", "proven", "budgetary", "costume", "cost",
+    "benefits", "community benefit", "schedule", "timelines", "outcome", "outcomes", "measurable",
+    "immeasurable", "clean energy", "energy", "tech", "technology", "biotech", "school", "preschool",
+)
+
+# Word counts around the clarity, confidence and risk thresholds (100, 150, 200)
+WORD_COUNTS = (8, 99, 100, 101, 149, 150, 151, 199, 200, 201, 260)
+
+# Amounts on and around each band edge (0.01, 0.1, 5, 10) and the request limits
+AMOUNTS = (
+    1e-6, 0.0099, 0.01, 0.0101, 0.099, 0.1, 0.1001, 1.0, 4.99, 5.0, 5.01, 9.99, 10.0, 10.01, 999.0, 1000.0
+)
+
+
+def _request(title: str, description: str, amount: float, category: Optional[str]) -> AnalysisRequest:
+    return AnalysisRequest(title=title, description=description, amount=amount, category=category, language="en")
+
+
+def _text(rng: random.Random, words: Sequence[str], count: int) -> str:
+    return " ".join(rng.choice(words) for _ in range(count))
+
+
+def _fit(description: str, filler: str = " plan budget timeline") -> str:
+    """Pad to the 50-character minimum and cut to the 2000-character maximum."""
+    while len(description.strip()) < 50:
+        description += filler
+    return description[:2000].strip()
+
+
+def _title(rng: random.Random, words: Sequence[str]) -> str:
+    title = _text(rng, words, rng.randint(2, 8))[:100].strip()
+    return title if len(title) >= 10 else (title + " proposal title")[:100]
+
+
+def generate_cases(count: int, seed: int = 1) -> Dict[str, List[AnalysisRequest]]:
+    """``count`` proposals per family, reproducible from ``seed``."""
+    rng = random.Random(seed)
+    cases: Dict[str, List[AnalysisRequest]] = {family: [] for family in ("random", "unicode", "overlap", "length", "amount")}
+
+    for _ in range(count):
+        cases["random"].append(_request(
+            _title(rng, VOCABULARY),
+            _fit(_text(rng, VOCABULARY, rng.randint(5, 280))),
+            rng.choice(AMOUNTS + (0.5, 2.0, 50.0)),
+            rng.choice(CATEGORIES),
+        ))
+
+        mixed = VOCABULARY + list(UNICODE_WORDS) * 4
+        cases["unicode"].append(_request(
+            _title(rng, mixed),
+            _fit(_text(rng, mixed, rng.randint(10, 220)), " ｐｌａｎ  café "),
+            rng.choice(AMOUNTS),
+            rng.choice(CATEGORIES),
+        ))
+
+        overlapping = [rng.choice(OVERLAP_WORDS) for _ in range(rng.randint(10, 200))]
+        if rng.random() < 0.5:
+            # Glue neighbours together so keywords only occur inside longer tokens
+            overlapping = ["".join(overlapping[i:i + 2]) for i in range(0, len(overlapping), 2)]
+        cases["overlap"].append(_request(
+            _title(rng, OVERLAP_WORDS),
+            _fit(" ".join(overlapping)),
+            rng.choice(AMOUNTS),
+            rng.choice(CATEGORIES),
+        ))
+
+        title = _title(rng, VOCABULARY)
+        if rng.random() < 0.2:
+            # Exactly the minimum or maximum description length, in characters
+            description = _text(rng, VOCABULARY, 400)[:rng.choice((50, 2000))]
+            description = description[:-1] + "x"
+        else:
+            # The oracle counts words of "title. description"
+            description = _fit(_text(rng, VOCABULARY, max(rng.choice(WORD_COUNTS) - len(title.split()), 1)))
+        cases["length"].append(_request(title, description, rng.choice(AMOUNTS), rng.choice(CATEGORIES)))
+
+        cases["amount"].append(_request(
+            _title(rng, VOCABULARY),
+            _fit(_text(rng, VOCABULARY, rng.randint(20, 120))),
+            rng.choice(AMOUNTS),
+            rng.choice(CATEGORIES),
+        ))
+    return cases
+
+
+def _response_dict(response: Any) -> Dict[str, Any]:
+    data = response.model_dump(mode="json")
+    return {field: data[field] for field in COMPARED_FIELDS}
+
+
+def _timed(function: Callable[[], Any], repeat: int = 1, before: Optional[Callable[[], None]] = None):
+    """Result of ``function`` and its best time over ``repeat`` runs; ``before`` runs untimed each time."""
+    best = float("inf")
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        value = function()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def _row(family: str, path: str, cases: int, mismatches: List[Dict[str, Any]],
+         reference_s: float, optimized_s: float) -> Dict[str, Any]:
+    return {
+        "family": family,
+        "path": path,
+        "cases": cases,
+        "mismatches": len(mismatches),
+        "first_mismatch": mismatches[0] if mismatches else None,
+        "reference_ms": round(reference_s * 1000, 3),
+        "optimized_ms": round(optimized_s * 1000, 3),
+        "speedup": round(reference_s / optimized_s, 2) if optimized_s else None,
+    }
+
+
+def _diff(index: int, expected: Dict[str, Any], actual: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    fields = [field for field in expected if expected[field] != actual.get(field)]
+    if not fields:
+        return None
+    return {"case": index, "fields": {field: {"reference": expected[field], "optimized": actual.get(field)} for field in fields}}
+
+
+def run(cases: Dict[str, List[AnalysisRequest]], repeat: int = 1, reference_analyzer=None,
+        analyzer=None) -> List[Dict[str, Any]]:
+    """Score every case with both sides of every path; one report row per family and path."""
+    import main
+    from reference import keyword_scoring
+    from reference.ai_analyzer import AIAnalyzer as ReferenceAnalyzer
+
+    if reference_analyzer is None:
+        reference_analyzer = ReferenceAnalyzer()
+    if analyzer is None:
+        from app.services.ai_analyzer import AIAnalyzer
+
+        analyzer = AIAnalyzer()
+    cold = analyzer.memo.clear
+
+    rows = []
+    for family, requests in cases.items():
+        texts = [f"{request.title}. {request.description}" for request in requests]
+        expected_keywords, reference_s = _timed(lambda: [keyword_scoring.analyze_proposal(t) for t in texts], repeat)
+        actual_keywords, optimized_s = _timed(lambda: [main.analyze_proposal(t) for t in texts], repeat)
+        mismatches = [d for i, (e, a) in enumerate(zip(expected_keywords, actual_keywords)) if (d := _diff(i, e, a))]
+        rows.append(_row(family, "keyword", len(texts), mismatches, reference_s, optimized_s))
+
+        references, reference_s = _timed(lambda: [reference_analyzer.analyze_proposal(r) for r in requests], repeat)
+        expected = [_response_dict(response) for response in references]
+
+        responses, optimized_s = _timed(lambda: [analyzer.analyze_proposal(r) for r in requests], repeat, cold)
+        mismatches = [d for i, (e, a) in enumerate(zip(expected, responses)) if (d := _diff(i, e, _response_dict(a)))]
+        rows.append(_row(family, "analyze", len(requests), mismatches, reference_s, optimized_s))
+
+        unpinned = [request.model_copy(update={"language": None}) for request in requests]
+        responses, optimized_s = _timed(lambda: [analyzer.analyze_proposal(r) for r in unpinned], repeat, cold)
+        mismatches = [d for i, (e, a) in enumerate(zip(expected, responses)) if (d := _diff(i, e, _response_dict(a)))]
+        rows.append(_row(family, "detect", len(requests), mismatches, reference_s, optimized_s))
+
+        responses, optimized_s = _timed(lambda: [analyzer.analyze_proposal(r) for r in requests], repeat)
+        mismatches = [d for i, (e, a) in enumerate(zip(expected, responses)) if (d := _diff(i, e, _response_dict(a)))]
+        rows.append(_row(family, "memo", len(requests), mismatches, reference_s, optimized_s))
+
+        records, optimized_s = _timed(lambda: [analyzer.analyze_record(r, fields=PROJECTED_FIELDS) for r in requests], repeat, cold)
+        mismatches = [
+            d for i, (e, record) in enumerate(zip(expected, records))
+            if (d := _diff(i, {f: e[f] for f in PROJECTED_FIELDS}, record.to_dict(PROJECTED_FIELDS)))
+        ]
+        rows.append(_row(family, "fields", len(requests), mismatches, reference_s, optimized_s))
+
+        batch, optimized_s = _timed(lambda: analyzer.score_batch(requests, memoize=False).rounded(), repeat, cold)
+        mismatches = [
+            d for i, e in enumerate(expected)
+            if (d := _diff(i, {f: e[f] for f in NUMERIC_FIELDS}, {f: batch[f][i] for f in NUMERIC_FIELDS}))
+        ]
+        rows.append(_row(family, "batch", len(requests), mismatches, reference_s, optimized_s))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", type=int, default=100, help="proposals per family")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per path; the best is reported")
+    parser.add_argument("--json", help="write the report rows to this file")
+    args = parser.parse_args()
+
+    rows = run(generate_cases(args.cases, args.seed), args.repeat)
+
+    print(f"{'family':<9} {'path':<8} {'cases':>6} {'diffs':>6} {'ref ms':>10} {'opt ms':>10} {'speedup':>8}")
+    for row in rows:
+        print(
+            f"{row['family']:<9} {row['path']:<8} {row['cases']:>6} {row['mismatches']:>6} "
+            f"{row['reference_ms']:>10.1f} {row['optimized_ms']:>10.1f} {row['speedup'] or 0:>7.1f}x"
+        )
+    for row in rows:
+        if row["first_mismatch"]:
+            print(f"\n{row['family']}/{row['path']} case {row['first_mismatch']['case']}:")
+            print(json.dumps(row["first_mismatch"]["fields"], indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    sys.exit(1 if any(row["mismatches"] for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the AI service with a concurrency sweep and SLO report.
+
+Drives the app from main.py either in-process through ASGI (no sockets, the
+default), through a uvicorn server started on a loopback port, or against an
+already running service. For each concurrency level, closed-loop workers
+issue requests drawn from a weighted payload mix for a fixed duration; the
+report is a throughput/latency curve plus a pass/fail verdict per level
+against the configured SLOs. The in-process and uvicorn targets share the
+interpreter with the load generator; for absolute capacity numbers start
+the service separately and use --url.
+
+Payload mix entries:
+
+    short     POST /analyze/ with a ~60 word description
+    long      POST /analyze/ with a ~300 word description
+    batch     POST /analyze/batch with 10 short and long proposals
+    keyword   POST /analyze_proposal (standalone keyword scorer)
+
+    python benchmarks/load_test.py --concurrency 1,4,16,64 --duration 5 \\
+        --mix short=0.6,long=0.2,batch=0.1,keyword=0.1 --slo-p99-ms 250
+    python benchmarks/load_test.py --target uvicorn --json curve.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000
+
+Exits with status 1 when no concurrency level meets every SLO.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VOCABULARY = (
+    "community garden local residents education students health care climate technology digital "
+    "benefit help support improve create provide enable plan timeline steps resources team partners "
+    "budget cost funding objective goal outcome method strategy specific measurable milestone metric "
+    "workshop families volunteers library clinic school park market the a of and to in with for"
+).split()
+
+SCENARIOS = ("short", "long", "batch", "keyword")
+
+
+class PayloadFactory:
+    """Builds request payloads; unique titles defeat the analysis memo unless repeating."""
+
+    def __init__(self, seed: int = 1, repeat: bool = False):
+        self.rng = random.Random(seed)
+        self.repeat = repeat
+        self.counter = 0
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.rng.choice(VOCABULARY) for _ in range(count))
+
+    def proposal(self, words: int) -> dict:
+        self.counter += 1
+        suffix = "" if self.repeat else f" #{self.counter}"
+        return {
+            "title": f"Community proposal {self._words(2)}{suffix}"[:100],
+            "description": self._words(words)[:2000],
+            "amount": self.rng.choice([0.5, 1.0, 2.5, 7.5, 12.0]),
+            "category": self.rng.choice(["education", "healthcare", "environment", "community", "technology"]),
+        }
+
+    def request(self, scenario: str) -> Tuple[str, dict]:
+        if scenario == "short":
+            return "/analyze/", self.proposal(60)
+        if scenario == "long":
+            return "/analyze/", self.proposal(300)
+        if scenario == "batch":
+            return "/analyze/batch", {"proposals": [self.proposal(60 if i % 2 else 300) for i in range(10)]}
+        if scenario == "keyword":
+            return "/analyze_proposal", {"text": self._words(80)}
+        raise ValueError(f"Unknown scenario '{scenario}'")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario '{name}', expected one of {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1.0)
+    if not mix or sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_level(http: httpx.AsyncClient, concurrency: int, duration: float,
+                    mix: Dict[str, float], payloads: PayloadFactory) -> dict:
+    """Run closed-loop workers at one concurrency level and summarize latencies."""
+    names, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = dict.fromkeys(names, 0)
+    stop_at = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < stop_at:
+            scenario = payloads.rng.choices(names, weights)[0]
+            path, body = payloads.request(scenario)
+            start = time.perf_counter()
+            try:
+                response = await http.post(path, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[scenario].append(time.perf_counter() - start)
+            if failed:
+                errors[scenario] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    every = sorted(value for values in latencies.values() for value in values)
+    total = len(every)
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(every, 50) * 1000,
+        "p90_ms": percentile(every, 90) * 1000,
+        "p99_ms": percentile(every, 99) * 1000,
+        "max_ms": (every[-1] if every else 0.0) * 1000,
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "scenarios": {
+            name: {
+                "requests": len(values),
+                "p50_ms": percentile(sorted(values), 50) * 1000,
+                "p99_ms": percentile(sorted(values), 99) * 1000,
+                "errors": errors[name],
+            }
+            for name, values in latencies.items() if values
+        },
+    }
+
+
+def check_slos(level: dict, args: argparse.Namespace) -> List[str]:
+    """Return the SLOs a level violates."""
+    violations = []
+    if args.slo_p50_ms is not None and level["p50_ms"] > args.slo_p50_ms:
+        violations.append(f"p50 {level['p50_ms']:.1f}ms > {args.slo_p50_ms}ms")
+    if args.slo_p99_ms is not None and level["p99_ms"] > args.slo_p99_ms:
+        violations.append(f"p99 {level['p99_ms']:.1f}ms > {args.slo_p99_ms}ms")
+    if level["error_rate"] > args.slo_error_rate:
+        violations.append(f"errors {level['error_rate']:.2%} > {args.slo_error_rate:.2%}")
+    if args.slo_min_rps is not None and level["rps"] < args.slo_min_rps:
+        violations.append(f"rps {level['rps']:.1f} < {args.slo_min_rps}")
+    return violations
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int):
+    """Run main:app on a loopback port in a daemon thread."""
+    import uvicorn
+
+    config = uvicorn.Config("main:app", host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def make_client(args: argparse.Namespace, base_url: Optional[str]) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    timeout = httpx.Timeout(args.timeout)
+    if base_url is not None:
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout)
+
+    from main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout)
+
+
+async def sweep(args: argparse.Namespace, base_url: Optional[str]) -> List[dict]:
+    payloads = PayloadFactory(seed=args.seed, repeat=args.repeat_texts)
+    levels = []
+    async with make_client(args, base_url) as http:
+        # Warm up every scenario so model loading is not counted
+        for scenario in args.mix:
+            path, body = payloads.request(scenario)
+            (await http.post(path, json=body)).raise_for_status()
+
+        for concurrency in args.concurrency:
+            level = await run_level(http, concurrency, args.duration, args.mix, payloads)
+            level["violations"] = check_slos(level, args)
+            levels.append(level)
+            print_level(level)
+    return levels
+
+
+def print_header() -> None:
+    print(f"{'conc':>5} {'reqs':>7} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'err':>6}  SLO")
+    print("-" * 80)
+
+
+def print_level(level: dict) -> None:
+    verdict = "PASS" if not level["violations"] else "FAIL: " + "; ".join(level["violations"])
+    print(
+        f"{level['concurrency']:>5} {level['requests']:>7} {level['rps']:>9.1f} {level['p50_ms']:>8.1f} "
+        f"{level['p90_ms']:>8.1f} {level['p99_ms']:>8.1f} {level['max_ms']:>8.1f} {level['error_rate']:>6.1%}  {verdict}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi",
+                        help="drive the app in-process or through a local uvicorn server")
+    parser.add_argument("--url", help="test an already running service instead")
+    parser.add_argument("--concurrency", type=lambda text: [int(n) for n in text.split(",")], default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("short=0.6,long=0.2,batch=0.1,keyword=0.1"))
+    parser.add_argument("--repeat-texts", action="store_true", help="reuse proposal texts so the memo can hit")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--slo-p50-ms", type=float)
+    parser.add_argument("--slo-p99-ms", type=float, default=250.0)
+    parser.add_argument("--slo-error-rate", type=float, default=0.01)
+    parser.add_argument("--slo-min-rps", type=float)
+    parser.add_argument("--json", help="write the curve and verdicts to this file")
+    parser.add_argument("--app-log-level", default="WARNING", help="log level of the in-process app")
+    args = parser.parse_args()
+
+    # Keep the app's request logs out of the report
+    os.environ.setdefault("LOG_LEVEL", args.app_log_level)
+
+    server = None
+    base_url = args.url
+    if base_url is None and args.target == "uvicorn":
+        port = _free_port()
+        server = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    print(f"target: {base_url or 'in-process ASGI'}, mix: {args.mix}, {args.duration}s per level\n")
+    print_header()
+    try:
+        levels = asyncio.run(sweep(args, base_url))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    passing = [level for level in levels if not level["violations"]]
+    best = max(passing, key=lambda level: level["rps"]) if passing else None
+    print()
+    if best is not None:
+        print(f"SLO PASS: best passing level is concurrency {best['concurrency']} at {best['rps']:.1f} req/s "
+              f"(p99 {best['p99_ms']:.1f}ms)")
+    else:
+        print("SLO FAIL: no concurrency level met every SLO")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mix": args.mix, "duration": args.duration, "levels": levels,
+                       "best": best and best["concurrency"]}, f, indent=2)
+
+    sys.exit(0 if best is not None else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Overhead of request-path logging, synchronous vs queued.
+
+Logs through the application's structlog pipeline into a sink that sleeps
+on every write, standing in for stdout piped to a slow log collector, and
+reports the caller-side cost per log call for:
+
+    info        a plain info event
+    hot info    an info event marked hot=True (sampled 1 in LOG_HOT_SAMPLE_EVERY)
+    debug       an event filtered out by level (never formatted)
+
+    python benchmarks/logging_overhead.py --calls 20000 --write-latency-us 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import logging as app_logging  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+
+class SlowStream:
+    """File-like sink whose writes block, releasing the GIL like a full pipe."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        time.sleep(self.latency)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def measure(log, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        log(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(mode, calls, latency):
+    settings.LOG_ASYNC = mode == "queued"
+    settings.LOG_LEVEL = "INFO"
+    sink = SlowStream(latency)
+    stdout, sys.stdout = sys.stdout, sink
+    try:
+        app_logging.setup_logging()
+        logger = app_logging.get_logger("benchmark")
+        rows = [
+            ("info", measure(lambda i: logger.info("Analysis completed in %ss with score %s", 0.004, i), calls)),
+            ("hot info", measure(lambda i: logger.info("Analyzing proposal: %s...", i, hot=True), calls)),
+            ("debug", measure(lambda i: logger.debug("Batch item %d/%d completed", i, calls), calls)),
+        ]
+        stats = app_logging.log_stats()
+        app_logging.shutdown_logging()
+    finally:
+        sys.stdout = stdout
+    return rows, stats, sink.writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--write-latency-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'event':<10} {'us/call':>9} {'calls/s':>12}")
+    for mode in ("sync", "queued"):
+        rows, stats, writes = run(mode, args.calls, args.write_latency_us / 1e6)
+        for name, micros in rows:
+            print(f"{mode:<8} {name:<10} {micros:>9.2f} {1e6 / micros:>12,.0f}")
+        print(f"{mode:<8} written {writes}, dropped {stats['dropped']}, sampled out {stats['sampled_out']}")
+
+
+if __name__ == "__main__":
+    main()
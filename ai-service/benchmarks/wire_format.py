@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Size and encode-time benchmark of the batch response wire formats.
+
+Analyzes synthetic proposals once, then encodes batches of them as the
+JSON the API sends by default, as row-wise MessagePack (the same objects
+in MessagePack), and as the columnar MessagePack of ``app.core.wire``.
+Each is also measured gzip- and zstd-compressed at the levels the
+compression middleware uses. Times are the best of ``--repeat`` runs
+and include building the payload from the response models.
+
+    python benchmarks/wire_format.py --sizes 10 100 1000 --repeat 5
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import zstandard
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.vector_scoring import make_requests  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.wire import columnar, from_columnar, packb  # noqa: E402
+from app.models.schemas import BatchAnalysisResponse  # noqa: E402
+from app.services.ai_analyzer import AIAnalyzer  # noqa: E402
+
+
+def encode_json(batch):
+    return json.dumps(batch.model_dump(mode="json")).encode("utf-8")
+
+
+def encode_rows(batch):
+    return packb(batch.model_dump(mode="json"))
+
+
+def encode_columns(batch):
+    return packb({
+        "results": columnar(batch.results),
+        "total_processed": batch.total_processed,
+        "processing_time": batch.processing_time
+    })
+
+
+FORMATS = (("json", encode_json), ("msgpack rows", encode_rows), ("msgpack columns", encode_columns))
+
+CODINGS = (
+    ("identity", lambda body: body),
+    ("gzip", lambda body: gzip.compress(body, settings.COMPRESSION_GZIP_LEVEL)),
+    ("zstd", zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress),
+)
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--words", type=int, default=60, help="median description length in words")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    analyzer = AIAnalyzer()
+    requests = make_requests(max(args.sizes), args.words)
+    results = [analyzer.analyze_proposal(request) for request in requests]
+
+    print(f"{'results':>8} {'format':<16} {'coding':<9} {'bytes':>10} {'vs json':>8} {'encode ms':>10} {'total ms':>9}")
+    for size in args.sizes:
+        batch = BatchAnalysisResponse(results=results[:size], total_processed=size, processing_time=0.0)
+        json_bytes = None
+        for name, encode in FORMATS:
+            encode_ms, body = best_of(args.repeat, encode, batch)
+            if name == "msgpack columns":
+                assert from_columnar(columnar(batch.results)) == batch.model_dump(mode="json")["results"]
+            for coding, compress in CODINGS:
+                compress_ms, sent = best_of(args.repeat, compress, body)
+                json_bytes = json_bytes or len(sent)
+                print(
+                    f"{size:>8} {name:<16} {coding:<9} {len(sent):>10,} {len(sent) / json_bytes:>7.1%} "
+                    f"{encode_ms:>10.2f} {encode_ms + compress_ms:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
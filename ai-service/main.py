@@ -1,15 +1,62 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from pydantic import BaseModel
-from typing import Literal
+from typing import Literal, Optional
 import re
 import uvicorn
 
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.http_cache import StaticJSON
+from app.core.logging import setup_logging, shutdown_logging
+
+# Configure logging before the routers import and log anything
+setup_logging()
+
+from app.api.routes import admin, analysis, jobs  # noqa: E402
+
 app = FastAPI(
     title="Valenor AI Service",
     description="AI-powered proposal analysis service for Valenor DAO",
     version="1.0.0"
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL
+    )
+
+app.include_router(analysis.router, prefix="/analyze", tags=["analysis"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
+@app.on_event("startup")
+async def start_background_services():
+    await jobs.job_queue.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        admin.loop_watchdog.start()
+    if settings.PROFILER_ENABLED:
+        admin.profiler.start()
+    if settings.MEMORY_MONITOR_ENABLED:
+        admin.memory_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await admin.loop_watchdog.stop()
+    admin.profiler.stop()
+    await admin.memory_monitor.stop()
+    await jobs.job_queue.stop()
+    analysis.document_ingestor.stop()
+    if analysis.shadow_runner is not None:
+        analysis.shadow_runner.stop()
+    if analysis.analyzer_pool is not None:
+        analysis.analyzer_pool.stop()
+    if analysis.proposal_index is not None:
+        analysis.proposal_index.close()
+    shutdown_logging()
+
 # Request/Response Models
 class ProposalRequest(BaseModel):
     text: str
@@ -116,17 +163,33 @@ def analyze_proposal(text: str) -> dict:
         "reasoning": reasoning
     }
 
+# Static payloads, serialized once; served with an ETag and answered with 304 when unchanged
+STATIC_CACHE_CONTROL = f"public, max-age={settings.STATIC_CACHE_MAX_AGE}"
+
+ROOT_RESPONSE = StaticJSON({
+    "message": "Valenor AI Service is running",
+    "version": "1.0.0",
+    "endpoints": {
+        "analyze_proposal": "POST /analyze_proposal",
+        "analyze": "POST /analyze/",
+        "analyze_batch": "POST /analyze/batch",
+        "submit_job": "POST /jobs/",
+        "job_status": "GET /jobs/{job_id}?wait=seconds",
+        "health": "GET /health"
+    }
+}, STATIC_CACHE_CONTROL)
+
+KEYWORDS_RESPONSE = StaticJSON({
+    "high_priority": HIGH_PRIORITY_KEYWORDS,
+    "medium_priority": MEDIUM_PRIORITY_KEYWORDS,
+    "total_high": len(HIGH_PRIORITY_KEYWORDS),
+    "total_medium": len(MEDIUM_PRIORITY_KEYWORDS)
+}, STATIC_CACHE_CONTROL)
+
 @app.get("/")
-async def root():
+async def root(if_none_match: Optional[str] = Header(None)):
     """Health check endpoint"""
-    return {
-        "message": "Valenor AI Service is running",
-        "version": "1.0.0",
-        "endpoints": {
-            "analyze_proposal": "POST /analyze_proposal",
-            "health": "GET /health"
-        }
-    }
+    return ROOT_RESPONSE.respond(if_none_match)
 
 @app.get("/health")
 async def health_check():
@@ -177,20 +240,19 @@ async def analyze_proposal_endpoint(request: ProposalRequest):
         )
 
 @app.get("/keywords")
-async def get_keywords():
+async def get_keywords(if_none_match: Optional[str] = Header(None)):
     """Get the list of keywords used for scoring (for debugging/testing)"""
-    return {
-        "high_priority": HIGH_PRIORITY_KEYWORDS,
-        "medium_priority": MEDIUM_PRIORITY_KEYWORDS,
-        "total_high": len(HIGH_PRIORITY_KEYWORDS),
-        "total_medium": len(MEDIUM_PRIORITY_KEYWORDS)
-    }
+    return KEYWORDS_RESPONSE.respond(if_none_match)
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    if settings.ENVIRONMENT == "production":
+        from app.core.server import run
+        run()
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
\ No newline at end of file
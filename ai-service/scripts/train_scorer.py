@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Train the learned pass-probability model from historical proposals.
+
+Reads JSON lines with ``title``, ``description``, ``passed`` (true when
+the proposal was approved) and optionally ``category`` and ``amount``,
+fits the hashed n-gram logistic model, prints its holdout metrics and
+writes the artifact. Point LEARNED_MODEL_PATH at it to serve
+``pass_probability``.
+
+    python scripts/train_scorer.py proposals.jsonl model.bin --epochs 5
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.learned_scorer import LinearTextModel  # noqa: E402
+
+
+def read_examples(path):
+    texts, labels, categories, amounts = [], [], [], []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                example = json.loads(line)
+                texts.append(f"{example['title']}. {example['description']}")
+                labels.append(1 if example["passed"] else 0)
+            except (ValueError, KeyError) as e:
+                raise SystemExit(f"{path}:{number}: {e}")
+            categories.append(example.get("category"))
+            amounts.append(example.get("amount"))
+    return texts, labels, categories, amounts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("examples", help="JSON lines of historical proposals and outcomes")
+    parser.add_argument("output", help="where to write the model artifact")
+    parser.add_argument("--features", type=int, default=18, help="log2 of the number of hashed features")
+    parser.add_argument("--ngrams", type=int, default=2, help="longest word n-gram")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--l2", type=float, default=1e-5)
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction kept out to measure the model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, labels, categories, amounts = read_examples(args.examples)
+    model = LinearTextModel.train(
+        texts, labels, categories, amounts,
+        n_features=2 ** args.features, max_n=args.ngrams, holdout=args.holdout, seed=args.seed,
+        epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2
+    )
+    model.save(args.output)
+    print(json.dumps(model.stats(), indent=2))
+    print(f"wrote {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the thread-local analyzer pool
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import analysis
+from app.models.schemas import AnalysisRequest
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.analyzer_pool import AnalyzerPool
+from main import app
+
+PROPOSALS = [
+    {
+        "title": f"Community garden expansion {i}",
+        "description": f"Expand garden number {i} with a clear timeline, a measurable budget and volunteer training for residents.",
+        "amount": 1.0 + i,
+        "category": "environment",
+    }
+    for i in range(6)
+]
+
+
+@pytest.fixture
+def pool():
+    pool = AnalyzerPool(analysis.ai_analyzer, size=2, health_interval=3600)
+    yield pool
+    pool.stop()
+
+
+async def analyze_all(pool, requests):
+    return await asyncio.gather(*(pool.run("analyze_record", request) for request in requests))
+
+
+def test_pool_threads_get_their_own_nlp_state_and_share_the_rest(pool):
+    requests = [AnalysisRequest(**proposal) for proposal in PROPOSALS]
+    records = asyncio.run(analyze_all(pool, requests))
+
+    primary = analysis.ai_analyzer
+    for request, record in zip(requests, records):
+        expected = primary.analyze_record(request).to_dict()
+        assert {**record.to_dict(), "processing_time": 0} == {**expected, "processing_time": 0}
+
+    instances = pool.instances()
+    assert 1 <= len(instances) <= 2
+    for instance in instances:
+        assert instance is not primary and instance.sia is not primary.sia
+        # Stages run on the pool thread, not through the primary's stage executor
+        assert instance.executor is None
+        assert instance.sia.lexicon is primary.sia.lexicon
+        assert instance.lexicons is primary.lexicons and instance.memo is primary.memo
+    stats = pool.stats()
+    assert stats["calls"] == len(requests) and stats["wait"]["samples"] == len(requests)
+    assert stats["busy"] == stats["queued"] == 0
+
+
+def test_instance_failing_its_health_check_is_rebuilt():
+    pool = AnalyzerPool(AIAnalyzer(), size=1, health_interval=0)
+    try:
+        request = AnalysisRequest(**PROPOSALS[0])
+        expected = pool.primary.analyze_record(request).sentiment
+        asyncio.run(analyze_all(pool, [request]))
+        broken, = pool.instances()
+        broken.sia = None
+
+        record, = asyncio.run(analyze_all(pool, [request]))
+        assert pool.instances()[0] is not broken
+        assert record.sentiment == expected and not record.skipped_stages
+        assert pool.stats()["replaced"] == 1
+        assert pool.check(pool.instances()[0])
+    finally:
+        pool.stop()
+
+
+def test_batch_runs_on_the_pool_when_enabled(pool, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(analysis, "analyzer_pool", None)
+    assert client.get("/analyze/pool").status_code == 404
+    inline = client.post("/analyze/batch", json={"proposals": PROPOSALS}).json()["results"]
+
+    monkeypatch.setattr(analysis, "analyzer_pool", pool)
+    pooled = client.post("/analyze/batch", json={"proposals": PROPOSALS}).json()["results"]
+    for result in inline + pooled:
+        result["processing_time"] = 0
+    assert pooled == inline
+    assert client.get("/analyze/pool").json()["calls"] == len(PROPOSALS)
+
+
+def test_jobs_and_health_check_run_on_the_pool(pool, monkeypatch):
+    monkeypatch.setattr(analysis, "analyzer_pool", pool)
+    with TestClient(app) as client:
+        job_id = client.post("/jobs/", json={"proposals": PROPOSALS[:2]}).json()["job_id"]
+        job = client.get(f"/jobs/{job_id}?wait=5").json()
+        health = client.get("/analyze/health").json()
+
+    assert job["status"] == "completed" and job["completed"] == 2
+    assert health["status"] == "healthy"
+    assert pool.stats()["calls"] == 3
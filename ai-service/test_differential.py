@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Tests for the optimized scoring paths against the frozen reference oracles
+"""
+
+from app.api.routes.analysis import ai_analyzer
+from benchmarks.differential import generate_cases, run
+
+
+def test_generated_cases_cover_every_family_and_boundary():
+    cases = generate_cases(40, seed=5)
+
+    assert {family: len(requests) for family, requests in cases.items()} == dict.fromkeys(cases, 40)
+    assert any(any(ord(char) > 0xFFFF for char in request.description) for request in cases["unicode"])
+    assert {len(request.description) for request in cases["length"]} & {50, 2000}
+    assert {request.amount for request in cases["amount"]} >= {0.01, 0.1, 5.0, 10.0}
+
+
+def test_optimized_paths_match_the_oracles():
+    rows = run(generate_cases(12, seed=11), analyzer=ai_analyzer)
+
+    assert {row["path"] for row in rows} == {"keyword", "analyze", "detect", "memo", "fields", "batch"}
+    assert [row for row in rows if row["mismatches"]] == []
+    assert all(row["speedup"] for row in rows)
+
+
+def test_unpinned_proposals_are_detected_as_english():
+    # Soft hyphens in the unicode family once split "com\u00admunity" into Portuguese "com"
+    rows = run(generate_cases(30, seed=3), analyzer=ai_analyzer)
+
+    assert [row for row in rows if row["path"] == "detect" and row["mismatches"]] == []
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for ETags and conditional requests
+"""
+
+from fastapi.testclient import TestClient
+
+from app.api.routes import analysis
+from app.core.http_cache import matches
+from app.services.shadow import ShadowRunner
+from main import app
+
+PROPOSAL = {
+    "title": "Community garden expansion",
+    "description": "Expand the community garden with a clear timeline, a measurable budget and volunteer training.",
+    "amount": 2.5,
+    "category": "environment",
+    "language": "en",
+}
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert matches('"abc"', '"abc"')
+    assert matches('W/"abc", "def"', '"abc"')
+    assert matches("*", '"abc"')
+    assert not matches("*", '"abc"', any_matches=False)
+    assert not matches('"abcd"', '"abc"')
+    assert not matches(None, '"abc"')
+
+
+def test_static_payloads_revalidate_without_a_body():
+    with TestClient(app) as client:
+        first = client.get("/keywords")
+        repeat = client.get("/keywords", headers={"If-None-Match": first.headers["ETag"]})
+        root = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert first.json()["total_high"] == len(first.json()["high_priority"])
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["ETag"] == first.headers["ETag"]
+    assert root.status_code == 200
+
+
+def test_unchanged_analysis_is_not_recomputed(monkeypatch):
+    with TestClient(app) as client:
+        first = client.post("/analyze/", json=PROPOSAL)
+        tag = first.headers["ETag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("analysis ran for a matching ETag")
+
+        monkeypatch.setattr(analysis.ai_analyzer, "analyze_proposal", fail)
+        repeat = client.post("/analyze/", json={**PROPOSAL, "deadline_ms": 500}, headers={"If-None-Match": tag})
+        monkeypatch.undo()
+
+        projected = client.post("/analyze/?fields=score", json=PROPOSAL, headers={"If-None-Match": tag})
+        changed = client.post("/analyze/", json={**PROPOSAL, "amount": 3.0}, headers={"If-None-Match": tag})
+        batch = client.post("/analyze/batch", json={"proposals": [PROPOSAL]})
+        batch_repeat = client.post("/analyze/batch", json={"proposals": [PROPOSAL]}, headers={"If-None-Match": batch.headers["ETag"]})
+        any_tag = client.post("/analyze/", json={**PROPOSAL, "amount": 4.0}, headers={"If-None-Match": "*"})
+        oversized = client.post("/analyze/batch", json={"proposals": [PROPOSAL] * 11}, headers={"If-None-Match": "*"})
+
+    assert first.headers["Cache-Control"] == "no-cache"
+    # POST is not GET or HEAD: a matching If-None-Match fails the precondition (RFC 9110)
+    assert repeat.status_code == 412 and repeat.headers["ETag"] == tag
+    assert projected.status_code == 200 and projected.headers["ETag"] != tag
+    assert changed.status_code == 200 and changed.headers["ETag"] != tag
+    assert batch_repeat.status_code == 412
+    assert any_tag.status_code == 200 and any_tag.json()["score"] > 0
+    assert oversized.status_code == 422
+
+
+def test_job_status_etag_changes_with_progress():
+    with TestClient(app) as client:
+        job_id = client.post("/jobs/", json={"proposals": [PROPOSAL]}).json()["job_id"]
+        finished = client.get(f"/jobs/{job_id}?wait=5")
+        assert finished.json()["status"] == "completed"
+        tag = finished.headers["ETag"]
+
+        unchanged = client.get(f"/jobs/{job_id}", headers={"If-None-Match": tag})
+        summary = client.get(f"/jobs/{job_id}?include_results=false", headers={"If-None-Match": tag})
+
+    assert unchanged.status_code == 304
+    assert summary.status_code == 200
+
+
+def test_failed_analysis_is_not_cached_indexed_or_shadowed(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("stage graph broke")
+
+    runner = ShadowRunner(analysis.ai_analyzer, sample_rate=1.0)
+    monkeypatch.setattr(analysis, "analyzer_pool", None)
+    monkeypatch.setattr(analysis, "shadow_runner", runner)
+    monkeypatch.setattr(analysis.ai_analyzer.stage_graph, "run", fail)
+    indexed = []
+    monkeypatch.setattr(analysis.proposal_index, "add", lambda *args: indexed.append(args))
+    failed = {**PROPOSAL, "title": "Proposal whose analysis fails"}
+
+    with TestClient(app) as client:
+        single = client.post("/analyze/", json=failed)
+        projected = client.post("/analyze/?fields=score,skipped_stages", json=failed)
+        batch = client.post("/analyze/batch", json={"proposals": [failed]})
+    stats = runner.stats()
+    runner.stop()
+
+    assert single.status_code == 200 and single.json()["skipped_stages"] == ["analysis"]
+    assert projected.json()["skipped_stages"] == ["analysis"]
+    assert batch.json()["results"][0]["skipped_stages"] == ["analysis"]
+    assert "ETag" not in single.headers and "ETag" not in projected.headers and "ETag" not in batch.headers
+    assert indexed == []
+    assert stats["sampled"] == 0 and stats["compared"] == 0
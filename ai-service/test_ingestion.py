@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming document ingestion
+"""
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.analysis import ai_analyzer, document_ingestor
+from app.services.ingestion import DocumentPipeline, TextChunker, TextNormalizer
+from main import app
+
+PARAGRAPH = (
+    "Our community garden will help local residents grow fresh food and support education for students. "
+    "The plan has a clear timeline, a measurable budget and a team with experience in similar projects. "
+)
+
+
+def _pdf(pages):
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+    ]
+    font = 3 + 2 * len(pages)
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return body
+
+
+def _ingest(document_format, data, piece=7, chunk_chars=1000):
+    pipeline = DocumentPipeline(document_format, chunk_chars, max_bytes=10 ** 6, spool_memory=64)
+    chunks = []
+    for start in range(0, len(data), piece):
+        chunks += pipeline.feed(data[start:start + piece])
+    return chunks + list(pipeline.close())
+
+
+def test_markup_is_stripped_across_piece_boundaries():
+    html = (
+        "<html><head><title>Ignored</title><style>p { color: red }</style></head>"
+        "<body><h1>Garden&nbsp;plan</h1><p>Grow\tfood</p><script>track()</script><p>for&amp;with ﬁve</p></body></html>"
+    )
+    markdown = (
+        "# Garden plan\n\nGrow **food** with [neighbours](https://example.org) ![a map](map.png)\n"
+        "```python\nprint('skipped')\n```\n- five `volunteers`\n[ref]: https://example.org\n"
+    )
+
+    assert _ingest("html", html.encode()) == ["Garden plan Grow food for&with five"]
+    assert _ingest("markdown", markdown.encode()) == ["Garden plan Grow food with neighbours a map five volunteers"]
+    # A multi-byte character split between reads decodes intact
+    assert _ingest("text", "café  ½\n\n done".encode(), piece=4) == ["café 1⁄2 done"]
+
+
+def test_normalizer_and_chunker_keep_words_whole():
+    normalizer = TextNormalizer()
+    text = "".join(normalizer.feed(piece) for piece in ["  alpha be", "ta\x00 \n", "  gam", "ma  "]) + normalizer.close()
+    chunker = TextChunker(12)
+
+    assert text == "alpha beta gamma"
+    assert chunker.feed("one two three four five six") + chunker.close() == ["one two", "three four", "five six"]
+
+
+def test_pdf_pages_are_extracted_after_spooling():
+    data = _pdf(["First page about community health", "Second page with a budget plan"])
+
+    chunks = _ingest("pdf", data, piece=64, chunk_chars=50)
+
+    assert " ".join(chunks) == "First page about community health Second page with a budget plan"
+    assert all(len(chunk) <= 50 for chunk in chunks)
+
+
+def test_document_endpoint_combines_chunk_scores():
+    html = "<html><body>" + "".join(f"<p>{PARAGRAPH}</p>" for _ in range(60)) + "</body></html>"
+    params = {"title": "Community garden expansion", "amount": 2.5, "language": "en"}
+
+    with TestClient(app) as client:
+        response = client.post("/analyze/document", params=params, content=html, headers={"Content-Type": "text/html"})
+        unsupported = client.post("/analyze/document", params=params, content=b"x", headers={"Content-Type": "image/png"})
+        empty = client.post("/analyze/document", params={**params, "format": "markdown"}, content=b"```\n```\n")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["format"] == "html"
+    assert result["chunks"] > 5
+    assert result["words"] == 60 * len(PARAGRAPH.split())
+    assert 0 <= result["score"] <= 10
+    assert "Limited project detail" not in " ".join(result["risk_factors"])
+    assert unsupported.status_code == 415
+    assert empty.status_code == 422
+
+
+def test_ingest_leaves_the_shared_memo_alone_and_stops_with_the_app():
+    html = "".join(f"<p>{PARAGRAPH} Section {i}.</p>" for i in range(20))
+    params = {"title": "Community garden chunks", "amount": 2.5, "language": "en"}
+    ai_analyzer.memo.clear()
+
+    for _ in range(2):
+        # The second run checks the ingest workers come back after a restart
+        with TestClient(app) as client:
+            response = client.post("/analyze/document", params=params, content=html, headers={"Content-Type": "text/html"})
+        assert response.status_code == 200
+        assert document_ingestor.executor is None
+
+    assert len(ai_analyzer.memo) == 0
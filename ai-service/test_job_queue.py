@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the background job queue using a stub analyzer
+"""
+
+import asyncio
+import os
+
+from app.models.schemas import AnalysisRequest, AnalysisResponse, JobStatus
+from app.services.job_queue import JobQueue, JobStore
+
+
+def _request(amount):
+    return AnalysisRequest(
+        title="Queued test proposal",
+        description="A proposal used to exercise the background job queue in tests.",
+        amount=amount
+    )
+
+
+def _stub_analyze(order):
+    def analyze(request):
+        order.append(request.amount)
+        return AnalysisResponse(
+            score=5.0, sentiment="neutral", impact_score=5.0, feasibility_score=5.0,
+            clarity_score=5.0, budget_appropriateness=5.0, summary="stub",
+            recommendations=[], risk_factors=[], strengths=[], confidence=0.5,
+            processing_time=0.0
+        )
+    return analyze
+
+
+def test_urgent_job_preempts_backfill_between_slices():
+    order = []
+
+    async def run():
+        queue = JobQueue(_stub_analyze(order), workers=1, slice_size=2)
+        backfill = await queue.submit([_request(1.0) for _ in range(6)], priority=9)
+        urgent = await queue.submit([_request(2.0)], priority=0)
+        await queue.start()
+        await queue.wait(backfill.job_id, timeout=5)
+        await queue.stop()
+        return backfill, urgent
+
+    backfill, urgent = asyncio.run(run())
+
+    assert order[0] == 2.0
+    assert urgent.status == JobStatus.COMPLETED
+    assert backfill.completed == 6
+    assert backfill.to_status().progress == 1.0
+
+
+def test_store_restores_unfinished_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    order = []
+
+    async def submit_only():
+        queue = JobQueue(_stub_analyze(order), store=JobStore(path))
+        job = await queue.submit([_request(3.0), _request(4.0)])
+        return job.job_id
+
+    async def resume(job_id):
+        queue = JobQueue(_stub_analyze(order), store=JobStore(path))
+        await queue.start()
+        job = await queue.wait(job_id, timeout=5)
+        await queue.stop()
+        return job
+
+    job_id = asyncio.run(submit_only())
+    job = asyncio.run(resume(job_id))
+
+    assert job.status == JobStatus.COMPLETED
+    assert order == [3.0, 4.0]
+    assert JobStore(path).load_all()[0].status == JobStatus.COMPLETED
+
+
+def test_finished_jobs_are_bounded():
+    async def run():
+        queue = JobQueue(_stub_analyze([]), max_retained=2)
+        await queue.start()
+        for _ in range(4):
+            # Wait on each job before the next one can push it out of retention
+            job = await queue.submit([_request(1.0)])
+            await queue.wait(job.job_id, timeout=5)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["retained_jobs"] == 2
+
+
+def test_store_drops_evicted_jobs_and_reconnects_after_fork(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+
+    async def run():
+        queue = JobQueue(_stub_analyze([]), max_retained=1, store=store)
+        await queue.start()
+        for _ in range(3):
+            job = await queue.submit([_request(1.0)])
+            await queue.wait(job.job_id, timeout=5)
+        # Waiters wake before the worker has written the job and evicted the older ones
+        for _ in range(100):
+            if len(await asyncio.to_thread(store.load_all)) == 1:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job.job_id
+
+    last = asyncio.run(run())
+    job, = store.load_all()
+    assert job.job_id == last
+
+    pid = os.fork()
+    if pid == 0:
+        # The inherited connection is the parent's; the child must open its own
+        code = 1
+        try:
+            inherited = store._conn
+            job.job_id = "forked"
+            store.write(JobStore.snapshot(job))
+            code = 0 if store._conn is not inherited else 1
+        finally:
+            os._exit(code)
+    assert os.waitpid(pid, 0)[1] == 0
+    assert {job.job_id for job in store.load_all()} == {last, "forked"}
+    store.close()
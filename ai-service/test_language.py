@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for language detection and per-language lexicon packs
+"""
+
+from app.models.schemas import AnalysisRequest
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.language import detect_language
+
+SPANISH = AnalysisRequest(
+    title="Huerto comunitario para el barrio",
+    description=(
+        "Este proyecto busca crear un huerto comunitario para los residentes del vecindario, "
+        "con un plan detallado, un cronograma y un presupuesto claro para la comunidad."
+    ),
+    amount=1.0,
+    category="community"
+)
+
+
+def test_detects_language_from_function_words():
+    assert detect_language("The plan will provide support for the residents of the town")[0] == "en"
+    assert detect_language("Nous voulons créer un jardin pour les habitants de la ville")[0] == "fr"
+    assert detect_language("kpi metric")[0] is None
+
+
+def test_non_english_proposal_uses_its_lexicon_pack():
+    analyzer = AIAnalyzer()
+
+    result = analyzer.analyze_proposal(SPANISH)
+    analyzer.analyze_proposal(SPANISH.model_copy(update={"title": "Huerto comunitario del barrio norte"}))
+
+    assert result.language == "es"
+    assert result.impact_score > 5.0
+    assert result.feasibility_score > 5.0
+    stats = analyzer.language_stats()["lexicons"]
+    assert stats["loaded"] == ["es"]
+    assert stats["loads"] == 1
+
+
+def test_article_heavy_english_is_not_taken_for_portuguese():
+    english = AnalysisRequest(
+        title="Solar panels pilot",
+        description=(
+            "A plan to install solar panels on a school roof as a pilot, a budget of 2 ETH "
+            "for a year, a team of a few volunteers and a report at the end."
+        ),
+        amount=2.0
+    )
+    analyzer = AIAnalyzer()
+
+    assert detect_language(f"{english.title}. {english.description}")[0] == "en"
+    detected = analyzer.analyze_proposal(english)
+    forced = analyzer.analyze_proposal(english.model_copy(update={"language": "en"}))
+    assert detected.language == "en"
+    assert detected.score == forced.score and detected.sentiment == forced.sentiment
+    # No clear lead: the caller falls back to the default language
+    assert detect_language("the and of o os um")[0] is None
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the learned pass-probability model
+"""
+
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import analysis
+from app.services.learned_scorer import LinearTextModel, auc
+from main import app
+
+GOOD = ["clear", "timeline", "milestones", "audited", "measurable", "budget", "team", "report"]
+BAD = ["vague", "someday", "trust", "moon", "unspecified", "huge", "maybe", "secret"]
+FILLER = ["community", "project", "funding", "proposal", "network", "build", "users", "support"]
+
+PROPOSAL = {
+    "title": "Community garden expansion",
+    "description": "Expand the community garden with a clear timeline, audited milestones and a measurable budget.",
+    "amount": 2.5,
+    "category": "environment",
+}
+
+
+def synthetic(count, seed=0):
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(count):
+        passed = rng.random() < 0.5
+        words = rng.sample(GOOD if passed else BAD, 3) + rng.sample(GOOD + BAD, 1) + rng.sample(FILLER, 6)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        labels.append(int(passed))
+    return texts, labels
+
+
+@pytest.fixture(scope="module")
+def model():
+    texts, labels = synthetic(600)
+    return LinearTextModel.train(texts, labels, n_features=2 ** 12, epochs=5)
+
+
+def test_training_learns_separable_outcomes(model):
+    assert model.metadata["holdout"]["examples"] == 120
+    assert model.metadata["holdout"]["auc"] > 0.95
+    assert model.predict("clear timeline with audited milestones") > 0.5 > model.predict("vague secret moon plan")
+    assert auc(np.array([0, 0, 1, 1]), np.array([0.1, 0.5, 0.5, 0.9])) == 0.875
+
+
+def test_saved_model_loads_memory_mapped_with_identical_predictions(model, tmp_path):
+    path = tmp_path / "model.bin"
+    model.save(str(path))
+    loaded = LinearTextModel.load(str(path))
+
+    assert isinstance(loaded.weights, np.memmap)
+    assert loaded.fingerprint == model.fingerprint
+    assert loaded.metadata["holdout"] == model.metadata["holdout"]
+    texts, _ = synthetic(20, seed=1)
+    for text in texts:
+        assert loaded.predict(text, "environment", 2.5) == pytest.approx(model.predict(text, "environment", 2.5))
+
+    with pytest.raises(ValueError):
+        LinearTextModel.load(__file__)
+
+
+def test_pass_probability_is_served_only_with_a_model(model, monkeypatch):
+    # Pooled instances copy the model when built; analyze inline so the patched one is used
+    monkeypatch.setattr(analysis, "analyzer_pool", None)
+    client = TestClient(app)
+    assert client.post("/analyze/", json=PROPOSAL).json()["pass_probability"] is None
+    assert client.get("/analyze/model").status_code == 404
+
+    monkeypatch.setattr(analysis.ai_analyzer, "learned_model", model)
+    full = client.post("/analyze/", json=PROPOSAL).json()
+    assert 0.5 < full["pass_probability"] <= 1
+    projected = client.post("/analyze/?fields=pass_probability", json=PROPOSAL).json()
+    assert projected == {"pass_probability": full["pass_probability"]}
+    assert client.get("/analyze/model").json()["fingerprint"] == model.fingerprint
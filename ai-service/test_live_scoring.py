@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for live scoring sessions over WebSocket
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.routes import analysis
+from app.services.live_scoring import EditError, LiveScoring, LiveSession
+from main import app
+
+PROPOSAL = {
+    "type": "set",
+    "title": "Community garden expansion",
+    "description": "Expand the community garden with a clear timeline, a measurable budget and volunteer training.",
+    "amount": 2.5,
+    "category": "environment",
+}
+
+
+@pytest.fixture
+def live(monkeypatch):
+    scoring = LiveScoring(analysis.ai_analyzer, max_sessions=2, idle_timeout=5, debounce=0.05, max_delay=0.5)
+    monkeypatch.setattr(analysis, "live_scoring", scoring)
+    return scoring
+
+
+def test_edits_splice_text_and_bad_messages_change_nothing():
+    session = LiveSession("s", memo_size=8)
+    session.apply({"type": "set", "title": "Garden", "amount": 2}, max_chars=50)
+    session.apply({"type": "edit", "field": "title", "start": 0, "end": 0, "text": "Community "}, max_chars=50)
+    session.apply({"type": "edit", "field": "title", "start": 16, "text": " plan"}, max_chars=50)
+
+    for message in (
+        {"type": "edit", "field": "title", "start": 3, "end": 99, "text": ""},
+        {"type": "edit", "field": "amount", "start": 0, "text": "1"},
+        {"type": "set", "owner": "me"},
+        {"type": "set", "description": "x" * 40},
+        {"type": "replace"},
+    ):
+        with pytest.raises(EditError):
+            session.apply(message, max_chars=50)
+
+    assert session.fields["title"] == "Community Garden plan"
+    assert session.fields["amount"] == 2
+    assert session.revision == 3
+    assert session.timeout(session.edited_at + 0.1, debounce=0.3, max_delay=2, idle_timeout=60) == pytest.approx(0.2)
+    session.edited_at = session.pending_since + 1.8
+    assert session.timeout(session.pending_since + 1.9, debounce=0.3, max_delay=2, idle_timeout=60) == pytest.approx(0.1)
+
+
+def test_scores_are_pushed_only_when_they_change(live):
+    with TestClient(app) as client:
+        with client.websocket_connect("/analyze/live") as ws:
+            session_id = ws.receive_json()["session"]
+            ws.send_json({**PROPOSAL, "description": "Too short"})
+            incomplete = ws.receive_json()
+            ws.send_json(PROPOSAL)
+            first = ws.receive_json()
+
+            # Typing and deleting within the debounce window scores nothing
+            end = len(PROPOSAL["description"])
+            ws.send_json({"type": "edit", "field": "description", "start": end, "text": " Soon"})
+            ws.send_json({"type": "edit", "field": "description", "start": end, "end": end + 5, "text": ""})
+            ws.send_json({"type": "edit", "field": "title", "start": 99, "text": "!"})
+            error = ws.receive_json()
+            time.sleep(0.2)
+            ws.send_json({"type": "set", "amount": 600})
+            changed = ws.receive_json()
+
+        with client.websocket_connect(f"/analyze/live?session={session_id}") as ws:
+            resumed = ws.receive_json()
+            ws.send_json({"type": "edit", "field": "description", "start": 0, "end": 6, "text": "Grow"})
+            after_resume = ws.receive_json()
+        stats = client.get("/analyze/live/stats").json()
+
+    assert incomplete["type"] == "incomplete" and incomplete["errors"][0]["field"] == "description"
+    assert first["type"] == "scores" and first["revision"] == 2
+    assert first["score"] == analysis.ai_analyzer.analyze_record(analysis.AnalysisRequest(**{
+        name: value for name, value in PROPOSAL.items() if name != "type"
+    })).score
+    assert error["type"] == "error" and error["revision"] == 4
+    assert changed["revision"] == 5 and changed["budget_appropriateness"] != first["budget_appropriateness"]
+    assert resumed == {"type": "session", "session": session_id, "revision": 5, "resumed": True}
+    assert after_resume["revision"] == 6
+    assert (stats["scored"], stats["pushed"], stats["unchanged"]) == (3, 4, 1)
+    assert (stats["sessions"], stats["connected"]) == (1, 0)
+
+
+def test_timer_firing_early_neither_drops_edits_nor_closes(live, monkeypatch):
+    # Every wait ends 10 ms before the edit is due, as a coarse clock can make it
+    monkeypatch.setattr(live, "timeout", lambda session: max(LiveScoring.timeout(live, session) - 0.01, 0.0))
+    with TestClient(app) as client:
+        with client.websocket_connect("/analyze/live") as ws:
+            ws.receive_json()
+            ws.send_json(PROPOSAL)
+            scores = ws.receive_json()
+
+    assert scores["type"] == "scores" and scores["revision"] == 1
+    session = LiveSession("s", memo_size=8)
+    session.apply(PROPOSAL, max_chars=1000)
+    session.active_at -= live.idle_timeout
+    assert not live.idle(session)
+
+
+def test_session_limit_and_idle_expiry(live):
+    # Long enough that neither session expires before the third one is turned away
+    live.idle_timeout = 1.0
+    with TestClient(app) as client:
+        with client.websocket_connect("/analyze/live") as first, client.websocket_connect("/analyze/live") as second:
+            first.receive_json()
+            second.receive_json()
+            with client.websocket_connect("/analyze/live") as third:
+                with pytest.raises(WebSocketDisconnect) as rejected:
+                    third.receive_json()
+            with pytest.raises(WebSocketDisconnect) as idle:
+                first.receive_json()
+        # The second session attached just after the first and may not have been idle long enough yet
+        time.sleep(live.idle_timeout)
+        stats = client.get("/analyze/live/stats").json()
+
+    assert rejected.value.code == 1013
+    assert idle.value.code == 1000
+    assert (stats["rejected"], stats["expired"], stats["sessions"]) == (1, 2, 0)
+
+
+class RecordingAnalyzer:
+    """Passes calls through to an analyzer, noting the language of each record."""
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.languages = []
+
+    def __getattr__(self, name):
+        return getattr(self.analyzer, name)
+
+    def analyze_record(self, *args):
+        record = self.analyzer.analyze_record(*args)
+        self.languages.append(record.language)
+        return record
+
+
+def test_detected_language_is_kept_only_once_it_settles(live):
+    live.analyzer = RecordingAnalyzer(live.analyzer)
+    live.language_chars = 100
+    session = LiveSession("s", memo_size=8)
+    english = "The plan is for garden residents in town, greenhouse beds"
+    spanish = "El proyecto es para vecinos, jardín y huerta del barrio"
+
+    def score(**fields):
+        session.apply({"type": "set", **fields}, max_chars=1000)
+        asyncio.run(live.score(session))
+        return live.analyzer.languages[-1]
+
+    # A few English function words at the start do not fix the session's language
+    assert score(title="Community garden", description=english, amount=2.5) == "en"
+    assert session.detected_language is None
+    assert score(description=spanish) == "es"
+    assert session.detected_language is None
+
+    # Past the settle length the detected language is kept while the author types on
+    assert score(description=spanish + " " + spanish) == "es"
+    assert session.detected_language == "es"
+    assert score(description=english + " " + english + " " + english) == "es"
+    assert score(language="en") == "en" and session.detected_language is None
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the queued logging pipeline
+"""
+
+import logging
+import queue
+
+import pytest
+import structlog
+
+from app.core.logging import BoundedQueueHandler, HotPathSampler
+
+
+def test_sampler_keeps_one_in_every_hot_event():
+    sampler = HotPathSampler(every=3)
+    kept = 0
+    for _ in range(9):
+        try:
+            sampler(None, "info", {"event": "Analyzing proposal: %s", "hot": True})
+            kept += 1
+        except structlog.DropEvent:
+            pass
+
+    assert kept == 3
+    assert sampler.sampled_out == 6
+    assert sampler(None, "warning", {"event": "x", "hot": True}) == {"event": "x"}
+
+
+def test_full_buffer_drops_info_without_blocking():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), block_timeout=0.01)
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, {"event": "kept"}, None, None)
+
+    handler.handle(record)
+    handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, {"event": "dropped"}, None, None))
+    handler.handle(logging.LogRecord("test", logging.ERROR, __file__, 1, {"event": "late"}, None, None))
+
+    assert handler.dropped == 2
+    # Records are queued as-is; rendering is left to the writer thread
+    assert handler.queue.get_nowait() is record
+    with pytest.raises(queue.Empty):
+        handler.queue.get_nowait()
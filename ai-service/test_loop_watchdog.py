@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-loop lag watchdog
+"""
+
+import asyncio
+import time
+
+from app.services.loop_watchdog import LagHistogram, LoopWatchdog
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+def test_watchdog_captures_the_blocking_stack():
+    async def run():
+        watchdog = LoopWatchdog(interval=0.01, threshold=0.1)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        blocking_handler()
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+        return watchdog.stats()
+
+    stats = asyncio.run(run())
+
+    assert stats["stalls"] == 1
+    offender = stats["offenders"][0]
+    assert offender["lag_ms"] >= 250
+    assert any("in blocking_handler" in frame for frame in offender["stack"])
+    assert stats["lag"]["samples"] >= 5
+
+
+def test_histogram_buckets():
+    histogram = LagHistogram(buckets_ms=(1, 10))
+    for lag in (0.5, 5, 50):
+        histogram.record(lag)
+
+    assert histogram.to_dict()["buckets"] == {"<=1ms": 1, "<=10ms": 1, ">10ms": 1}
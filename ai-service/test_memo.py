@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-stage analysis memo
+"""
+
+from app.models.schemas import AnalysisRequest
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.memo import LRUMemo
+
+
+def test_lru_memo_evicts_least_recently_used():
+    memo = LRUMemo(maxsize=2)
+    memo.get_or_compute("a", lambda: 1)
+    memo.get_or_compute("b", lambda: 2)
+    memo.get_or_compute("a", lambda: 0)
+    memo.get_or_compute("c", lambda: 3)
+
+    assert memo.get_or_compute("a", lambda: 0) == 1
+    assert memo.get_or_compute("b", lambda: 0) == 0
+    assert memo.stats()["evictions"] == 2
+
+
+def test_category_change_only_recomputes_category_term():
+    analyzer = AIAnalyzer()
+    base = dict(
+        title="Community garden project",
+        description="We will create a local community garden with a clear timeline and budget for residents.",
+        amount=1.0
+    )
+
+    first = analyzer.analyze_proposal(AnalysisRequest(category="community", **base))
+    analyzer.analyze_proposal(AnalysisRequest(category="education", **base))
+    again = analyzer.analyze_proposal(AnalysisRequest(category="community", **base))
+
+    stages = analyzer.memo_stats()["stages"]
+    assert stages["sentiment"] == {"hits": 2, "misses": 1}
+    assert stages["impact_category"] == {"hits": 1, "misses": 2}
+    assert again.model_dump(exclude={"processing_time"}) == first.model_dump(exclude={"processing_time"})
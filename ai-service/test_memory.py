@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for memory accounting and leak detection
+"""
+
+import pytest
+
+from app.services.memory import MB, MemoryGrowthMonitor, MemoryReport, TracemallocTracker, deep_sizeof
+
+
+def test_shared_objects_are_charged_once():
+    shared = [bytearray(1000) for _ in range(100)]
+    report = MemoryReport()
+    report.register("first", lambda: {"words": shared})
+    report.register("second", lambda: (shared, [1.5] * 10))
+
+    components = report.report()["components"]
+
+    assert components["first"]["bytes"] > 100 * 1000
+    assert components["second"]["bytes"] < 1000
+    assert deep_sizeof(shared)["bytes"] == pytest.approx(components["first"]["bytes"], rel=0.05)
+
+
+def test_sizing_stops_at_the_object_budget():
+    sized = deep_sizeof([[i] for i in range(1000)], max_objects=50)
+
+    assert sized["objects"] == 50
+    assert sized["truncated"]
+
+
+def test_snapshot_diff_finds_the_growing_site():
+    tracker = TracemallocTracker(frames=1, max_snapshots=2)
+    tracker.start()
+    try:
+        tracker.take("before")
+        leak = [bytearray(1024) for _ in range(2000)]
+        diff = tracker.diff("before", limit=3)
+        with pytest.raises(KeyError):
+            tracker.diff("missing")
+    finally:
+        tracker.stop()
+
+    assert len(leak) == 2000
+    assert diff["size_diff_mb"] > 1.5
+    assert "test_memory.py" in diff["top"][0]["location"]
+    assert tracker.stats()["snapshots"] == []
+
+
+def test_growth_monitor_warns_once_per_threshold_step():
+    readings = iter([100, 150, 320, 330, 530])
+    monitor = MemoryGrowthMonitor(threshold_mb=200, rss=lambda: next(readings) * MB)
+
+    assert [monitor.check() for _ in range(5)] == [False, False, True, False, True]
+    assert monitor.warnings == 2
+    assert monitor.baseline_mb == 530
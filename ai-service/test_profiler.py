@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the sampling profiler
+"""
+
+import threading
+import time
+
+from app.services.profiler import OVERFLOW_STACK, SamplingProfiler
+
+
+def _spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _busy_thread(stop: threading.Event) -> threading.Thread:
+    thread = threading.Thread(target=_spin, args=(stop,), name="busy-worker", daemon=True)
+    thread.start()
+    return thread
+
+
+def test_busy_function_appears_in_folded_stacks():
+    profiler = SamplingProfiler(interval=0.002)
+    stop = threading.Event()
+    thread = _busy_thread(stop)
+    profiler.start()
+    time.sleep(0.2)
+    profiler.stop()
+    stop.set()
+    thread.join()
+
+    lines = profiler.folded().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert "_spin (test_profiler.py:" in stack
+    assert int(count) > 0
+    assert not profiler.running
+    assert profiler.stats()["samples"] > 0
+
+
+def test_distinct_stacks_are_bounded():
+    profiler = SamplingProfiler(interval=0.002, max_stacks=1)
+    stop = threading.Event()
+    threads = [_busy_thread(stop) for _ in range(2)]
+    profiler._fold = lambda name, frame, seen=iter(range(10 ** 9)): f"stack-{next(seen)}"
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    stats = profiler.stats()
+    assert stats["distinct_stacks"] == 2
+    assert stats["overflowed"] > 0
+    assert OVERFLOW_STACK in profiler.folded()
+
+    profiler.reset()
+    assert profiler.folded() == ""
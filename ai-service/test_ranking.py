@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for top-K ranking over streamed proposals
+"""
+
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.analysis import ai_analyzer
+from app.models.schemas import AnalysisRequest
+from app.services.ranking import ProposalRanker, TopK
+from main import app
+
+WORDS = (
+    "community garden local residents education students health climate digital benefit help "
+    "support improve create plan timeline budget measurable milestone team the a of and to with"
+).split()
+
+
+def _proposals(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"Proposal number {i} for the community",
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 80))),
+            "amount": rng.choice([0.5, 2.0, 8.0, 40.0]),
+            "language": "en",
+        }
+        for i in range(count)
+    ]
+
+
+def test_top_k_keeps_best_and_breaks_ties_by_arrival():
+    heap = TopK(3)
+    for index, score in enumerate([5.0, 9.0, 7.0, 9.0, 1.0, 7.0, 8.0]):
+        heap.push(score, index, f"item-{index}")
+
+    assert [(score, index) for score, index, _ in heap.ranked()] == [(9.0, 1), (9.0, 3), (8.0, 6)]
+    assert heap.threshold == 8.0
+
+
+def test_ranker_matches_full_sort_with_bounded_heap():
+    proposals = _proposals(500)
+    lines = [json.dumps(proposal).encode() for proposal in proposals]
+    ranker = ProposalRanker(ai_analyzer, k=10)
+    for start in range(0, len(lines), 64):
+        ranker.feed(lines[start:start + 64])
+
+    scores = ai_analyzer.score_batch([AnalysisRequest(**p) for p in proposals], sentiment=False).rounded()["score"]
+    expected = sorted(range(len(proposals)), key=lambda i: (-scores[i], i))[:10]
+
+    ranked = ranker.finish()
+    assert [entry["index"] for entry in ranked] == expected
+    assert [entry["rank"] for entry in ranked] == list(range(1, 11))
+    assert len(ranker.heap) == 10
+
+
+def test_rank_endpoint_streams_ndjson_and_deep_rescores():
+    proposals = _proposals(200)
+    body = "\n".join(json.dumps(p) for p in proposals) + "\nnot json\n" + json.dumps({"title": "short"})
+
+    with TestClient(app) as client:
+        response = client.post("/analyze/rank?k=3&deep=true&candidates=6", content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["received"] == 202
+    assert result["rejected"] == 2
+    assert [error["index"] for error in result["errors"]] == [200, 201]
+    assert len(result["ranked"]) == 3
+    for entry in result["ranked"]:
+        assert entry["analysis"]["score"] == entry["score"]
+    assert [entry["score"] for entry in result["ranked"]] == sorted((e["score"] for e in result["ranked"]), reverse=True)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the search index over analyzed proposals
+"""
+
+import os
+
+from fastapi.testclient import TestClient
+
+from app.api.routes.analysis import ai_analyzer, proposal_index
+from app.core.config import settings
+from app.models.schemas import AnalysisRequest
+from app.services.search_index import IndexStore, ProposalIndex, terms
+from main import app
+
+DESCRIPTIONS = {
+    "environment": "Plant native trees along the river to restore the ecosystem, with a clear timeline and budget.",
+    "healthcare": "Open a community clinic offering vaccination and mental health support for local residents.",
+    "technology": "Build open source software that helps schools share digital learning material on a timeline.",
+}
+
+
+def _proposals():
+    return [
+        AnalysisRequest(
+            title=f"{category.title()} proposal number {i}",
+            description=description + " " + "Detailed plan follows. " * i,
+            amount=0.5 + i * 3,
+            category=category,
+            language="en",
+        )
+        for category, description in DESCRIPTIONS.items()
+        for i in range(4)
+    ]
+
+
+def _brute_force(analyzed, word, category, min_feasibility):
+    return sorted(
+        (result.score, request.title)
+        for request, result in analyzed
+        if word in terms(f"{request.title} {request.description}")
+        and (category is None or request.category.value == category)
+        and result.feasibility_score >= min_feasibility
+    )
+
+
+def test_conjunctive_queries_match_a_full_scan(tmp_path):
+    index = ProposalIndex(capacity=2)
+    analyzed = [(request, ai_analyzer.analyze_record(request)) for request in _proposals()]
+    for request, result in analyzed:
+        index.add(request, result)
+    # Re-analysis of the same text replaces the entry rather than adding one
+    index.add(*analyzed[0])
+
+    assert len(index) == len(analyzed)
+    for word, category, min_feasibility in [("timeline", None, 0), ("timeline", "environment", 5), ("plan", None, 6.5)]:
+        found = index.search([word], category, ranges={"feasibility_score": (min_feasibility, None)}, limit=100)
+        expected = _brute_force(analyzed, word, category, min_feasibility)
+        assert sorted((hit["score"], hit["title"]) for hit in found["results"]) == expected
+        assert found["total"] == len(expected)
+
+    best = index.search(["detailed", "PLAN"], limit=2)["results"]
+    assert len(best) == 2 and best[0]["score"] >= best[1]["score"]
+    assert index.search(["timeline", "vaccination"])["total"] == 0
+    assert index.search(risk="high funding")["total"] == sum(request.amount > 5 for request, _ in analyzed)
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    path = str(tmp_path / "index.db")
+    index = ProposalIndex(IndexStore(path))
+    for request in _proposals():
+        index.add(request, ai_analyzer.analyze_record(request))
+    expected = index.search(["timeline"], limit=100)["results"]
+    index.close()
+
+    reloaded = ProposalIndex(IndexStore(path))
+    try:
+        assert len(reloaded) == len(_proposals())
+        assert reloaded.search(["timeline"], limit=100)["results"] == expected
+    finally:
+        reloaded.close()
+
+
+def test_proposals_indexed_by_one_worker_are_found_by_another(tmp_path):
+    path = str(tmp_path / "index.db")
+    # Two workers, each with its own index and store over the same file
+    first, second = ProposalIndex(IndexStore(path)), ProposalIndex(IndexStore(path))
+    requests = _proposals()[:2]
+    first.add(requests[0], ai_analyzer.analyze_record(requests[0]))
+    second.add(requests[1], ai_analyzer.analyze_record(requests[1]))
+    # Closing writes out each writer's queue; a later add would open it again
+    first.store.close()
+    second.store.close()
+
+    for index in (first, second):
+        assert {hit["title"] for hit in index.search(limit=10)["results"]} == {request.title for request in requests}
+        assert len(index) == 2
+    # Rows already loaded are not loaded twice
+    assert first.refresh() == 0
+    first.close()
+    second.close()
+
+
+def test_index_evicts_the_least_recently_indexed_beyond_its_cap():
+    index = ProposalIndex(capacity=2, max_proposals=5)
+    analyzed = [(request, ai_analyzer.analyze_record(request)) for request in _proposals()]
+    for request, result in analyzed[:5]:
+        index.add(request, result)
+    # Re-indexing makes the first proposal the most recent; the second goes first
+    index.add(*analyzed[0])
+    index.add(*analyzed[5])
+
+    titles = {hit["title"] for hit in index.search(limit=100)["results"]}
+    assert len(index) == 5 and index.stats()["evicted"] == 1
+    assert analyzed[1][0].title not in titles and {analyzed[0][0].title, analyzed[5][0].title} <= titles
+    assert "terms" not in index.search(limit=1)["results"][0]
+    # The evicted proposal is gone from the postings
+    live = [analyzed[0]] + analyzed[2:6]
+    assert index.stats()["postings"] == sum(len(terms(f"{r.title} {r.description}")) for r, _ in live)
+
+
+def test_forked_worker_writes_through_its_own_connection(tmp_path):
+    path = str(tmp_path / "index.db")
+    store = IndexStore(path)
+    index = ProposalIndex(store)
+    requests = _proposals()[:2]
+    index.add(requests[0], ai_analyzer.analyze_record(requests[0]))
+
+    pid = os.fork()
+    if pid == 0:
+        # The parent's writer thread did not survive the fork
+        code = 1
+        try:
+            index.add(requests[1], ai_analyzer.analyze_record(requests[1]))
+            index.close()
+            code = 0
+        finally:
+            os._exit(code)
+    assert os.waitpid(pid, 0)[1] == 0
+    index.close()
+
+    reloaded = ProposalIndex(IndexStore(path))
+    assert {hit["title"] for hit in reloaded.search(limit=10)["results"]} == {request.title for request in requests}
+    reloaded.close()
+
+
+def test_search_endpoint_sees_new_analyses():
+    request = _proposals()[1]
+
+    with TestClient(app) as client:
+        client.post("/analyze/", json=request.model_dump(mode="json"))
+        response = client.get(
+            "/analyze/search",
+            params={"q": "river ecosystem", "category": "environment", "min": ["score:0", "feasibility_score:0"]}
+        )
+        bad_field = client.get("/analyze/search", params={"min": "popularity:3"})
+
+    assert response.status_code == 200
+    assert request.title in [hit["title"] for hit in response.json()["results"]]
+    assert bad_field.status_code == 400
+    assert len(proposal_index) >= 1
+
+
+def test_projected_analyses_are_indexed_only_when_enabled(monkeypatch):
+    request = _proposals()[2].model_copy(update={"title": "Environment proposal projected"})
+    other = _proposals()[3].model_copy(update={"title": "Environment proposal unindexed"})
+
+    with TestClient(app) as client:
+        client.post("/analyze/?fields=impact_score", json=other.model_dump(mode="json"))
+        skipped = client.get("/analyze/search", params={"q": "unindexed"})
+        monkeypatch.setattr(settings, "SEARCH_INDEX_PROJECTED", True)
+        projected = client.post("/analyze/?fields=impact_score", json=request.model_dump(mode="json"))
+        response = client.get("/analyze/search", params={"q": "projected", "category": "environment"})
+
+    assert skipped.json()["total"] == 0
+    assert list(projected.json()) == ["impact_score"]
+    hit, = response.json()["results"]
+    assert hit["title"] == request.title
+    assert hit["score"] == ai_analyzer.analyze_record(request).score
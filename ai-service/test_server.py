@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tests for the production launcher settings
+"""
+
+from app.core import server
+from app.core.config import settings
+
+
+def test_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 0)
+    monkeypatch.setattr(settings, "SERVER_BACKLOG", 512)
+
+    options = server.gunicorn_options()
+
+    assert options["workers"] == 3
+    assert options["worker_class"] == "app.core.server.ServiceWorker"
+    assert options["max_requests"] == 0
+    # Jitter without a request limit would still recycle workers
+    assert options["max_requests_jitter"] == 0
+    assert options["backlog"] == 512
+    assert options["bind"] == f"{settings.HOST}:{settings.PORT}"
+
+
+def test_worker_count_defaults_to_available_cores(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+
+    assert server.worker_count() >= 1
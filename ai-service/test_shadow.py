@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for shadow scoring with a candidate analyzer
+"""
+
+import threading
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.api.routes import admin, analysis
+from app.models.schemas import AnalysisRequest
+from app.services.shadow import ShadowRunner
+from main import app
+
+PROPOSAL = {
+    "title": "Community garden expansion",
+    "description": "Expand the community garden with a clear timeline, a measurable budget and volunteer training.",
+    "amount": 2.5,
+    "language": "en",
+}
+
+
+class ShiftedAnalyzer:
+    """Candidate that scores like the primary, plus a fixed shift."""
+
+    def __init__(self, shift, gate=None):
+        self.shift = shift
+        self.gate = gate
+        self.executor = None
+
+    def analyze_record(self, request):
+        if self.gate is not None:
+            self.gate.wait(5)
+        record = analysis.ai_analyzer.analyze_record(request)
+        shifted = SimpleNamespace(**{name: getattr(record, name) for name in record.__slots__})
+        shifted.score += self.shift
+        return shifted
+
+
+def _drain(runner):
+    runner.executor.submit(lambda: None).result(timeout=5)
+
+
+def test_deltas_are_aggregated_in_bounded_memory():
+    runner = ShadowRunner(ShiftedAnalyzer(0.5), sample_rate=1.0, max_examples=3)
+    requests = [AnalysisRequest(**{**PROPOSAL, "title": f"Community garden number {i}"}) for i in range(20)]
+    for request in requests:
+        runner.submit(request, analysis.ai_analyzer.analyze_proposal(request))
+    _drain(runner)
+    stats = runner.stats()
+    runner.stop()
+
+    assert stats["compared"] == 20
+    assert stats["deltas"]["score"]["mean"] == 0.5
+    assert stats["deltas"]["clarity_score"]["mean_abs"] == 0
+    assert stats["score_delta_buckets"]["<=+0.5"] == 20
+    assert stats["sentiment_changed"] == 0
+    assert len(stats["largest_score_deltas"]) == 3
+    assert stats["latency"]["candidate"]["samples"] == 20
+
+
+def test_sampling_and_backlog_limit():
+    gate = threading.Event()
+    draws = iter([0.9, 0.1, 0.1, 0.1, 0.1])
+    runner = ShadowRunner(ShiftedAnalyzer(0.0, gate), sample_rate=0.5, max_pending=2, rng=lambda: next(draws))
+    request = AnalysisRequest(**PROPOSAL)
+    primary = analysis.ai_analyzer.analyze_proposal(request)
+
+    sampled = [runner.submit(request, primary) for _ in range(5)]
+    gate.set()
+    _drain(runner)
+    stats = runner.stats()
+    runner.stop()
+
+    assert sampled == [False, True, True, False, False]
+    assert (stats["seen"], stats["sampled"], stats["dropped"], stats["compared"]) == (5, 2, 2, 2)
+
+
+def test_shadow_runs_after_the_response(monkeypatch):
+    runner = ShadowRunner(ShiftedAnalyzer(-1.0), sample_rate=1.0)
+    monkeypatch.setattr(analysis, "shadow_runner", runner)
+    monkeypatch.setattr(admin, "shadow_runner", runner)
+
+    with TestClient(app) as client:
+        response = client.post("/analyze/", json=PROPOSAL)
+        # The backend projects its requests; they are compared against the full primary record
+        projected = client.post("/analyze/?fields=score", json={**PROPOSAL, "title": PROPOSAL["title"] + " again"})
+        _drain(runner)
+        stats = client.get("/admin/shadow").json()
+    runner.stop()
+
+    assert response.status_code == projected.status_code == 200
+    assert list(projected.json()) == ["score"]
+    assert stats["compared"] == 2
+    assert stats["deltas"]["score"]["mean"] == -1.0
+    assert stats["deltas"]["clarity_score"]["count"] == 2
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the analysis stage graph
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.schemas import AnalysisRequest, SentimentType
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.stage_graph import Stage, StageGraph
+
+REQUEST = AnalysisRequest(
+    title="Community garden project",
+    description="We will create a local community garden with a clear timeline and budget for residents.",
+    amount=1.0,
+    category="community"
+)
+
+
+def test_graph_orders_dependencies_and_rejects_cycles():
+    graph = StageGraph([
+        Stage("total", lambda context, a, b: a + b, requires=("a", "b")),
+        Stage("a", lambda context: context),
+        Stage("b", lambda context: context * 2),
+    ])
+
+    assert graph.run(3, None)["total"] == 9
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda c, b: b, requires=("b",)), Stage("b", lambda c, a: a, requires=("a",))])
+
+
+def test_offloaded_stages_overlap():
+    barrier = threading.Barrier(2, timeout=1.0)
+
+    def meet(context):
+        barrier.wait()
+        return 1
+
+    graph = StageGraph([
+        Stage("left", meet, offload=True, timeout=2.0),
+        Stage("right", meet, offload=True, timeout=2.0),
+        Stage("sum", lambda context, a, b: a + b, requires=("left", "right")),
+    ])
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        run = graph.run(None, executor)
+
+    assert run["sum"] == 2
+    assert run.failed == {}
+
+
+def test_timeout_and_error_fall_back_per_stage():
+    def slow(context):
+        time.sleep(0.5)
+        return 10
+
+    def broken(context):
+        raise RuntimeError("boom")
+
+    graph = StageGraph([
+        Stage("slow", slow, fallback=0, offload=True, timeout=0.05),
+        Stage("broken", broken, fallback=1),
+        Stage("sum", lambda context, a, b: a + b, requires=("slow", "broken")),
+    ])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        started = time.monotonic()
+        run = graph.run(None, executor)
+        elapsed = time.monotonic() - started
+
+    assert run["sum"] == 1
+    assert run.failed == {"slow": "timeout", "broken": "error"}
+    assert elapsed < 0.4
+    assert graph.stats()["slow"]["timeouts"] == 1
+
+
+def test_failed_stage_keeps_the_rest_of_the_analysis():
+    analyzer = AIAnalyzer()
+    expected = analyzer.analyze_record(REQUEST)
+
+    def broken(text, lexicon=None):
+        raise RuntimeError("sentiment model unavailable")
+
+    analyzer.memo.clear()
+    analyzer._analyze_sentiment = broken
+    record = analyzer.analyze_record(REQUEST)
+
+    assert record.sentiment == SentimentType.NEUTRAL
+    assert record.impact_score == expected.impact_score
+    assert record.risk_factors == expected.risk_factors
+    assert analyzer.stage_stats()["sentiment"]["errors"] == 1
+
+
+def test_optional_stage_is_skipped_when_deadline_is_short():
+    graph = StageGraph([
+        Stage("slow", lambda context: time.sleep(0.05) or 1, fallback=0, optional=True),
+        Stage("cheap", lambda context: 2),
+    ])
+    graph.run(None, None)
+
+    run = graph.run(None, None, deadline=time.monotonic() + 0.01)
+
+    assert run.values == {"slow": 0, "cheap": 2}
+    assert run.failed == {"slow": "skipped"}
+
+
+def test_deadline_degrades_to_keyword_scoring():
+    analyzer = AIAnalyzer()
+    full = analyzer.analyze_record(REQUEST)
+
+    analyzer.memo.clear()
+    degraded = analyzer.analyze_record(REQUEST.model_copy(update={"deadline_ms": 0.001}))
+
+    assert degraded.skipped_stages == ("sentiment",)
+    assert degraded.sentiment == SentimentType.NEUTRAL
+    assert degraded.impact_score == full.impact_score
+    assert degraded.clarity_score == full.clarity_score
+    assert full.skipped_stages == ()
+
+
+def test_targets_prune_stages_nobody_needs():
+    calls = []
+    graph = StageGraph([
+        Stage("a", lambda context: calls.append("a") or 1),
+        Stage("b", lambda context: calls.append("b") or 2),
+        Stage("c", lambda context, a: calls.append("c") or a + 10, requires=("a",)),
+    ])
+
+    run = graph.run(None, None, targets=["c"])
+
+    assert calls == ["a", "c"]
+    assert run.values == {"a": 1, "c": 11}
+    with pytest.raises(ValueError):
+        graph.plan(["missing"])
+
+
+def test_field_selection_matches_full_analysis():
+    analyzer = AIAnalyzer()
+    full = analyzer.analyze_record(REQUEST).to_dict()
+
+    analyzer.memo.clear()
+    confidence_misses = analyzer.memo.stats()["stages"]["confidence"]["misses"]
+    fields = ("score", "sentiment", "impact_score", "feasibility_score", "summary", "recommendations")
+    projected = analyzer.analyze_record(REQUEST, fields=fields)
+
+    assert projected.to_dict(fields) == {field: full[field] for field in fields}
+    assert projected.risk_factors is None and projected.confidence is None
+    assert analyzer.memo.stats()["stages"]["confidence"]["misses"] == confidence_misses
+
+
+def test_memoized_sentiment_is_not_offloaded_or_skipped():
+    submitted = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(fn)
+            return super().submit(fn, *args, **kwargs)
+
+    analyzer = AIAnalyzer()
+    with CountingExecutor(max_workers=1) as executor:
+        analyzer.executor = executor
+        full = analyzer.analyze_record(REQUEST)
+        again = analyzer.analyze_record(REQUEST.model_copy(update={"deadline_ms": 0.001}))
+
+    assert len(submitted) == 1
+    assert again.sentiment == full.sentiment and again.skipped_stages == ()
+    assert analyzer.memo_stats()["stages"]["sentiment"] == {"hits": 1, "misses": 1}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the valenor_client SDK using a mock transport
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from valenor_client import AIServiceClient, AIServiceError
+
+
+def _mock_service(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        body = json.loads(request.content)
+        if request.url.path == "/analyze/batch":
+            results = [{"score": p["amount"]} for p in body["proposals"]]
+            return httpx.Response(200, json={"results": results, "total_processed": len(results)})
+        return httpx.Response(200, json={"score": body["amount"]})
+    return httpx.MockTransport(handler)
+
+
+def _proposal(amount):
+    return {"title": "Test proposal", "description": "d" * 60, "amount": amount, "category": "other"}
+
+
+def test_concurrent_calls_are_batched():
+    calls = []
+
+    async def run():
+        client = AIServiceClient(transport=_mock_service(calls), cache_size=0)
+        async with client:
+            return await client.analyze_many([_proposal(i) for i in range(1, 26)])
+
+    results = asyncio.run(run())
+
+    assert [r["score"] for r in results] == list(range(1, 26))
+    assert calls.count("/analyze/batch") == 3
+
+
+def test_repeated_calls_are_cached():
+    calls = []
+
+    async def run():
+        async with AIServiceClient(transport=_mock_service(calls), batching=False) as client:
+            first = await client.analyze(_proposal(2))
+            second = await client.analyze(_proposal(2))
+            return first, second, client.stats()
+
+    first, second, stats = asyncio.run(run())
+
+    assert first == second
+    assert calls == ["/analyze/"]
+    assert stats["cache"]["hits"] == 1
+
+
+def test_an_invalid_proposal_fails_only_its_own_caller():
+    calls = []
+    service = _mock_service(calls)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        proposals = body.get("proposals", [body])
+        if any(p["amount"] < 0 for p in proposals):
+            calls.append(request.url.path)
+            return httpx.Response(422, json={"detail": "amount must be positive"})
+        return service.handle_request(request)
+
+    async def run():
+        async with AIServiceClient(transport=httpx.MockTransport(handler), cache_size=0) as client:
+            return await asyncio.gather(*(client.analyze(_proposal(a)) for a in (1, -1, 3)), return_exceptions=True)
+
+    first, invalid, third = asyncio.run(run())
+
+    assert (first["score"], third["score"]) == (1, 3)
+    assert isinstance(invalid, AIServiceError) and invalid.status_code == 422
+    assert calls == ["/analyze/batch", "/analyze/", "/analyze/", "/analyze/"]
+
+
+def test_failed_analyses_are_not_cached():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"score": 0.0, "summary": "Analysis failed: boom", "skipped_stages": []})
+
+    async def run():
+        async with AIServiceClient(transport=httpx.MockTransport(handler), batching=False) as client:
+            await client.analyze(_proposal(2))
+            await client.analyze(_proposal(2))
+
+    asyncio.run(run())
+
+    assert calls == ["/analyze/", "/analyze/"]
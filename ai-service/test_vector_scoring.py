@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized batch scoring engine
+"""
+
+import random
+
+from app.models.schemas import AnalysisRequest, SentimentType
+from app.services.ai_analyzer import ENGLISH_LEXICON, AIAnalyzer
+from app.services.vector_scoring import VectorScorer
+
+WORDS = (
+    "education students health care climate green community local residents technology digital "
+    "benefit help support improve create provide enable positive change regional many plan timeline "
+    "steps resources team partners budget cost funding risky complex unproven experimental pilot "
+    "objective goal outcome method strategy specific detailed measurable milestone metric expense "
+    "comprehensive basic extensive limited the a of and to in with for"
+).split()
+
+
+def make_requests(count, seed=7):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.choice([12, 99, 100, 150, 201, 260])))
+        requests.append(AnalysisRequest(
+            title=" ".join(rng.choice(WORDS) for _ in range(4)) + " proposal",
+            description=description[:2000],
+            amount=rng.choice([0.005, 0.01, 0.05, 0.1, 1.0, 5.0, 7.5, 10.0, 10.5, 250.0]),
+            category=rng.choice([None, "education", "healthcare", "environment", "community", "technology", "other"])
+        ))
+    return requests
+
+
+def test_batch_scores_match_scalar_analysis():
+    analyzer = AIAnalyzer()
+    requests = make_requests(300)
+
+    rounded = analyzer.score_batch(requests).rounded()
+
+    for i, request in enumerate(requests):
+        record = analyzer.analyze_record(request)
+        for field in rounded:
+            assert rounded[field][i] == getattr(record, field), (i, field)
+
+
+def test_presence_uses_substring_semantics():
+    scorer = VectorScorer(ENGLISH_LEXICON)
+    texts = ["our healthcare plan brings positive change", "", "nothing relevant here"]
+
+    presence, word_counts = scorer.presence(texts)
+    hits = {scorer.terms[j] for j in presence[0].nonzero()[0]}
+
+    assert {"health", "care", "plan", "positive change"} <= hits
+    assert not presence[1].any()
+    assert word_counts.tolist() == [6, 0, 3]
+
+
+def test_scores_without_sentiment_are_neutral():
+    scorer = VectorScorer(ENGLISH_LEXICON)
+    request = make_requests(1)[0]
+    args = ([request.title], [request.description], [request.amount], [request.category])
+
+    neutral = scorer.score(*args)
+    positive = scorer.score(*args, sentiments=[SentimentType.POSITIVE])
+
+    assert positive.overall[0] == min(neutral.overall[0] + 0.5, 10.0)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for MessagePack responses and response compression
+"""
+
+import gzip
+
+import msgpack
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.wire import JSON, MSGPACK, columnar, from_columnar, negotiate
+from main import app
+
+PROPOSAL = {
+    "title": "Community garden expansion",
+    "description": "Expand the community garden with a clear timeline, a measurable budget and volunteer training.",
+    "amount": 2.5,
+    "category": "environment",
+    "language": "en",
+}
+
+
+def test_negotiation_prefers_json_unless_asked():
+    assert negotiate(None) == JSON
+    assert negotiate("*/*") == JSON
+    assert negotiate("application/msgpack") == MSGPACK
+    assert negotiate("application/json, application/x-msgpack") == JSON
+    assert negotiate("application/json;q=0.5, application/msgpack") == MSGPACK
+    assert choose_encoding("gzip, deflate, br, zstd") == "zstd"
+    assert choose_encoding("gzip;q=1.0, zstd;q=0") == "gzip"
+    assert choose_encoding("identity") is None
+
+
+def test_columns_round_trip_with_missing_results():
+    rows = [
+        {"score": 7.35, "sentiment": "positive", "recommendations": ["Add a timeline"], "summary": "A"},
+        None,
+        {"score": 0.1, "sentiment": "positive", "recommendations": ["Add a timeline", "Add a budget"], "summary": None},
+    ]
+    block = columnar(rows)
+
+    assert block["strings"] == ["positive", "Add a timeline", "Add a budget", "A"]
+    assert block["columns"]["score"] == [735, None, 10]
+    assert from_columnar(msgpack.unpackb(msgpack.packb(block))) == rows
+
+
+def test_batch_as_msgpack_matches_json():
+    body = {"proposals": [PROPOSAL, {**PROPOSAL, "amount": 40.0}, {**PROPOSAL, "title": "Library reading program"}]}
+    with TestClient(app) as client:
+        as_json = client.post("/analyze/batch", json=body)
+        packed = client.post("/analyze/batch", json=body, headers={"Accept": MSGPACK})
+        projected = client.post("/analyze/batch?fields=score,risk_factors", json=body, headers={"Accept": MSGPACK})
+
+    payload = msgpack.unpackb(packed.content)
+    decoded = from_columnar(payload["results"])
+    expected = as_json.json()["results"]
+    for row in decoded + expected:
+        row.pop("processing_time")
+
+    assert packed.headers["content-type"] == MSGPACK
+    assert "Accept" in packed.headers["vary"]
+    assert packed.headers["etag"] != as_json.headers["etag"]
+    assert decoded == expected
+    assert len(packed.content) < len(as_json.content) * 0.7
+    assert list(msgpack.unpackb(projected.content)["results"]["columns"]) == ["score", "risk_factors"]
+
+
+def test_large_bodies_are_compressed():
+    with TestClient(app) as client:
+        zstd = client.get("/keywords", headers={"Accept-Encoding": "zstd"})
+        gzipped = client.get("/keywords", headers={"Accept-Encoding": "gzip"})
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/keywords", headers={"Accept-Encoding": "identity"})
+
+    assert zstd.headers["content-encoding"] == "zstd"
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert zstd.json() == gzipped.json() == plain.json()
+    assert gzipped.headers["etag"] == "W/" + plain.headers["etag"]
+    assert "content-encoding" not in small.headers and "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in small.headers["vary"]
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    streaming = FastAPI()
+    streaming.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @streaming.get("/lines")
+    async def lines():
+        return StreamingResponse((f"line {i}\n" * 50 for i in range(3)), media_type="text/plain")
+
+    with TestClient(streaming) as client:
+        response = client.get("/lines", headers={"Accept-Encoding": "gzip"})
+        with client.stream("GET", "/lines", headers={"Accept-Encoding": "gzip"}) as streamed:
+            raw = b"".join(streamed.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"line {i}\n" * 50 for i in range(3))
+    assert gzip.decompress(raw) == response.content
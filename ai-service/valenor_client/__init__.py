@@ -0,0 +1,7 @@
+"""Async Python client for the Valenor AI service."""
+
+from valenor_client.batching import RequestBatcher
+from valenor_client.cache import ResponseCache
+from valenor_client.client import AIServiceClient, AIServiceError
+
+__all__ = ["AIServiceClient", "AIServiceError", "RequestBatcher", "ResponseCache"]
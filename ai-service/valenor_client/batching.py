@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+BatchSender = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class RequestBatcher:
+    """Coalesce concurrent single-item calls into bulk requests.
+
+    Items are flushed when ``max_batch_size`` is reached or ``max_delay``
+    seconds after the first item of a batch arrived, whichever comes first.
+    The sender returns one result per item; an exception in place of a
+    result fails that item's caller alone.
+    """
+
+    def __init__(self, sender: BatchSender, max_batch_size: int = 10, max_delay: float = 0.005):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._sender = sender
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.batches_sent = 0
+        self.items_sent = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its individual result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+
+    async def _send(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._sender(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_sent += 1
+        self.items_sent += len(items)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Flush queued items and wait for every in-flight batch."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            self._flush()
@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def make_cache_key(path: str, payload: Any) -> str:
+    """Build a stable cache key from an endpoint path and a JSON payload."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(f"{path}|{body}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU cache with per-entry TTL and single-flight loading."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value, or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the cached value or load it once, sharing the load between concurrent callers.
+
+        A loaded value for which ``cacheable`` returns False is returned but not stored.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        else:
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
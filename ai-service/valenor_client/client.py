@@ -0,0 +1,162 @@
+import asyncio
+import importlib.util
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from valenor_client.batching import RequestBatcher
+from valenor_client.cache import ResponseCache, make_cache_key
+
+ANALYZE_PATH = "/analyze/"
+BATCH_PATH = "/analyze/batch"
+SCORE_PATH = "/analyze_proposal"
+
+# Upper bound enforced by the service's /analyze/batch endpoint
+MAX_SERVER_BATCH = 10
+
+# Summaries of the placeholders a service returns when an analysis failed;
+# services that predate the "analysis" skipped stage send them unmarked
+FAILED_SUMMARIES = ("Analysis failed", "Analysis temporarily unavailable")
+
+# httpx only speaks HTTP/2 with the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def is_degraded(result: Dict[str, Any]) -> bool:
+    """Whether a result was cut short by a deadline or is a failed-analysis placeholder."""
+    return bool(result.get("skipped_stages")) or str(result.get("summary", "")).startswith(FAILED_SUMMARIES)
+
+
+class AIServiceError(Exception):
+    """Raised when the AI service returns an error response."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"AI service returned {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AIServiceClient:
+    """Pooled async client for the Valenor AI service.
+
+    A single ``httpx.AsyncClient`` keeps connections alive between calls.
+    Concurrent ``analyze`` calls are coalesced into ``/analyze/batch``
+    requests, and identical requests are answered from a TTL cache.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        batching: bool = True,
+        max_batch_size: int = MAX_SERVER_BATCH,
+        batch_delay: float = 0.005,
+        cache_size: int = 1024,
+        cache_ttl: float = 300.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=limits,
+            http2=http2 and HTTP2_AVAILABLE,
+            transport=transport,
+        )
+        self.cache = ResponseCache(max_entries=cache_size, ttl=cache_ttl)
+        self._batcher = RequestBatcher(
+            self._send_batch,
+            max_batch_size=min(max_batch_size, MAX_SERVER_BATCH),
+            max_delay=batch_delay,
+        ) if batching else None
+
+    async def __aenter__(self) -> "AIServiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Flush pending batches and close pooled connections."""
+        if self._batcher is not None:
+            await self._batcher.drain()
+        await self._http.aclose()
+
+    async def analyze(self, proposal: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """Analyze one proposal (title, description, amount, category, optional deadline_ms)."""
+        if not use_cache:
+            return await self._analyze_uncached(proposal)
+        key = make_cache_key(ANALYZE_PATH, proposal)
+        # Degraded and failed results are not worth reusing
+        return await self.cache.get_or_load(
+            key, lambda: self._analyze_uncached(proposal), cacheable=lambda result: not is_degraded(result)
+        )
+
+    async def analyze_many(self, proposals: Iterable[Dict[str, Any]], use_cache: bool = True) -> List[Dict[str, Any]]:
+        """Analyze many proposals concurrently, preserving input order."""
+        return await asyncio.gather(*(self.analyze(p, use_cache=use_cache) for p in proposals))
+
+    async def score_text(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Run the keyword scorer on free text."""
+        payload = {"text": text}
+        if not use_cache:
+            return await self._post(SCORE_PATH, payload)
+        key = make_cache_key(SCORE_PATH, payload)
+        return await self.cache.get_or_load(key, lambda: self._post(SCORE_PATH, payload))
+
+    async def health(self) -> Dict[str, Any]:
+        """Return the service health payload."""
+        response = await self._http.get("/health")
+        return self._decode(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and batching counters."""
+        stats = {"cache": self.cache.stats()}
+        if self._batcher is not None:
+            stats["batching"] = {
+                "batches_sent": self._batcher.batches_sent,
+                "items_sent": self._batcher.items_sent,
+            }
+        return stats
+
+    async def _analyze_uncached(self, proposal: Dict[str, Any]) -> Dict[str, Any]:
+        if self._batcher is None:
+            return await self._post(ANALYZE_PATH, proposal)
+        return await self._batcher.submit(proposal)
+
+    async def _send_batch(self, proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(proposals) == 1:
+            return [await self._post(ANALYZE_PATH, proposals[0])]
+        try:
+            data = await self._post(BATCH_PATH, {"proposals": proposals})
+        except AIServiceError as e:
+            if not 400 <= e.status_code < 500:
+                raise
+            # One invalid proposal rejects the whole batch; send them one by one
+            # so that only its own caller gets the error
+            return await asyncio.gather(
+                *(self._post(ANALYZE_PATH, proposal) for proposal in proposals), return_exceptions=True
+            )
+        return data["results"]
+
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._http.post(path, json=payload)
+        return self._decode(response)
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail")
+            except ValueError:
+                detail = response.text
+            raise AIServiceError(response.status_code, detail)
+        return response.json()
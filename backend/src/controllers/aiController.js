@@ -3,6 +3,7 @@ const Proposal = require('../models/Proposal');
 const { validationResult } = require('express-validator');
 
 const AI_SERVICE_URL = process.env.AI_SERVICE_URL || 'http://localhost:8000';
+const ANALYSIS_FIELDS = 'score,sentiment,impact_score,feasibility_score,summary,recommendations';
 
 // Analyze proposal using AI service
 const analyzeProposal = async (req, res) => {
@@ -26,6 +27,8 @@ const analyzeProposal = async (req, res) => {
       amount: parseFloat(amount),
       category
     }, {
+      // Only the fields used below; the service skips the stages behind the rest
+      params: { fields: ANALYSIS_FIELDS },
       timeout: 30000 // 30 second timeout
     });
 